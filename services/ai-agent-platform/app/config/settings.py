@@ -13,8 +13,113 @@ class Settings(BaseSettings):
     default_locale: str = "en-IN"
     max_message_chars: int = 3000
     latency_warn_ms: int = 1200
+    # Prompt token ceilings per skill (JSON object); other skills use the default.
+    prompt_token_budget_default: int = 1200
+    prompt_token_budgets: dict[str, int] = {
+        "triage": 700,
+        "summarize": 2000,
+        "inbox": 1500,
+        "followup": 400,
+        "unsubscribe": 300,
+    }
     error_rate_warn_percent: float = 5.0
 
+    # Local hashed n-gram triage classifier (.npz). Empty disables the tier.
+    triage_local_model_path: str = ""
+    triage_local_min_confidence: float = 0.85
+    # Optional JSONL log of LLM triage labels used to train the local classifier.
+    triage_label_log_path: str = ""
+
+    # Concurrent LLM calls for residual emails in bulk triage.
+    triage_batch_llm_concurrency: int = 8
+
+    # Outcome cache keyed by sender-template fingerprint (triage + unsubscribe).
+    template_cache_max_entries: int = 50000
+    template_cache_ttl_sec: float = 86400.0
+
+    # Server-side conversation sessions (requests with sessionId send only new messages).
+    session_max_entries: int = 10000
+    session_ttl_sec: float = 3600.0
+    session_history_messages: int = 40
+
+    # Inbox conversation compaction: verbatim recent messages, summary block size and budget.
+    inbox_compaction_recent_messages: int = 6
+    inbox_compaction_block_messages: int = 8
+    inbox_compaction_summary_tokens: int = 200
+    conversation_summary_max_entries: int = 20000
+    conversation_summary_ttl_sec: float = 86400.0
+
+    # Keep/unsubscribe verdict per List-Id (or sender domain) and list type.
+    list_decision_cache_max_entries: int = 50000
+    list_decision_cache_ttl_sec: float = 604800.0
+
+    # Sender/domain outcome reputation. Empty snapshot path keeps it memory-only.
+    sender_reputation_snapshot_path: str = ""
+    sender_reputation_snapshot_interval_sec: float = 60.0
+    sender_reputation_max_senders: int = 100000
+    sender_reputation_min_count: int = 5
+    sender_reputation_min_share: float = 0.9
+
+    # Compiled sender/domain/list-id knowledge base (see app/core/sender_kb.py).
+    sender_kb_path: str = ""
+
+    # Reuse the last result per (skill, threadId) while these fields hash the same.
+    # "a|b:N" = metadata a (else b), first N chars; "@locale"/"@requestedAction" = request fields.
+    thread_result_fields: dict[str, list[str]] = {
+        "triage": ["emailSubject|subject", "emailFrom|from", "emailBody|body:1500", "@locale"],
+        "unsubscribe": [
+            "emailSubject|subject",
+            "emailFrom|from",
+            "emailBody|body",
+            "emailHeaders|headers",
+            "@locale",
+        ],
+    }
+    thread_result_max_entries: int = 100000
+    thread_result_ttl_sec: float = 86400.0
+
+    # Incremental thread summaries: running state per threadId.
+    summary_state_max_entries: int = 20000
+    summary_state_ttl_sec: float = 604800.0
+    # Map-reduce for long spans: token budget per chunk, parallel map calls.
+    summary_chunk_tokens: int = 1200
+    summary_map_concurrency: int = 4
+    summary_chunk_cache_max_entries: int = 20000
+    summary_message_max_chars: int = 4000
+    # Longer message bodies are cut to their top-ranked sentences before prompting (0 = off).
+    summary_extractive_message_tokens: int = 250
+
+    # Fill routine follow-up drafts from the locale template bank instead of the LLM.
+    followup_template_drafts: bool = True
+    # Concurrent LLM drafts for the top-N threads of a bulk followup scan.
+    followup_scan_draft_concurrency: int = 8
+
+    # Subscription census: distinct lists kept in memory per stream, parallel verdicts.
+    census_max_lists: int = 20000
+    census_classify_concurrency: int = 8
+
+    # Coordinator fan-out: per-sub-skill deadline (ms); unlisted skills use the default.
+    coordinator_deadline_ms: int = 8000
+    coordinator_skill_deadlines_ms: dict[str, int] = {"summarize": 15000}
+
+    # Progressive responses: stored results (polled by id), LLM-upgrade workers, callbacks.
+    progressive_result_max_entries: int = 10000
+    progressive_result_ttl_sec: float = 900.0
+    progressive_workers: int = 4
+    progressive_callback_timeout_sec: float = 5.0
+    # Hosts callback URLs may target; empty disables callbacks (results stay pollable).
+    progressive_callback_hosts: list[str] = []
+
+    # Digest skill: threads per request and parallel per-thread skill runs.
+    digest_max_threads: int = 50
+    digest_concurrency: int = 8
+
+    # MinHash/LSH near-duplicate clustering for bulk runs (estimated Jaccard threshold).
+    near_duplicate_threshold: float = 0.8
+    near_duplicate_permutations: int = 64
+    near_duplicate_bands: int = 16
+    near_duplicate_skills: list[str] = ["triage", "unsubscribe", "summarize"]
+
     # LLM provider: "claude" | "openai" | "rule_based"
     agent_llm_provider: str = "rule_based"
     agent_llm_api_key: str = ""
@@ -0,0 +1,35 @@
+"""Versioned contracts for running many skill requests in one call."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.contracts.agent_request import AgentRequest
+from app.contracts.agent_response import AgentResponse
+
+
+class AgentBatchRequest(BaseModel):
+    """Bulk envelope — e.g. every email of a mailbox page through one skill."""
+
+    version: Literal["v1"] = "v1"
+    requestId: str = Field(min_length=1, max_length=128)
+    requests: list[AgentRequest] = Field(min_length=1, max_length=1000)
+    # Run near-duplicate emails once and fan the response out to the cluster.
+    dedupeNearDuplicates: bool = True
+
+
+class AgentBatchError(BaseModel):
+    """A batch item whose skill run failed; its ``responses`` entry is ``null``."""
+
+    index: int
+    requestId: str
+    error: str
+
+
+class AgentBatchResponse(BaseModel):
+    """Responses in request order plus near-duplicate clustering statistics."""
+
+    version: Literal["v1"] = "v1"
+    responses: list[AgentResponse | None]
+    errors: list[AgentBatchError] = Field(default_factory=list)
+    clusterStats: dict[str, float] = Field(default_factory=dict)
@@ -4,12 +4,15 @@ from typing import Any, Literal
 
 from pydantic import BaseModel, Field, field_validator
 
+# Hard cap on one message's content; ``settings.max_message_chars`` cannot raise it.
+MAX_MESSAGE_CONTENT_CHARS = 3000
+
 
 class AgentMessage(BaseModel):
     """A single message in the assistant conversation."""
 
     role: Literal["system", "user", "assistant"] = "user"
-    content: str = Field(min_length=1, max_length=3000)
+    content: str = Field(min_length=1, max_length=MAX_MESSAGE_CONTENT_CHARS)
 
     @field_validator("content")
     @classmethod
@@ -35,6 +38,8 @@ class AgentRequest(BaseModel):
     version: Literal["v1"] = "v1"
     skill: str = Field(min_length=1, max_length=64)
     requestId: str = Field(min_length=1, max_length=128)
+    # Session mode: ``messages`` holds only this turn's new messages; history is server-side.
+    sessionId: str | None = Field(default=None, min_length=1, max_length=128)
     messages: list[AgentMessage] = Field(min_length=1, max_length=20)
     context: AgentContext = Field(default_factory=AgentContext)
     allowedActions: list[str] = Field(default_factory=list, max_length=20)
@@ -51,3 +56,20 @@ class AgentRequest(BaseModel):
     def normalize_actions(cls, values: list[str]) -> list[str]:
         normalized = [entry.strip() for entry in values if entry and entry.strip()]
         return list(dict.fromkeys(normalized))
+
+    def for_skill(self, skill: str, request_id: str) -> "AgentRequest":
+        """Internal copy of this validated request targeted at another skill.
+
+        Skips validation: messages, context and allowed actions are shared with
+        this request rather than rebuilt, so skills must treat them as read-only.
+        Session and requested-action fields do not carry over.
+        """
+        return self.model_copy(
+            update={
+                "skill": skill,
+                "requestId": request_id,
+                "sessionId": None,
+                "requestedAction": None,
+                "requestedActionPayload": {},
+            }
+        )
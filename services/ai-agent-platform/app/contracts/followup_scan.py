@@ -0,0 +1,49 @@
+"""Versioned contracts for bulk stale-thread scanning."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class FollowupScanThread(BaseModel):
+    """One sent thread awaiting a reply."""
+
+    threadId: str = Field(min_length=1, max_length=128)
+    # ISO 8601, RFC 2822 or epoch seconds/milliseconds
+    sentAt: str = Field(max_length=64)
+    priority: str = Field(default="normal", max_length=16)
+    subject: str = Field(default="", max_length=1000)
+    to: str = Field(default="", max_length=320)
+
+
+class FollowupScanRequest(BaseModel):
+    """Bulk scan envelope — every unanswered sent thread of a mailbox."""
+
+    version: Literal["v1"] = "v1"
+    requestId: str = Field(min_length=1, max_length=128)
+    threads: list[FollowupScanThread] = Field(min_length=1, max_length=20000)
+    topN: int = Field(default=20, ge=1, le=200)
+    locale: str = Field(default="en-IN", max_length=16)
+    # Draft follow-ups for the top N threads only.
+    draft: bool = True
+    # Optional evaluation time (ISO 8601); defaults to now.
+    now: str | None = Field(default=None, max_length=64)
+
+
+class FollowupScanResult(BaseModel):
+    """A stale thread ranked by follow-up urgency."""
+
+    threadId: str
+    daysUnanswered: int
+    urgencyScore: float = Field(ge=0, le=1)
+    priority: str
+    draft: str | None = None
+
+
+class FollowupScanResponse(BaseModel):
+    """Top-N stale threads by urgency plus scan accounting."""
+
+    version: Literal["v1"] = "v1"
+    skill: Literal["followup"] = "followup"
+    results: list[FollowupScanResult]
+    stats: dict[str, int] = Field(default_factory=dict)
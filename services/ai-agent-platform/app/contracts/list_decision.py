@@ -0,0 +1,20 @@
+"""Versioned contracts for managing cached per-list unsubscribe decisions."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ListDecisionInvalidateRequest(BaseModel):
+    """Forget cached keep/unsubscribe verdicts for a sender (e.g. after a user override)."""
+
+    version: Literal["v1"] = "v1"
+    # Sender address ("news@list.example") or bare domain ("list.example").
+    sender: str = Field(min_length=1, max_length=320)
+
+
+class ListDecisionInvalidateResponse(BaseModel):
+    """How many cached verdicts (list decisions, template outcomes, sender history) were dropped."""
+
+    version: Literal["v1"] = "v1"
+    invalidated: int
@@ -0,0 +1,31 @@
+"""Versioned contracts for progressive (two-phase) skill responses."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.contracts.agent_request import AgentRequest
+from app.contracts.agent_response import AgentResponse
+
+
+class ProgressiveRequest(BaseModel):
+    """A skill request answered from rule tiers first, refined by the LLM later."""
+
+    version: Literal["v1"] = "v1"
+    request: AgentRequest
+    # Receives a POST of the final ``ProgressiveResult``; without it, poll the result id.
+    callbackUrl: str | None = Field(default=None, max_length=2048, pattern=r"^https?://")
+
+
+class ProgressiveResult(BaseModel):
+    """Current answer for a progressive request.
+
+    ``pending`` carries the rule-tier response while the LLM refinement runs;
+    ``complete`` carries the final response.
+    """
+
+    version: Literal["v1"] = "v1"
+    resultId: str
+    status: Literal["pending", "complete", "failed"]
+    response: AgentResponse | None = None
+    error: str | None = None
@@ -0,0 +1,43 @@
+"""Versioned contracts for the streaming subscription census."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class CensusEmail(BaseModel):
+    """One NDJSON line of the census stream — an email's headers and metadata."""
+
+    id: str | None = Field(default=None, max_length=128)
+    fromAddress: str = Field(default="", max_length=320)
+    subject: str = Field(default="", max_length=1000)
+    # Raw header block; List-Id and List-Unsubscribe are read from it.
+    headers: str = ""
+    # Optional body (or snippet) used to find an unsubscribe link without headers.
+    body: str = ""
+    # ISO 8601, RFC 2822 or epoch seconds/milliseconds
+    date: str | None = Field(default=None, max_length=64)
+
+
+class CensusList(BaseModel):
+    """Aggregate of one mailing list (List-Id) or bulk sender across the stream."""
+
+    listKey: str
+    listId: str | None = None
+    sender: str
+    listType: str
+    volume: int
+    lastSeen: str | None = None
+    unsubscribeUrl: str | None = None
+    keep: bool
+    reason: str
+
+
+class SubscriptionCensusResponse(BaseModel):
+    """Every list seen in the stream, highest volume first, with a keep verdict each."""
+
+    version: Literal["v1"] = "v1"
+    skill: Literal["unsubscribe"] = "unsubscribe"
+    requestId: str
+    lists: list[CensusList]
+    stats: dict[str, int] = Field(default_factory=dict)
@@ -0,0 +1,51 @@
+"""Versioned contracts for bulk triage of many emails in one call."""
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class TriageBatchEmail(BaseModel):
+    """One email to classify in a bulk triage request."""
+
+    id: str = Field(min_length=1, max_length=128)
+    subject: str = Field(default="", max_length=1000)
+    fromAddress: str = Field(default="", max_length=320)
+    body: str = ""
+    threadId: str | None = Field(default=None, max_length=128)
+    # Email date (ISO 8601, RFC 2822 or epoch) used to resolve relative deadlines.
+    date: str | None = Field(default=None, max_length=64)
+
+
+class TriageBatchRequest(BaseModel):
+    """Bulk triage envelope — e.g. one mailbox page during a backfill."""
+
+    version: Literal["v1"] = "v1"
+    requestId: str = Field(min_length=1, max_length=128)
+    emails: list[TriageBatchEmail] = Field(min_length=1, max_length=5000)
+    locale: str = "en-IN"
+
+
+class TriageBatchResult(BaseModel):
+    """Classification of one email from a bulk triage request."""
+
+    id: str
+    category: str
+    priority: str
+    sentiment: str
+    requiresReply: bool
+    estimatedReadTimeSec: int
+    confidence: float = Field(ge=0, le=1)
+    # rules | template_cache | reputation | local_model | llm
+    source: str
+    # Soonest upcoming rule-extracted deadline (YYYY-MM-DD), if the email states one.
+    dueDate: str | None = None
+
+
+class TriageBatchResponse(BaseModel):
+    """Per-email results in request order plus tier accounting."""
+
+    version: Literal["v1"] = "v1"
+    skill: Literal["triage"] = "triage"
+    results: list[TriageBatchResult]
+    stats: dict[str, int] = Field(default_factory=dict)
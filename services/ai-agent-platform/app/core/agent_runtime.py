@@ -4,18 +4,100 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from uuid import uuid4
 
-from app.contracts.agent_request import AgentRequest
+from app.config.settings import settings
+from app.contracts.agent_batch import AgentBatchError, AgentBatchRequest, AgentBatchResponse
+from app.contracts.agent_request import MAX_MESSAGE_CONTENT_CHARS, AgentMessage, AgentRequest
 from app.contracts.agent_response import AgentResponse
-from app.core.agent_trace import AgentTrace
+from app.contracts.followup_scan import FollowupScanRequest, FollowupScanResponse
+from app.contracts.progressive import ProgressiveRequest, ProgressiveResult
+from app.contracts.subscription_census import SubscriptionCensusResponse
+from app.contracts.triage_batch import TriageBatchRequest, TriageBatchResponse
+from app.core.agent_trace import AgentTrace, current_trace
+from app.core.email_facts import email_facts
+from app.core.fallback import fallback_tracking
+from app.core.near_duplicate import ClusterStats, cluster_near_duplicates, near_duplicate_totals
+from app.core.model_provider import RuleBasedModelProvider
+from app.core.progressive import (
+    PROGRESSIVE_SKILLS,
+    RuleTierProvider,
+    check_callback_url,
+    deferral_tracking,
+    deliver_callback,
+    progressive_results,
+)
+from app.core.sender_identity import normalize_address
+from app.core.session_store import current_session, session_store
+from app.core.thread_result_store import thread_result_store
 from app.core.skill_registry import SkillRegistry
+from app.skills.unsubscribe.census import SubscriptionCensus
+from app.skills.unsubscribe.graph import find_unsubscribe_url, unsubscribe_targets
 
 logger = logging.getLogger("ai_agent_platform.runtime")
 
 # Max worker threads for parallel async skill execution (Phase 3)
 _DEFAULT_PARALLEL_WORKERS = 4
+# Messages of a session a skill sees per turn (the request contract's maximum).
+_SESSION_WINDOW = 20
+
+
+def _near_duplicate_text(request: AgentRequest) -> str:
+    md = request.context.metadata
+    return " ".join(
+        (
+            md.get("emailSubject") or md.get("subject", ""),
+            md.get("emailBody") or md.get("body", ""),
+            md.get("threadMessages", ""),
+        )
+    )
+
+
+def _subject(request: AgentRequest) -> str:
+    md = request.context.metadata
+    return md.get("emailSubject") or md.get("subject", "")
+
+
+def _fan_out(
+    response: AgentResponse, representative: AgentRequest, member: AgentRequest
+) -> AgentResponse:
+    """Copy a representative's response onto a near-duplicate member's email.
+
+    Clusters never span senders, so sender fields already match; thread id,
+    subject and unsubscribe targets are replaced by the member's own.
+    """
+
+    rep_thread = representative.context.metadata.get("threadId", "")
+    member_thread = member.context.metadata.get("threadId", "")
+    retarget = {
+        "threadId": (rep_thread, member_thread),
+        "subject": (_subject(representative), _subject(member)),
+    }
+    copied = response.model_copy(deep=True)
+    actions = []
+    for action in copied.suggestedActions:
+        for key, (old, new) in retarget.items():
+            if action.payload.get(key) == old:
+                action.payload[key] = new
+        if "unsubscribeUrl" in action.payload:
+            facts = email_facts(member)
+            url = find_unsubscribe_url(facts.list_headers, facts.body)
+            if not url:
+                # This member's email carries no unsubscribe target of its own
+                continue
+            for key in ("unsubscribeUrl", "oneClick", "unsubscribeMailto"):
+                action.payload.pop(key, None)
+            action.payload.update(unsubscribe_targets(facts.list_headers, url))
+        actions.append(action)
+    copied.suggestedActions = actions
+    if copied.uiHints.get("threadId") == rep_thread:
+        copied.uiHints["threadId"] = member_thread
+    copied.uiHints["nearDuplicateOf"] = representative.requestId
+    return copied
 
 
 class AgentRuntime:
@@ -23,6 +105,11 @@ class AgentRuntime:
 
     def __init__(self, registry: SkillRegistry | None = None) -> None:
         self._registry = registry or SkillRegistry()
+        # Progressive mode: skill copies that answer from rule tiers only, plus
+        # the workers that run the LLM refinement phase (both created lazily).
+        self._rule_tier_skills: dict[str, object] = {}
+        self._progressive_pool: ThreadPoolExecutor | None = None
+        self._progressive_lock = threading.Lock()
 
     def respond(self, request: AgentRequest) -> AgentResponse:
         """Run selected skill synchronously with per-request tracing (Phase 8)."""
@@ -37,13 +124,70 @@ class AgentRuntime:
         if not hasattr(skill, "run"):
             raise ValueError(f"skill '{request.skill}' does not implement run()")
 
+        if request.sessionId:
+            return self._respond_in_session(request, skill, trace)
+
+        # Thread re-sent with unchanged relevant content: reuse the last result
+        reused = thread_result_store.lookup(request)
+        if reused is not None:
+            trace.served_from = "thread_result_store"
+            trace.emit()
+            return reused
+
+        token = current_trace.set(trace)
+        try:
+            with fallback_tracking() as fallbacks:
+                response: AgentResponse = skill.run(request)  # type: ignore[no-any-return]
+        except Exception as exc:
+            trace.error = str(exc)
+            trace.emit()
+            raise
+        finally:
+            current_trace.reset(token)
+
+        # A degraded fallback is not reused: the next request retries the model.
+        if not fallbacks:
+            thread_result_store.store(request, response)
+        trace.emit()
+        return response
+
+    def _respond_in_session(
+        self, request: AgentRequest, skill: object, trace: AgentTrace
+    ) -> AgentResponse:
+        """Run a turn whose messages are only the delta of a stored conversation.
+
+        The skill sees the most recent window of the stored history plus the
+        new messages (already validated, so the request is copied rather than
+        rebuilt). The new messages and the assistant reply are written to the
+        session only after the skill succeeds, so a failed turn leaves no
+        orphaned user message behind.
+        """
+
+        session = session_store.open(str(request.sessionId))
+        delta = request.messages
+        turn = session.with_pending(delta)
+        request = request.model_copy(update={"messages": turn.window(_SESSION_WINDOW)})
+
+        token = current_trace.set(trace)
+        session_token = current_session.set(turn)
         try:
-            response: AgentResponse = skill.run(request)  # type: ignore[no-any-return]
+            response: AgentResponse = skill.run(request)  # type: ignore[attr-defined]
         except Exception as exc:
             trace.error = str(exc)
             trace.emit()
             raise
+        finally:
+            current_session.reset(session_token)
+            current_trace.reset(token)
 
+        # The stored reply must still validate as an AgentMessage.
+        limit = min(settings.max_message_chars, MAX_MESSAGE_CONTENT_CHARS)
+        reply = response.assistantText.strip()[:limit]
+        if reply:
+            delta = [*delta, AgentMessage(role="assistant", content=reply)]
+        session = session_store.commit(session, delta)
+        response.uiHints["sessionId"] = session.session_id
+        response.uiHints["sessionTurns"] = str(session.turns)
         trace.emit()
         return response
 
@@ -126,6 +270,235 @@ class AgentRuntime:
             lambda: self.async_respond(requests, max_workers),
         )
 
+    def respond_batch(
+        self,
+        request: AgentBatchRequest,
+        max_workers: int = _DEFAULT_PARALLEL_WORKERS,
+    ) -> AgentBatchResponse:
+        """Run many requests, executing near-duplicate emails only once.
+
+        Requests for the skills in ``settings.near_duplicate_skills`` are
+        grouped by skill and sender address, clustered with MinHash/LSH over
+        subject + body, and only each cluster's representative is executed;
+        members receive a copy retargeted to their own thread (see ``_fan_out``).
+        A failed item (and its cluster) gets a ``null`` response and an entry
+        in ``errors``; the rest of the batch is unaffected.
+        """
+
+        requests = request.requests
+        # representative index -> member indices (including itself)
+        clusters: list[list[int]] = []
+        groups: dict[tuple[str, str], list[int]] = {}
+        for i, item in enumerate(requests):
+            md = item.context.metadata
+            if request.dedupeNearDuplicates and item.skill in settings.near_duplicate_skills:
+                sender = normalize_address(md.get("emailFrom") or md.get("from", ""))
+                groups.setdefault((item.skill, sender), []).append(i)
+            else:
+                clusters.append([i])
+
+        for indices in groups.values():
+            grouped = cluster_near_duplicates(
+                [_near_duplicate_text(requests[i]) for i in indices],
+                threshold=settings.near_duplicate_threshold,
+                num_perm=settings.near_duplicate_permutations,
+                bands=settings.near_duplicate_bands,
+            )
+            clusters.extend([indices[j] for j in members] for members in grouped.clusters)
+
+        representatives = [members[0] for members in clusters]
+        workers = max(1, min(max_workers, len(representatives)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            executed = list(pool.map(self._respond_item, [requests[i] for i in representatives]))
+
+        responses: list[AgentResponse | None] = [None] * len(requests)
+        errors: list[AgentBatchError] = []
+        for members, outcome in zip(clusters, executed):
+            rep = members[0]
+            if isinstance(outcome, Exception):
+                errors.extend(
+                    AgentBatchError(index=i, requestId=requests[i].requestId, error=str(outcome))
+                    for i in members
+                )
+                continue
+            responses[rep] = outcome
+            for member in members[1:]:
+                responses[member] = _fan_out(outcome, requests[rep], requests[member])
+
+        stats = ClusterStats(
+            items=len(requests),
+            clusters=len(clusters),
+            duplicates=len(requests) - len(clusters),
+            largest_cluster=max(len(members) for members in clusters),
+        )
+        near_duplicate_totals.record(stats)
+        logger.info("respond_batch request=%s clusters=%s", request.requestId, stats.to_dict())
+        return AgentBatchResponse(
+            responses=responses,
+            errors=sorted(errors, key=lambda e: e.index),
+            clusterStats=stats.to_dict(),
+        )
+
+    def _respond_item(self, request: AgentRequest) -> AgentResponse | Exception:
+        """``respond`` for one batch item; its failure is returned, not raised."""
+
+        try:
+            return self.respond(request)
+        except Exception as exc:  # noqa: BLE001
+            logger.error(
+                "respond_batch skill=%s request=%s error=%s", request.skill, request.requestId, exc
+            )
+            return exc
+
+    def triage_batch(self, request: TriageBatchRequest) -> TriageBatchResponse:
+        """Run bulk triage with the same tracing as single-skill requests."""
+
+        trace = AgentTrace(
+            trace_id=request.requestId,
+            skill="triage",
+            started_at_ms=time.perf_counter() * 1000,
+        )
+        skill = self._registry.get_skill("triage")
+        token = current_trace.set(trace)
+        try:
+            response: TriageBatchResponse = skill.run_batch(request)  # type: ignore[attr-defined]
+        except Exception as exc:
+            trace.error = str(exc)
+            trace.emit()
+            raise
+        finally:
+            current_trace.reset(token)
+
+        trace.emit()
+        return response
+
+    def followup_scan(self, request: FollowupScanRequest) -> FollowupScanResponse:
+        """Run the bulk stale-thread scan with the same tracing as single-skill requests."""
+
+        trace = AgentTrace(
+            trace_id=request.requestId,
+            skill="followup",
+            started_at_ms=time.perf_counter() * 1000,
+        )
+        skill = self._registry.get_skill("followup")
+        token = current_trace.set(trace)
+        try:
+            response: FollowupScanResponse = skill.run_scan(request)  # type: ignore[attr-defined]
+        except Exception as exc:
+            trace.error = str(exc)
+            trace.emit()
+            raise
+        finally:
+            current_trace.reset(token)
+
+        trace.emit()
+        return response
+
+    def subscription_census(
+        self, request_id: str, census: SubscriptionCensus
+    ) -> SubscriptionCensusResponse:
+        """Classify a consumed census stream with the same tracing as single-skill requests."""
+
+        trace = AgentTrace(
+            trace_id=request_id,
+            skill="unsubscribe",
+            started_at_ms=time.perf_counter() * 1000,
+        )
+        skill = self._registry.get_skill("unsubscribe")
+        token = current_trace.set(trace)
+        try:
+            response: SubscriptionCensusResponse = skill.run_census(  # type: ignore[attr-defined]
+                request_id, census
+            )
+        except Exception as exc:
+            trace.error = str(exc)
+            trace.emit()
+            raise
+        finally:
+            current_trace.reset(token)
+
+        trace.emit()
+        return response
+
+    def respond_progressive(self, request: ProgressiveRequest) -> ProgressiveResult:
+        """Answer from the skill's rule tiers now; refine with the LLM in the background.
+
+        The returned result is ``complete`` when the rule tiers were decisive
+        (or no LLM is configured), else ``pending`` with the rule-tier response.
+        The refined result replaces it in ``progressive_results`` and is POSTed
+        to ``callbackUrl`` when one was given.
+        """
+
+        inner = request.request
+        if inner.skill not in PROGRESSIVE_SKILLS:
+            raise ValueError(
+                f"skill '{inner.skill}' does not support progressive mode "
+                f"(supported: {', '.join(sorted(PROGRESSIVE_SKILLS))})"
+            )
+        if inner.sessionId:
+            raise ValueError("progressive mode does not support sessionId")
+        if request.callbackUrl:
+            check_callback_url(request.callbackUrl)
+
+        result_id = uuid4().hex
+        skill = self._registry.get_skill(inner.skill)
+        if isinstance(getattr(skill, "_model_provider", None), RuleBasedModelProvider):
+            # No LLM to refine with: the normal answer is already the final one.
+            return self._store_final(result_id, self.respond(inner), "immediateFinal")
+
+        with deferral_tracking() as deferred:
+            provisional: AgentResponse = self._rule_tier_skill(inner.skill, skill).run(inner)  # type: ignore[attr-defined]
+        if not deferred:
+            return self._store_final(result_id, provisional, "immediateFinal")
+
+        provisional.uiHints["progressive"] = "pending"
+        provisional.uiHints["resultId"] = result_id
+        pending = ProgressiveResult(resultId=result_id, status="pending", response=provisional)
+        progressive_results.put(pending)
+        self._progressive_executor().submit(
+            copy_context().run, self._refine, result_id, inner, request.callbackUrl
+        )
+        return pending
+
+    def _rule_tier_skill(self, name: str, skill: object) -> object:
+        with self._progressive_lock:
+            if name not in self._rule_tier_skills:
+                self._rule_tier_skills[name] = type(skill)(RuleTierProvider())  # type: ignore[call-arg]
+            return self._rule_tier_skills[name]
+
+    def _progressive_executor(self) -> ThreadPoolExecutor:
+        with self._progressive_lock:
+            if self._progressive_pool is None:
+                self._progressive_pool = ThreadPoolExecutor(
+                    max_workers=settings.progressive_workers,
+                    thread_name_prefix="progressive",
+                )
+            return self._progressive_pool
+
+    def _store_final(self, result_id: str, response: AgentResponse, counter: str) -> ProgressiveResult:
+        response.uiHints["progressive"] = "final"
+        response.uiHints["resultId"] = result_id
+        result = ProgressiveResult(resultId=result_id, status="complete", response=response)
+        progressive_results.put(result)
+        progressive_results.count(counter)
+        return result
+
+    def _refine(self, result_id: str, request: AgentRequest, callback_url: str | None) -> None:
+        """Phase two: run the skill with its LLM, store the result and call back."""
+
+        try:
+            response = self.respond(request)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("progressive refine request=%s error=%s", request.requestId, exc)
+            result = ProgressiveResult(resultId=result_id, status="failed", error=str(exc))
+            progressive_results.put(result)
+            progressive_results.count("failed")
+        else:
+            result = self._store_final(result_id, response, "refined")
+        if callback_url:
+            delivered = deliver_callback(callback_url, result)
+            progressive_results.count("callbacksDelivered" if delivered else "callbacksFailed")
+
     def registered_skills(self) -> list[str]:
         """Expose the currently registered skill names."""
 
@@ -6,6 +6,7 @@ import json
 import logging
 import time
 from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from typing import Generator
 
@@ -32,6 +33,12 @@ class AgentTrace:
     nodes: list[NodeTrace] = field(default_factory=list)
     model_calls: int = 0
     total_tokens: int = 0
+    estimated_tokens: int = 0
+    # Set when the response was reused instead of running the skill graph.
+    served_from: str | None = None
+    # Coordinator only: the sub-skill dependency chain that finished last.
+    critical_path: list[str] | None = None
+    critical_path_ms: float = 0.0
     error: str | None = None
     _completed: bool = field(default=False, repr=False)
 
@@ -46,10 +53,11 @@ class AgentTrace:
             )
         )
 
-    def record_model_call(self, tokens: int = 0) -> None:
-        """Track an LLM API call."""
+    def record_model_call(self, tokens: int = 0, estimated_tokens: int = 0) -> None:
+        """Track an LLM API call with actual and locally estimated prompt tokens."""
         self.model_calls += 1
         self.total_tokens += tokens
+        self.estimated_tokens += estimated_tokens
 
     @property
     def total_duration_ms(self) -> float:
@@ -62,6 +70,7 @@ class AgentTrace:
             "totalDurationMs": self.total_duration_ms,
             "modelCalls": self.model_calls,
             "totalTokens": self.total_tokens,
+            "estimatedTokens": self.estimated_tokens,
             "nodesVisited": [
                 {
                     "name": n.name,
@@ -70,6 +79,12 @@ class AgentTrace:
                 }
                 for n in self.nodes
             ],
+            **({"servedFrom": self.served_from} if self.served_from else {}),
+            **(
+                {"criticalPath": self.critical_path, "criticalPathMs": self.critical_path_ms}
+                if self.critical_path
+                else {}
+            ),
             **({"error": self.error} if self.error else {}),
         }
 
@@ -81,6 +96,10 @@ class AgentTrace:
         )
 
 
+# Trace of the request currently executing on this context, if any.
+current_trace: ContextVar[AgentTrace | None] = ContextVar("current_trace", default=None)
+
+
 @contextmanager
 def trace_node(trace: AgentTrace, node_name: str) -> Generator[None, None, None]:
     """Context manager for timing individual graph nodes within a trace."""
@@ -0,0 +1,133 @@
+"""Per-request blackboard of derived facts shared by coordinator sub-skills.
+
+When the coordinator fans one email out to several skills, each would
+otherwise re-derive the same facts (parsed fields, normalized body, list
+headers) and answer questions another skill's LLM call already settled.
+The coordinator installs one ``Blackboard`` on the request context; its
+sub-skill threads inherit it through ``copy_context``.
+
+Two kinds of facts live on it:
+
+* shared computations (``shared_fact``) — any skill may compute them, the
+  first caller does and concurrent callers wait for that result;
+* published outcomes (``publish_fact`` / ``await_fact``) — produced by one
+  skill (e.g. triage's classification) and read by others. The coordinator
+  declares which outcomes will be published, so a reader waits only for a
+  producer that is actually running and stops waiting once it finishes.
+
+Outside a coordinator request there is no blackboard: ``shared_fact``
+computes directly and ``await_fact`` returns ``None``.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+from app.core.deadline import current_deadline
+
+T = TypeVar("T")
+
+
+class Blackboard:
+    """Thread-safe fact store for the sub-skills of one coordinator request."""
+
+    def __init__(self, expected: tuple[str, ...] = ()) -> None:
+        self._lock = threading.Lock()
+        self._facts: dict[str, Any] = {}
+        # Keys being computed or awaited from a producer; set once settled.
+        self._settled: dict[str, threading.Event] = {key: threading.Event() for key in expected}
+        self.hits = 0
+        self.computes = 0
+
+    def get_or_compute(self, key: str, compute: Callable[[], T]) -> T:
+        """The fact under ``key``, computed once however many threads ask for it."""
+        with self._lock:
+            if key in self._facts:
+                self.hits += 1
+                return self._facts[key]
+            event = self._settled.get(key)
+            owner = event is None
+            if owner:
+                event = self._settled[key] = threading.Event()
+        if not owner:
+            event.wait()
+            with self._lock:
+                if key in self._facts:
+                    self.hits += 1
+                    return self._facts[key]
+            # The owner failed (or the producer never published); compute locally.
+            return compute()
+        try:
+            value = compute()
+            with self._lock:
+                self._facts[key] = value
+                self.computes += 1
+            return value
+        finally:
+            event.set()
+
+    def publish(self, key: str, value: object) -> None:
+        with self._lock:
+            self._facts[key] = value
+            event = self._settled.setdefault(key, threading.Event())
+        event.set()
+
+    def abandon(self, key: str) -> None:
+        """Release readers of a declared fact whose producer finished without it."""
+        with self._lock:
+            event = self._settled.get(key)
+        if event is not None:
+            event.set()
+
+    def wait_for(self, key: str, timeout: float | None = None) -> Any | None:
+        """A declared or published fact, waiting up to ``timeout`` for its producer."""
+        with self._lock:
+            if key in self._facts:
+                self.hits += 1
+                return self._facts[key]
+            event = self._settled.get(key)
+        if event is None or not event.wait(timeout):
+            return None
+        with self._lock:
+            value = self._facts.get(key)
+            if value is not None:
+                self.hits += 1
+            return value
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"facts": len(self._facts), "hits": self.hits, "computes": self.computes}
+
+
+# Blackboard of the coordinator request being executed, if any.
+current_blackboard: ContextVar[Blackboard | None] = ContextVar("current_blackboard", default=None)
+
+
+def shared_fact(key: str, compute: Callable[[], T]) -> T:
+    """``compute()`` memoized on the request's blackboard (computed directly without one)."""
+    blackboard = current_blackboard.get()
+    if blackboard is None:
+        return compute()
+    return blackboard.get_or_compute(key, compute)
+
+
+def publish_fact(key: str, value: object) -> None:
+    """Make a skill's outcome available to the other sub-skills of the request."""
+    blackboard = current_blackboard.get()
+    if blackboard is not None:
+        blackboard.publish(key, value)
+
+
+def await_fact(key: str) -> Any | None:
+    """Another sub-skill's published outcome, or ``None`` when none is coming.
+
+    Waits no longer than the calling task's own deadline.
+    """
+    blackboard = current_blackboard.get()
+    if blackboard is None:
+        return None
+    deadline = current_deadline.get()
+    return blackboard.wait_for(key, deadline.remaining() if deadline is not None else None)
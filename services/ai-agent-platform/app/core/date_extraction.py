@@ -0,0 +1,283 @@
+"""Rule-based extraction of dates and deadlines from email text.
+
+One precompiled alternation finds relative phrases ("tomorrow", "next
+Friday", "end of month", "in 3 days"), month-name dates ("March 5", "5th
+Mar 2027") and numeric dates ("2026-11-02", "02/11/2026"). Matches are
+resolved against the email's own date; numeric day/month order follows the
+locale (month-first for ``en-US``, day-first otherwise). A cue such as "by",
+"due" or "deadline" just before a match marks it as a deadline. Mentions
+that would resolve past ``date.max`` are dropped.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+_MONTHS = {
+    name: index
+    for index, names in enumerate(
+        (
+            ("jan", "january"),
+            ("feb", "february"),
+            ("mar", "march"),
+            ("apr", "april"),
+            ("may",),
+            ("jun", "june"),
+            ("jul", "july"),
+            ("aug", "august"),
+            ("sep", "sept", "september"),
+            ("oct", "october"),
+            ("nov", "november"),
+            ("dec", "december"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+# Full names only: "mon", "wed", "sat", "sun" are too often ordinary words.
+_WEEKDAYS = {
+    name: index
+    for index, name in enumerate(
+        ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+    )
+}
+_MONTH = "|".join(sorted(_MONTHS, key=len, reverse=True))
+_WEEKDAY = "|".join(sorted(_WEEKDAYS, key=len, reverse=True))
+_MONTH_FIRST_LOCALES = frozenset({"en-us", "en-ph", "en-ca"})
+
+_PATTERN = re.compile(
+    rf"""
+        (?P<iso>\b(?P<iso_y>\d{{4}})-(?P<iso_m>\d{{1,2}})-(?P<iso_d>\d{{1,2}})\b)
+      | (?P<numeric>\b(?P<num_a>\d{{1,2}})(?P<sep>[/.])(?P<num_b>\d{{1,2}})
+            (?:(?P=sep)(?P<num_y>\d{{4}}|\d{{2}}))?\b)
+      | (?P<month_day>\b(?P<md_m>{_MONTH})\.?\s+(?P<md_d>\d{{1,2}})(?:st|nd|rd|th)?
+            (?:,?\s+(?P<md_y>\d{{4}}))?\b)
+      | (?P<day_month>\b(?P<dm_d>\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?(?P<dm_m>{_MONTH})\.?
+            (?:,?\s+(?P<dm_y>\d{{4}}))?\b)
+      | (?P<relative_day>\b(?P<rel>day\s+after\s+tomorrow|today|tonight|tomorrow|eod)\b)
+      | (?P<period_end>\b(?:end\s+of\s+(?:the\s+)?(?P<end>day|week|month))\b
+            |\b(?P<end_abbr>eow|eom)\b)
+      | (?P<in_n>\bin\s+(?P<n>\d{{1,3}}|a|one|two|three)\s+(?P<unit>days?|weeks?|months?)\b)
+      | (?P<next_week>\bnext\s+week\b)
+      | (?P<weekday>\b(?:(?P<wd_mod>this|next|coming)\s+)?(?P<wd>{_WEEKDAY})\b)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+# Deadline cue immediately before a match ("by", "due on", "no later than" ...).
+_CUE = re.compile(
+    r"\b(?:by|before|due(?:\s+(?:on|by))?|deadline(?:\s+is)?|no\s+later\s+than|until)\s+$",
+    re.IGNORECASE,
+)
+_CUE_WINDOW = 20
+# Words that can start a match. Scanning words and anchoring the full pattern
+# only at these is several times faster than searching with it everywhere.
+_WORD = re.compile(r"\w+")
+_TRIGGERS = frozenset(
+    {*_MONTHS, *_WEEKDAYS, "today", "tonight", "tomorrow", "eod", "eow", "eom"}
+    | {"day", "end", "in", "next", "this", "coming"}
+)
+_SMALL_NUMBERS = {"a": 1, "one": 1, "two": 2, "three": 3}
+# Lowercase "may" is usually the modal verb ("the 2 may join", "you may 5x it");
+# it is a month only with an ordinal, "of", a year or a preposition before it.
+_MAY_CONTEXT = re.compile(r"\b(?:in|by|on|of|from|until|before|since)\s+$", re.IGNORECASE)
+_MAY_MARKERS = re.compile(r"\d(?:st|nd|rd|th)|\bof\s|\d{4}", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class ExtractedDate:
+    """A date mention resolved to a calendar date."""
+
+    text: str
+    date: date
+    is_deadline: bool
+    start: int
+    end: int
+
+    def label(self) -> str:
+        """Human-readable form used in summaries, e.g. ``by Friday (2026-10-23)``."""
+        return f"{self.text} ({self.date.isoformat()})"
+
+
+def parse_email_date(value: str) -> datetime | None:
+    """Parse an email timestamp: ISO 8601, RFC 2822 or epoch seconds/milliseconds.
+
+    Naive values are taken as UTC. Returns ``None`` when unparseable.
+    """
+
+    value = (value or "").strip()
+    if not value:
+        return None
+    parsed: datetime | None = None
+    if value.isdigit():
+        try:
+            seconds = int(value) / (1000 if len(value) > 11 else 1)
+            return datetime.fromtimestamp(seconds, tz=timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            # Out of the platform's timestamp range
+            return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _safe_date(year: int, month: int, day: int) -> date | None:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _infer_year(month: int, day: int, reference: date) -> date | None:
+    """Yearless dates well in the past refer to next year ("Jan 5" written in December)."""
+    candidate = _safe_date(reference.year, month, day)
+    if candidate is not None and (reference - candidate).days > 180:
+        candidate = _safe_date(reference.year + 1, month, day)
+    return candidate
+
+
+def _month_end(day: date) -> date:
+    first_next = (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return first_next - timedelta(days=1)
+
+
+def _is_modal_may(match: re.Match[str]) -> bool:
+    """True when a month-name match hinges on a lowercase, unqualified "may"."""
+    month = match.group("md_m") or match.group("dm_m")
+    if month is None or month != "may" or _MAY_MARKERS.search(match.group()):
+        return False
+    # "by may 5", "on 5 may": a preposition just before the match.
+    return _MAY_CONTEXT.search(match.string, 0, match.start()) is None
+
+
+def _resolve(match: re.Match[str], reference: date, month_first: bool) -> date | None:
+    """Calendar date for ``match``; ``None`` when invalid or outside ``date``'s range."""
+    try:
+        return _resolve_unchecked(match, reference, month_first)
+    except (OverflowError, ValueError):
+        # Relative arithmetic past date.max ("tomorrow" on 9999-12-31)
+        return None
+
+
+def _resolve_unchecked(match: re.Match[str], reference: date, month_first: bool) -> date | None:
+    group = match.group
+    if group("iso"):
+        return _safe_date(int(group("iso_y")), int(group("iso_m")), int(group("iso_d")))
+    if group("numeric"):
+        first, second = int(group("num_a")), int(group("num_b"))
+        month, day = (first, second) if month_first else (second, first)
+        year_text = group("num_y")
+        if year_text is None:
+            # "10.30" is a time or a version, not a date; only "d/m" may omit the year.
+            return _infer_year(month, day, reference) if group("sep") == "/" else None
+        year = int(year_text) + (2000 if len(year_text) == 2 else 0)
+        return _safe_date(year, month, day)
+    if group("month_day") or group("day_month"):
+        if _is_modal_may(match):
+            return None
+        prefix = "md" if group("month_day") else "dm"
+        month = _MONTHS[group(f"{prefix}_m").lower()]
+        day = int(group(f"{prefix}_d"))
+        year_text = group(f"{prefix}_y")
+        if year_text:
+            return _safe_date(int(year_text), month, day)
+        return _infer_year(month, day, reference)
+    if group("relative_day"):
+        rel = re.sub(r"\s+", " ", group("rel").lower())
+        offsets = {"today": 0, "tonight": 0, "eod": 0, "tomorrow": 1, "day after tomorrow": 2}
+        return reference + timedelta(days=offsets[rel])
+    if group("period_end"):
+        end = (group("end") or group("end_abbr") or "").lower()
+        if end == "day":
+            return reference
+        if end in ("week", "eow"):
+            return reference + timedelta(days=(4 - reference.weekday()) % 7)
+        return _month_end(reference)
+    if group("in_n"):
+        raw = group("n").lower()
+        count = _SMALL_NUMBERS.get(raw) or int(raw)
+        unit = group("unit").lower()
+        if unit.startswith("day"):
+            return reference + timedelta(days=count)
+        if unit.startswith("week"):
+            return reference + timedelta(weeks=count)
+        month_index = reference.month - 1 + count
+        year, month = reference.year + month_index // 12, month_index % 12 + 1
+        return _safe_date(year, month, min(reference.day, _month_end(date(year, month, 1)).day))
+    if group("next_week"):
+        return reference + timedelta(days=7 - reference.weekday())
+    if group("weekday"):
+        target = _WEEKDAYS[group("wd").lower()]
+        ahead = (target - reference.weekday()) % 7
+        if (group("wd_mod") or "").lower() == "next" and ahead == 0:
+            ahead = 7
+        return reference + timedelta(days=ahead)
+    return None
+
+
+def extract_dates(
+    text: str, reference: datetime | date | None = None, locale: str = "en-IN"
+) -> list[ExtractedDate]:
+    """All resolvable date mentions in ``text``, in order of appearance."""
+
+    if not text:
+        return []
+    if reference is None:
+        reference = datetime.now(tz=timezone.utc)
+    ref_day = reference.date() if isinstance(reference, datetime) else reference
+    month_first = locale.strip().lower() in _MONTH_FIRST_LOCALES
+
+    found: list[ExtractedDate] = []
+    scanned_to = 0
+    for word in _WORD.finditer(text):
+        token = word.group()
+        if word.start() < scanned_to or not (token[0].isdigit() or token.lower() in _TRIGGERS):
+            continue
+        match = _PATTERN.match(text, word.start())
+        if match is None:
+            continue
+        scanned_to = match.end()
+        resolved = _resolve(match, ref_day, month_first)
+        if resolved is None:
+            continue
+        start = match.start()
+        cue = _CUE.search(text, max(0, start - _CUE_WINDOW), start)
+        if cue is not None:
+            start = cue.start()
+        found.append(
+            ExtractedDate(
+                text=re.sub(r"\s+", " ", text[start : match.end()].strip()),
+                date=resolved,
+                is_deadline=cue is not None,
+                start=start,
+                end=match.end(),
+            )
+        )
+    return found
+
+
+def extract_deadlines(
+    text: str, reference: datetime | date | None = None, locale: str = "en-IN"
+) -> list[ExtractedDate]:
+    """Deadline mentions (date preceded by a cue such as "by" or "due") in ``text``."""
+    return [item for item in extract_dates(text, reference, locale) if item.is_deadline]
+
+
+def earliest_deadline(
+    text: str, reference: datetime | date | None = None, locale: str = "en-IN"
+) -> ExtractedDate | None:
+    """Soonest deadline on or after the reference date, if any."""
+    if reference is None:
+        reference = datetime.now(tz=timezone.utc)
+    ref_day = reference.date() if isinstance(reference, datetime) else reference
+    upcoming = [d for d in extract_deadlines(text, ref_day, locale) if d.date >= ref_day]
+    return min(upcoming, key=lambda d: d.date) if upcoming else None
@@ -0,0 +1,58 @@
+"""Cooperative per-task deadlines and cancellation.
+
+Python threads cannot be killed, so a sub-task that overruns its deadline
+is cancelled cooperatively: the caller sets the task's ``Deadline`` as
+cancelled, and the next model call made on that task's context raises
+``DeadlineExceeded`` instead of spending more LLM time on a result nobody
+will read.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextvars import ContextVar
+
+
+class DeadlineExceeded(Exception):
+    """The task's deadline passed or it was cancelled by its caller.
+
+    Deliberately not a ``RuntimeError``: skills treat those as provider
+    failures and fall back to rule-based output, while a cancelled task
+    should stop.
+    """
+
+
+class Deadline:
+    """Absolute monotonic deadline plus an explicit cancellation flag."""
+
+    def __init__(self, timeout_sec: float) -> None:
+        self.timeout_sec = timeout_sec
+        self.expires_at = time.monotonic() + timeout_sec
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.cancelled or time.monotonic() >= self.expires_at
+
+
+# Deadline of the task running on this context, if any.
+current_deadline: ContextVar[Deadline | None] = ContextVar("current_deadline", default=None)
+
+
+def check_deadline() -> None:
+    """Raise ``DeadlineExceeded`` when the current task's deadline has passed."""
+    deadline = current_deadline.get()
+    if deadline is not None and deadline.expired():
+        raise DeadlineExceeded(
+            "cancelled" if deadline.cancelled else f"deadline of {deadline.timeout_sec}s exceeded"
+        )
@@ -0,0 +1,44 @@
+"""Email fields every skill reads from request metadata, derived once per request."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from app.contracts.agent_request import AgentRequest
+from app.core.blackboard import shared_fact
+from app.core.list_headers import ListHeaders, parse_list_headers
+
+
+@dataclass(frozen=True)
+class EmailFacts:
+    """Raw metadata fields (empty when absent) plus their normalized forms."""
+
+    subject: str
+    from_address: str
+    body: str
+    date: str
+    labels: str
+    subject_lower: str
+    body_lower: str
+    list_headers: ListHeaders
+
+
+def _derive(request: AgentRequest) -> EmailFacts:
+    md = request.context.metadata
+    subject = md.get("emailSubject") or md.get("subject", "")
+    body = md.get("emailBody") or md.get("body", "")
+    return EmailFacts(
+        subject=subject,
+        from_address=md.get("emailFrom") or md.get("from", ""),
+        body=body,
+        date=md.get("emailDate") or md.get("date", ""),
+        labels=md.get("labels", ""),
+        subject_lower=subject.lower(),
+        body_lower=body.lower(),
+        list_headers=parse_list_headers(md.get("emailHeaders") or md.get("headers", "")),
+    )
+
+
+def email_facts(request: AgentRequest) -> EmailFacts:
+    """Fields of the request's email, shared by the coordinator's sub-skills."""
+    return shared_fact("email", lambda: _derive(request))
@@ -0,0 +1,34 @@
+"""Marks skill results that came from a fallback because the model failed.
+
+A skill that answers with its degraded default (provider error, unusable
+model output) calls ``note_fallback``. Callers that persist results run the
+skill inside ``fallback_tracking`` and do not store a response that fell
+back, so it is recomputed once the provider recovers.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Generator
+
+# Fallback reasons noted by the skill run being tracked on this context.
+_fallbacks: ContextVar[list[str] | None] = ContextVar("fallbacks", default=None)
+
+
+def note_fallback(reason: str) -> None:
+    """Record that the current result is a degraded fallback (no-op when untracked)."""
+    fallbacks = _fallbacks.get()
+    if fallbacks is not None:
+        fallbacks.append(reason)
+
+
+@contextmanager
+def fallback_tracking() -> Generator[list[str], None, None]:
+    """Collect the fallbacks noted inside the block."""
+    fallbacks: list[str] = []
+    token = _fallbacks.set(fallbacks)
+    try:
+        yield fallbacks
+    finally:
+        _fallbacks.reset(token)
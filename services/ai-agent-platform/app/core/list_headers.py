@@ -0,0 +1,112 @@
+"""Structured parsing of mailing-list headers (RFC 2369, RFC 2919, RFC 8058).
+
+One pass over a raw header block (folded continuation lines included)
+extracts ``List-Id``, every ``List-Unsubscribe`` URI split into https and
+mailto targets, and whether ``List-Unsubscribe-Post`` enables one-click
+unsubscribe. Other headers are skipped without being scanned further.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from app.core.sender_kb import normalize_list_id
+
+_WANTED = frozenset({"list-id", "list-unsubscribe", "list-unsubscribe-post"})
+_ANGLE_URI = re.compile(r"<\s*([^<>\s]+)\s*>")
+_ONE_CLICK = "list-unsubscribe=one-click"
+# A header name at the start of a flattened, single-line header string.
+_FLAT_NAME = re.compile(r"(?:^|(?<=[;\s]))([A-Za-z][\w-]*):(?=[\s<])")
+
+
+@dataclass(frozen=True)
+class ListHeaders:
+    """Mailing-list header values of one email."""
+
+    list_id: str | None = None
+    list_id_raw: str | None = None
+    https_urls: tuple[str, ...] = ()
+    mailto_urls: tuple[str, ...] = ()
+    # RFC 8058: an https List-Unsubscribe URL plus "List-Unsubscribe-Post: List-Unsubscribe=One-Click".
+    one_click: bool = False
+
+    @property
+    def has_list_headers(self) -> bool:
+        return bool(self.list_id or self.https_urls or self.mailto_urls)
+
+
+EMPTY_LIST_HEADERS = ListHeaders()
+
+
+def _flat_values(headers: str) -> dict[str, str]:
+    """First value of each wanted header in a header block flattened onto one line.
+
+    Some clients pass ``"From: a@b.example; List-Id: <x.example>"``; each value
+    runs up to the next ``Name:`` token.
+    """
+    found: dict[str, str] = {}
+    names = list(_FLAT_NAME.finditer(headers))
+    for match, following in zip(names, names[1:] + [None]):
+        name = match.group(1).lower()
+        if name in _WANTED and name not in found:
+            end = following.start() if following is not None else len(headers)
+            found[name] = headers[match.end() : end].strip().rstrip(";").strip()
+    return found
+
+
+def _unfold(headers: str) -> dict[str, str]:
+    """First value of each wanted header, with folded continuation lines joined."""
+    if "\n" not in headers and "\r" not in headers:
+        return _flat_values(headers)
+    found: dict[str, str] = {}
+    current: str | None = None
+    for line in headers.splitlines():
+        if line[:1] in (" ", "\t"):
+            if current is not None:
+                found[current] += " " + line.strip()
+            continue
+        current = None
+        name, colon, value = line.partition(":")
+        if not colon:
+            continue
+        name = name.strip().lower()
+        if name in _WANTED and name not in found:
+            found[name] = value.strip()
+            current = name
+    return found
+
+
+def parse_list_headers(headers: str) -> ListHeaders:
+    """Parse a raw header block; returns ``EMPTY_LIST_HEADERS`` when it has no list headers."""
+    if not headers or "list-" not in headers.lower():
+        return EMPTY_LIST_HEADERS
+    values = _unfold(headers)
+    if not values:
+        return EMPTY_LIST_HEADERS
+
+    list_id_raw = values.get("list-id")
+    list_id = (normalize_list_id(list_id_raw) or None) if list_id_raw else None
+
+    https_urls: list[str] = []
+    mailto_urls: list[str] = []
+    unsubscribe = values.get("list-unsubscribe", "")
+    # RFC 2369 wraps each URI in angle brackets; accept a bare URI as well.
+    uris = _ANGLE_URI.findall(unsubscribe) or [
+        part.strip() for part in unsubscribe.split(",") if part.strip()
+    ]
+    for uri in uris:
+        scheme = uri.split(":", 1)[0].lower()
+        if scheme in ("https", "http"):
+            https_urls.append(uri)
+        elif scheme == "mailto":
+            mailto_urls.append(uri)
+
+    post = values.get("list-unsubscribe-post", "").replace(" ", "").lower()
+    return ListHeaders(
+        list_id=list_id,
+        list_id_raw=list_id_raw,
+        https_urls=tuple(https_urls),
+        mailto_urls=tuple(mailto_urls),
+        one_click=post == _ONE_CLICK and any(u.lower().startswith("https:") for u in https_urls),
+    )
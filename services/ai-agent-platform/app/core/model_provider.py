@@ -3,10 +3,28 @@
 from __future__ import annotations
 
 import logging
+import threading
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger("ai_agent_platform.model_provider")
 
+# Provider-reported prompt token usage of the most recent call on each thread.
+_usage = threading.local()
+
+
+def last_prompt_tokens() -> int | None:
+    """Prompt tokens reported by the provider for this thread's last call, if known."""
+    return getattr(_usage, "prompt_tokens", None)
+
+
+def _record_prompt_tokens(tokens: int | None) -> None:
+    _usage.prompt_tokens = tokens
+
+
+def reset_prompt_tokens() -> None:
+    """Forget this thread's last reported usage before a new call."""
+    _record_prompt_tokens(None)
+
 
 class BaseModelProvider(ABC):
     """Abstract model provider contract."""
@@ -20,6 +38,7 @@ class RuleBasedModelProvider(BaseModelProvider):
     """Deterministic fallback provider for local development and tests."""
 
     def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        _record_prompt_tokens(None)
         cleaned = prompt.strip()
         if not cleaned:
             return "I can help you manage your inbox, summarize threads, and draft replies."
@@ -43,6 +62,7 @@ class ClaudeModelProvider(BaseModelProvider):
     def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
         import anthropic  # noqa: PLC0415
 
+        _record_prompt_tokens(None)
         system_text = (
             system
             or "You are MailZen, an intelligent email assistant. "
@@ -55,6 +75,7 @@ class ClaudeModelProvider(BaseModelProvider):
                 system=system_text,
                 messages=[{"role": "user", "content": prompt}],
             )
+            _record_prompt_tokens(getattr(msg.usage, "input_tokens", None))
             return msg.content[0].text
         except anthropic.APIError as exc:
             logger.error("Claude API error: %s", exc)
@@ -78,6 +99,7 @@ class OpenAIModelProvider(BaseModelProvider):
     def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
         from openai import OpenAIError  # noqa: PLC0415
 
+        _record_prompt_tokens(None)
         system_text = (
             system
             or "You are MailZen, an intelligent email assistant. "
@@ -92,6 +114,8 @@ class OpenAIModelProvider(BaseModelProvider):
                     {"role": "user", "content": prompt},
                 ],
             )
+            if resp.usage is not None:
+                _record_prompt_tokens(resp.usage.prompt_tokens)
             return resp.choices[0].message.content or ""
         except OpenAIError as exc:
             logger.error("OpenAI API error: %s", exc)
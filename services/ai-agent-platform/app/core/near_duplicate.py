@@ -0,0 +1,230 @@
+"""MinHash + LSH near-duplicate clustering for bulk mailbox processing.
+
+Forwarded announcements and alerts that differ only in ids collapse into one
+cluster, so bulk skill runs can process a single representative and fan the
+result out to the members. Signatures are computed with vectorized
+multiply-shift hashing over word shingles with digit-bearing words masked;
+LSH banding finds candidate pairs in roughly linear time and an
+estimated-Jaccard check confirms them.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# Odd 64-bit multipliers mixing consecutive word hashes into one shingle hash.
+_SHINGLE_MIX = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F))
+_SHIFT = np.uint64(32)
+_WORD_PATTERN = re.compile(r"\w+")
+_NUMERIC_WORD = zlib.crc32(b"<num>")
+# Bound the (permutations x shingles) working matrix per vectorized chunk.
+_CHUNK_SHINGLES = 65536
+
+
+@dataclass
+class ClusterStats:
+    """How much work near-duplicate clustering saves for a batch."""
+
+    items: int = 0
+    clusters: int = 0
+    duplicates: int = 0
+    largest_cluster: int = 0
+
+    @property
+    def saved_ratio(self) -> float:
+        return round(self.duplicates / self.items, 4) if self.items else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "items": self.items,
+            "clusters": self.clusters,
+            "duplicates": self.duplicates,
+            "largestCluster": self.largest_cluster,
+            "savedRatio": self.saved_ratio,
+        }
+
+
+@dataclass
+class NearDuplicateClusters:
+    """Clusters of batch indices; the first index of each cluster is its representative."""
+
+    clusters: list[list[int]] = field(default_factory=list)
+    stats: ClusterStats = field(default_factory=ClusterStats)
+
+    @property
+    def representatives(self) -> list[int]:
+        return [members[0] for members in self.clusters]
+
+
+def _word_hash(word: str) -> int:
+    # Ids, amounts, dates and times vary between copies of the same message.
+    if any(char.isdigit() for char in word):
+        return _NUMERIC_WORD
+    return zlib.crc32(word.encode())
+
+
+def _shingle_hashes(
+    text: str, shingle_words: int, vocabulary: dict[str, int]
+) -> np.ndarray:
+    """Hashes of the ``shingle_words``-word shingles of ``text``."""
+    words = _WORD_PATTERN.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    word_hashes = np.fromiter(
+        (
+            vocabulary[word] if word in vocabulary
+            else vocabulary.setdefault(word, _word_hash(word))
+            for word in words
+        ),
+        dtype=np.uint64,
+        count=len(words),
+    )
+    width = min(shingle_words, len(words))
+    count = len(words) - width + 1
+    # Combine neighbouring word hashes numerically instead of joining strings;
+    # uint64 arithmetic wraps, which is exactly the mixing wanted here.
+    shingles = word_hashes[:count].copy()
+    for offset in range(1, width):
+        shingles = shingles * _SHINGLE_MIX[(offset - 1) % 2] + word_hashes[offset : offset + count]
+    return shingles
+
+
+def minhash_signatures(
+    texts: list[str], num_perm: int = 64, shingle_words: int = 3, seed: int = 1
+) -> tuple[np.ndarray, np.ndarray]:
+    """MinHash signature per text, shape ``(len(texts), num_perm)``.
+
+    Every word containing a digit hashes to one placeholder, so copies that
+    differ only in ids, amounts or times shingle identically. Also returns a boolean
+    mask of texts that had no words (their signature is meaningless and they
+    should never be clustered).
+    """
+
+    rng = np.random.default_rng(seed)
+    # Multiply-shift hashing: (a * x + b) mod 2**64, top 32 bits; a must be odd.
+    a = rng.integers(0, np.iinfo(np.int64).max, size=(num_perm, 1), dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.int64).max, size=(num_perm, 1), dtype=np.uint64)
+
+    vocabulary: dict[str, int] = {}
+    shingles = [_shingle_hashes(text, shingle_words, vocabulary) for text in texts]
+    empty = np.array([s.size == 0 for s in shingles], dtype=bool)
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+
+    start = 0
+    with np.errstate(over="ignore"):
+        while start < len(texts):
+            # Take as many whole texts as fit the chunk budget (at least one).
+            stop, total = start, 0
+            while stop < len(texts) and (
+                stop == start or total + shingles[stop].size <= _CHUNK_SHINGLES
+            ):
+                total += shingles[stop].size
+                stop += 1
+            rows = [i for i in range(start, stop) if not empty[i]]
+            if rows:
+                values = np.concatenate([shingles[i] for i in rows])
+                offsets = np.cumsum([0] + [shingles[i].size for i in rows[:-1]])
+                # Permutations on the leading axis keep the reduction contiguous.
+                hashed = (a * values + b) >> _SHIFT
+                signatures[rows] = np.minimum.reduceat(hashed, offsets, axis=1).T
+            start = stop
+    return signatures, empty
+
+
+class _UnionFind:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, left: int, right: int) -> None:
+        left_root, right_root = self.find(left), self.find(right)
+        if left_root != right_root:
+            # Keep the lowest index as root so representatives are stable.
+            low, high = sorted((left_root, right_root))
+            self.parent[high] = low
+
+
+def cluster_near_duplicates(
+    texts: list[str],
+    threshold: float = 0.8,
+    num_perm: int = 64,
+    bands: int = 16,
+) -> NearDuplicateClusters:
+    """Group ``texts`` into near-duplicate clusters (estimated Jaccard >= threshold)."""
+
+    if not texts:
+        return NearDuplicateClusters()
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands")
+
+    signatures, empty = minhash_signatures(texts, num_perm=num_perm)
+    rows_per_band = num_perm // bands
+    union_find = _UnionFind(len(texts))
+
+    for band in range(bands):
+        block = np.ascontiguousarray(
+            signatures[:, band * rows_per_band : (band + 1) * rows_per_band]
+        )
+        buckets: dict[bytes, int] = {}
+        for i in range(len(texts)):
+            if empty[i]:
+                continue
+            key = block[i].tobytes()
+            first = buckets.setdefault(key, i)
+            if first != i and union_find.find(first) != union_find.find(i):
+                similarity = float(np.mean(signatures[first] == signatures[i]))
+                if similarity >= threshold:
+                    union_find.union(first, i)
+
+    grouped: dict[int, list[int]] = {}
+    for i in range(len(texts)):
+        grouped.setdefault(union_find.find(i), []).append(i)
+    clusters = sorted(grouped.values(), key=lambda members: members[0])
+
+    stats = ClusterStats(
+        items=len(texts),
+        clusters=len(clusters),
+        duplicates=len(texts) - len(clusters),
+        largest_cluster=max(len(members) for members in clusters),
+    )
+    return NearDuplicateClusters(clusters=clusters, stats=stats)
+
+
+class NearDuplicateTotals:
+    """Thread-safe running totals of clustering savings across bulk calls."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._duplicates = 0
+
+    def record(self, stats: ClusterStats) -> None:
+        with self._lock:
+            self._batches += 1
+            self._items += stats.items
+            self._duplicates += stats.duplicates
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "duplicates": self._duplicates,
+                "savedRatio": round(self._duplicates / self._items, 4) if self._items else 0.0,
+            }
+
+
+near_duplicate_totals = NearDuplicateTotals()
@@ -0,0 +1,153 @@
+"""Progressive two-phase responses: rule-tier answer now, LLM refinement later.
+
+Phase one runs the skill with a provider that refuses every model call, so
+each skill answers from its rule, history and heuristic tiers exactly as it
+does when the LLM is unavailable. If no model call was needed, that answer
+is final. Otherwise it is returned as ``pending`` and phase two runs the
+skill normally in the background; the refined result is stored under the
+result id (for polling) and POSTed to the caller's callback URL.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import logging
+import threading
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Generator
+from urllib.parse import urlsplit
+
+from app.config.settings import settings
+from app.contracts.progressive import ProgressiveResult
+from app.core.model_provider import BaseModelProvider
+from app.core.ttl_cache import TTLCache
+
+logger = logging.getLogger("ai_agent_platform.progressive")
+
+# Skills whose rule tiers give a useful answer on their own.
+PROGRESSIVE_SKILLS = frozenset({"triage", "unsubscribe"})
+
+
+class ModelCallDeferred(RuntimeError):
+    """Raised for every model call during the rule-tier phase.
+
+    A ``RuntimeError`` on purpose: skills already treat those as "LLM
+    unavailable" and fall back to their rule-based output.
+    """
+
+
+# Model calls the current rule-tier run deferred to phase two.
+_deferred_calls: ContextVar[list[int] | None] = ContextVar("deferred_calls", default=None)
+
+
+class RuleTierProvider(BaseModelProvider):
+    """Provider for phase one: records the call and defers it."""
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        deferred = _deferred_calls.get()
+        if deferred is not None:
+            deferred.append(1)
+        raise ModelCallDeferred("model call deferred to the progressive refinement phase")
+
+
+@contextmanager
+def deferral_tracking() -> Generator[list[int], None, None]:
+    """Collect the model calls ``RuleTierProvider`` defers inside the block."""
+    calls: list[int] = []
+    token = _deferred_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _deferred_calls.reset(token)
+
+
+def check_callback_url(url: str) -> None:
+    """Raise ``ValueError`` unless the callback host is explicitly allowed.
+
+    Callbacks are server-side requests to caller-chosen URLs, so an empty
+    allowlist rejects every callback rather than allowing any host.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise ValueError(f"callback scheme '{parts.scheme}' is not allowed")
+    host = parts.hostname or ""
+    if host not in settings.progressive_callback_hosts:
+        raise ValueError(f"callback host '{host}' is not allowed")
+    try:
+        port = parts.port
+    except ValueError:
+        # Non-numeric or out-of-range, e.g. "http://host:abc/"
+        raise ValueError("callback port is not a valid port number") from None
+    if port == 0:
+        raise ValueError("callback port is not a valid port number")
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Treat a redirect as a failed delivery instead of following it off the allowlist."""
+
+    def redirect_request(self, *args: object, **kwargs: object) -> None:
+        return None
+
+
+_callback_opener = urllib.request.build_opener(_NoRedirect)
+
+
+def deliver_callback(url: str, result: ProgressiveResult) -> bool:
+    """POST the result as JSON; failures are logged, the result stays pollable."""
+    try:
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(result.model_dump(mode="json")).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with _callback_opener.open(request, timeout=settings.progressive_callback_timeout_sec):
+            return True
+    except (OSError, ValueError, http.client.HTTPException) as exc:
+        # Malformed URLs raise http.client.InvalidURL or ValueError ("unknown url type").
+        logger.warning("progressive callback for %s failed: %s", result.resultId, exc)
+        return False
+
+
+class ProgressiveResultStore:
+    """TTL/LRU-bounded progressive results plus phase counters."""
+
+    def __init__(self, max_entries: int, ttl_sec: float) -> None:
+        self._results: TTLCache[str, ProgressiveResult] = TTLCache(
+            max_entries=max_entries, ttl_sec=ttl_sec
+        )
+        self._lock = threading.Lock()
+        self._counts = {
+            "immediateFinal": 0,
+            "refined": 0,
+            "failed": 0,
+            "callbacksDelivered": 0,
+            "callbacksFailed": 0,
+        }
+
+    def put(self, result: ProgressiveResult) -> None:
+        self._results.set(result.resultId, result)
+
+    def get(self, result_id: str) -> ProgressiveResult | None:
+        return self._results.get(result_id)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def clear(self) -> None:
+        self._results.clear()
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {**self._results.stats(), **counts}
+
+
+progressive_results = ProgressiveResultStore(
+    max_entries=settings.progressive_result_max_entries,
+    ttl_sec=settings.progressive_result_ttl_sec,
+)
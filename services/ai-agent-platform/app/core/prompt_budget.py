@@ -0,0 +1,214 @@
+"""Token-aware prompt budgeting shared by all skill prompt builders."""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Literal
+
+from app.config.settings import settings
+from app.core.agent_trace import current_trace
+from app.core.deadline import check_deadline
+from app.core.model_provider import BaseModelProvider, last_prompt_tokens, reset_prompt_tokens
+
+logger = logging.getLogger("ai_agent_platform.prompt_budget")
+
+# Word runs and standalone punctuation approximate BPE pieces closely enough
+# for budgeting; long unbroken strings (URLs, ids) fall back to ~4 chars/token.
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_TRIM_MARKER = "[...]"
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate — no tokenizer download, no network."""
+    if not text:
+        return 0
+    return max(len(_TOKEN_PATTERN.findall(text)), (len(text) + 3) // 4)
+
+
+def _trim_to_tokens(text: str, target: int, keep: Literal["head", "tail"]) -> str:
+    """Cut text down to roughly ``target`` tokens, keeping its head or tail."""
+    if target <= 0:
+        return ""
+    current = estimate_tokens(text)
+    if current <= target:
+        return text
+
+    chars = max(1, int(len(text) * target / current))
+    while True:
+        if keep == "tail":
+            trimmed = f"{_TRIM_MARKER} {text[-chars:].lstrip()}"
+        else:
+            trimmed = f"{text[:chars].rstrip()} {_TRIM_MARKER}"
+        if estimate_tokens(trimmed) <= target or chars <= 1:
+            return trimmed
+        chars = int(chars * 0.9)
+
+
+@dataclass
+class PromptSection:
+    """One labelled block of a prompt (email, history, instructions ...).
+
+    ``prefix`` and ``suffix`` are structural text that is never trimmed; only
+    ``text`` shrinks when the budget is exceeded. Sections with the lowest
+    ``priority`` are trimmed first, never below ``min_tokens``.
+    """
+
+    name: str
+    text: str
+    priority: int = 1
+    min_tokens: int = 0
+    keep: Literal["head", "tail"] = "head"
+    prefix: str = ""
+    suffix: str = ""
+
+    def render(self) -> str:
+        return f"{self.prefix}{self.text}{self.suffix}"
+
+
+@dataclass
+class BudgetedPrompt:
+    """A prompt fitted to a skill's token ceiling, ready for the model provider."""
+
+    skill: str
+    system: str
+    prompt: str
+    ceiling: int
+    estimated_tokens: int
+    trimmed_tokens: dict[str, int] = field(default_factory=dict)
+
+
+def token_ceiling(skill: str) -> int:
+    """Resolve the prompt token ceiling configured for ``skill``."""
+    return settings.prompt_token_budgets.get(skill, settings.prompt_token_budget_default)
+
+
+def fit_prompt(
+    skill: str,
+    system: str,
+    sections: list[PromptSection],
+    ceiling: int | None = None,
+) -> BudgetedPrompt:
+    """Trim sections by ascending priority until system + prompt fit the ceiling."""
+
+    limit = ceiling if ceiling is not None else token_ceiling(skill)
+    fixed = estimate_tokens(system) + sum(
+        estimate_tokens(s.prefix) + estimate_tokens(s.suffix) for s in sections
+    )
+    text_tokens = {id(s): estimate_tokens(s.text) for s in sections}
+    total = fixed + sum(text_tokens.values())
+    trimmed: dict[str, int] = {}
+
+    for section in sorted(sections, key=lambda s: s.priority):
+        excess = total - limit
+        if excess <= 0:
+            break
+        before = text_tokens[id(section)]
+        removable = before - section.min_tokens
+        if removable <= 0:
+            continue
+        section.text = _trim_to_tokens(
+            section.text, before - min(excess, removable), section.keep
+        )
+        after = estimate_tokens(section.text)
+        text_tokens[id(section)] = after
+        total -= before - after
+        trimmed[section.name] = before - after
+
+    if total > limit:
+        logger.warning(
+            "prompt_over_budget skill=%s estimated=%d ceiling=%d", skill, total, limit
+        )
+
+    return BudgetedPrompt(
+        skill=skill,
+        system=system,
+        prompt="".join(s.render() for s in sections),
+        ceiling=limit,
+        estimated_tokens=total,
+        trimmed_tokens=trimmed,
+    )
+
+
+class PromptBudgetStats:
+    """Thread-safe per-skill accounting of estimated vs provider-reported tokens."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._skills: dict[str, dict[str, int]] = {}
+
+    def record(self, budgeted: BudgetedPrompt, actual_tokens: int | None) -> None:
+        with self._lock:
+            entry = self._skills.setdefault(
+                budgeted.skill,
+                {
+                    "calls": 0,
+                    "trimmedCalls": 0,
+                    "estimatedTokens": 0,
+                    "measuredCalls": 0,
+                    "measuredEstimatedTokens": 0,
+                    "actualTokens": 0,
+                },
+            )
+            entry["calls"] += 1
+            entry["estimatedTokens"] += budgeted.estimated_tokens
+            if budgeted.trimmed_tokens:
+                entry["trimmedCalls"] += 1
+            if actual_tokens is not None:
+                entry["measuredCalls"] += 1
+                entry["measuredEstimatedTokens"] += budgeted.estimated_tokens
+                entry["actualTokens"] += actual_tokens
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        with self._lock:
+            result: dict[str, dict[str, object]] = {}
+            for skill, entry in self._skills.items():
+                estimated = entry["measuredEstimatedTokens"]
+                result[skill] = {
+                    **entry,
+                    "ceiling": token_ceiling(skill),
+                    "actualToEstimatedRatio": (
+                        round(entry["actualTokens"] / estimated, 3) if estimated else None
+                    ),
+                }
+            return result
+
+
+prompt_budget_stats = PromptBudgetStats()
+
+
+def generate_budgeted(
+    model_provider: BaseModelProvider, budgeted: BudgetedPrompt, max_tokens: int = 512
+) -> str:
+    """Call the model provider and report estimated vs actual prompt tokens.
+
+    Raises ``DeadlineExceeded`` without calling the model when the current
+    task's deadline has passed or it was cancelled.
+    """
+
+    check_deadline()
+    # Providers that never report usage must not inherit this thread's
+    # previous call's count; None leaves the call out of the calibration.
+    reset_prompt_tokens()
+    try:
+        return model_provider.generate(
+            budgeted.prompt, system=budgeted.system, max_tokens=max_tokens
+        )
+    finally:
+        actual = last_prompt_tokens()
+        prompt_budget_stats.record(budgeted, actual)
+        trace = current_trace.get()
+        if trace is not None:
+            trace.record_model_call(
+                tokens=actual or 0, estimated_tokens=budgeted.estimated_tokens
+            )
+        logger.debug(
+            "prompt_budget skill=%s estimated=%d actual=%s ceiling=%d trimmed=%s",
+            budgeted.skill,
+            budgeted.estimated_tokens,
+            actual,
+            budgeted.ceiling,
+            budgeted.trimmed_tokens,
+        )
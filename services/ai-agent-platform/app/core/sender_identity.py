@@ -0,0 +1,63 @@
+"""Normalization helpers for sender addresses and domains."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+# Mailbox providers shared by unrelated people — a domain says nothing about the sender.
+SHARED_MAILBOX_DOMAINS = frozenset(
+    {
+        "gmail.com",
+        "googlemail.com",
+        "outlook.com",
+        "hotmail.com",
+        "live.com",
+        "yahoo.com",
+        "icloud.com",
+        "me.com",
+        "aol.com",
+        "proton.me",
+        "protonmail.com",
+        "gmx.com",
+        "zoho.com",
+    }
+)
+
+
+def normalize_address(from_address: str) -> str:
+    """Reduce ``"Name <user@Example.com>"`` to ``"user@example.com"``."""
+    address = from_address.strip().lower()
+    if "<" in address:
+        address = address.rsplit("<", 1)[-1].split(">", 1)[0]
+    return address.strip().strip('"')
+
+
+def sender_domain(from_address: str) -> str:
+    """Domain part of a sender address, or ``""`` when there is none."""
+    address = normalize_address(from_address)
+    return address.rsplit("@", 1)[-1] if "@" in address else ""
+
+
+def sender_owner(from_address: str) -> str:
+    """Whose history a sender's mail belongs to.
+
+    The sender domain, or the full address on a shared mailbox domain where
+    the domain says nothing about the sender.
+    """
+    domain = sender_domain(from_address)
+    return normalize_address(from_address) if domain in SHARED_MAILBOX_DOMAINS else domain
+
+
+def owner_matcher(sender: str) -> Callable[[str], bool] | None:
+    """Predicate over ``sender_owner`` values covered by an address or bare domain.
+
+    ``None`` when ``sender`` names neither.
+    """
+    normalized = normalize_address(sender)
+    domain = sender_domain(normalized) or normalized.lstrip("@")
+    if not domain:
+        return None
+    if domain in SHARED_MAILBOX_DOMAINS and "@" in normalized:
+        return lambda owner: owner == normalized
+    suffix = f"@{domain}"
+    return lambda owner: owner == domain or owner.endswith(suffix)
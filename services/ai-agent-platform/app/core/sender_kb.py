@@ -0,0 +1,202 @@
+"""Memory-mapped static knowledge base of sender addresses, domains, local parts and list-ids.
+
+Domain rows are only for dedicated sending domains (ESPs, notification-only
+subdomains): a company domain such as google.com also carries mail from
+people, so its automated senders are listed as exact ``address`` rows.
+
+The table is compiled offline from CSV into a compact binary file that every
+uvicorn worker maps read-only, so the OS shares its pages between workers and
+startup does no parsing. Keys are stored as sorted 64-bit hashes with a
+parallel array of category codes; a lookup is one binary search.
+
+File layout (little-endian)::
+
+    header   magic "MZKB" | u16 version | u16 category count | u32 entry count | u32 names length
+    names    UTF-8 JSON list of category names, zero-padded to 8 bytes
+    keys     entry count x u64  — sorted blake2b-64 of "kind:key"
+    codes    entry count x u8   — index into the category names
+
+Compile from a ``kind,key,category`` CSV::
+
+    python -m app.core.sender_kb --csv app/data/sender_kb.csv --out sender_kb.bin
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import mmap
+import struct
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from app.config.settings import settings
+from app.core.sender_identity import normalize_address, sender_domain
+
+logger = logging.getLogger("ai_agent_platform.sender_kb")
+
+_MAGIC = b"MZKB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+KINDS = ("address", "domain", "local", "list")
+
+
+def _key_hash(kind: str, key: str) -> int:
+    digest = hashlib.blake2b(f"{kind}:{key.strip().lower()}".encode(), digest_size=8)
+    return int.from_bytes(digest.digest(), "little")
+
+
+def _domain_suffixes(domain: str) -> list[str]:
+    """``a.b.example.com`` -> [``a.b.example.com``, ``b.example.com``, ``example.com``]."""
+    labels = domain.strip(".").lower().split(".")
+    return [".".join(labels[i:]) for i in range(max(1, len(labels) - 1))]
+
+
+def normalize_list_id(list_id: str) -> str:
+    """Extract the list identifier from a ``List-Id`` value such as ``Name <id.example.com>``."""
+    value = list_id.strip()
+    if "<" in value:
+        value = value.rsplit("<", 1)[-1].split(">", 1)[0]
+    return value.strip().lower()
+
+
+class SenderKnowledgeBase:
+    """Read-only view over a compiled knowledge base file."""
+
+    def __init__(self, path: str | Path) -> None:
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_categories, count, names_len = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"not a v{_VERSION} sender knowledge base: {path}")
+        names_end = _HEADER.size + names_len
+        self._categories: list[str] = json.loads(self._mmap[_HEADER.size:names_end])
+        if len(self._categories) != n_categories:
+            raise ValueError(f"corrupt category table in {path}")
+        keys_offset = names_end + (-names_end % 8)
+        self._keys = np.frombuffer(self._mmap, dtype="<u8", count=count, offset=keys_offset)
+        self._codes = np.frombuffer(
+            self._mmap, dtype=np.uint8, count=count, offset=keys_offset + 8 * count
+        )
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def lookup(self, kind: str, key: str) -> str | None:
+        """Category of an exact ``kind``/``key`` entry, if present."""
+        if not key or not len(self._keys):
+            return None
+        target = np.uint64(_key_hash(kind, key))
+        index = int(np.searchsorted(self._keys, target))
+        if index < len(self._keys) and self._keys[index] == target:
+            return self._categories[self._codes[index]]
+        return None
+
+    def lookup_domain(self, domain: str) -> str | None:
+        """Category of a domain or its closest listed parent domain."""
+        if not domain:
+            return None
+        for candidate in _domain_suffixes(domain):
+            category = self.lookup("domain", candidate)
+            if category is not None:
+                return category
+        return None
+
+    def lookup_sender(self, from_address: str) -> str | None:
+        """Category for a sender: exact address, then local part, then its domain."""
+        address = normalize_address(from_address)
+        if "@" in address:
+            category = self.lookup("address", address) or self.lookup(
+                "local", address.split("@", 1)[0]
+            )
+            if category is not None:
+                return category
+        return self.lookup_domain(sender_domain(from_address))
+
+    def lookup_list_id(self, list_id: str) -> str | None:
+        """Category of a ``List-Id`` value, falling back to its parent domains."""
+        identifier = normalize_list_id(list_id)
+        if not identifier:
+            return None
+        for candidate in _domain_suffixes(identifier):
+            category = self.lookup("list", candidate)
+            if category is not None:
+                return category
+        return None
+
+
+def build_sender_kb(rows: list[tuple[str, str, str]], out_path: str | Path) -> int:
+    """Compile ``(kind, key, category)`` rows into the binary table; returns entry count."""
+
+    entries: dict[int, str] = {}
+    for kind, key, category in rows:
+        kind = kind.strip().lower()
+        if kind not in KINDS:
+            raise ValueError(f"unknown kind '{kind}' for key '{key}'")
+        if kind == "list":
+            key = normalize_list_id(key)
+        elif kind == "address":
+            key = normalize_address(key)
+        else:
+            key = key.strip().lower()
+        if key:
+            entries[_key_hash(kind, key)] = category.strip().lower()
+
+    categories = sorted(set(entries.values()))
+    if len(categories) > 255:
+        raise ValueError("at most 255 categories are supported")
+    code_of = {name: code for code, name in enumerate(categories)}
+    keys = np.array(sorted(entries), dtype="<u8")
+    codes = np.array([code_of[entries[int(k)]] for k in keys], dtype=np.uint8)
+
+    names = json.dumps(categories).encode()
+    header = _HEADER.pack(_MAGIC, _VERSION, len(categories), len(keys), len(names))
+    padding = b"\x00" * (-(len(header) + len(names)) % 8)
+    with open(out_path, "wb") as handle:
+        handle.write(header + names + padding)
+        handle.write(keys.tobytes())
+        handle.write(codes.tobytes())
+    return len(keys)
+
+
+@lru_cache(maxsize=4)
+def _load(path: str) -> SenderKnowledgeBase | None:
+    if not path:
+        return None
+    try:
+        kb = SenderKnowledgeBase(path)
+    except (OSError, ValueError) as exc:
+        logger.warning("sender knowledge base unavailable path=%s error=%s", path, exc)
+        return None
+    logger.info("sender knowledge base mapped path=%s entries=%d", path, len(kb))
+    return kb
+
+
+def sender_kb() -> SenderKnowledgeBase | None:
+    """Process-wide knowledge base from settings; ``None`` when not configured."""
+    return _load(settings.sender_kb_path)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compile the sender knowledge base.")
+    parser.add_argument("--csv", required=True, help="CSV with kind,key,category columns")
+    parser.add_argument("--out", required=True, help="output binary path")
+    args = parser.parse_args(argv)
+
+    with open(args.csv, encoding="utf-8", newline="") as handle:
+        rows = [
+            (row["kind"], row["key"], row["category"])
+            for row in csv.DictReader(handle)
+            if row.get("kind") and not row["kind"].startswith("#")
+        ]
+    count = build_sender_kb(rows, args.out)
+    print(f"compiled {count} entries -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
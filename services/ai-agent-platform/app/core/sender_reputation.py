@@ -0,0 +1,203 @@
+"""Per-sender and per-list outcome reputation for triage and unsubscribe.
+
+Outcomes for a given sender (noreply notifications, billing senders, known
+newsletters) are extremely stable. The store counts outcomes per exact sender
+address, or per ``List-Id`` when one is given, in memory, snapshots them
+periodically to a local JSON file, and answers directly when that history is
+confidently one-sided. Nothing is aggregated per domain: one domain sends
+people's mail, transactional mail and unrelated lists alike.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app.config.settings import settings
+from app.core.sender_identity import normalize_address, owner_matcher, sender_owner
+
+logger = logging.getLogger("ai_agent_platform.sender_reputation")
+
+# v2 dropped the per-domain counts of v1.
+_SNAPSHOT_VERSION = 2
+
+
+def _sender_key(from_address: str, list_id: str | None) -> str | None:
+    """``list:<owner> <list-id>`` for list mail, else ``addr:<address>``."""
+    if list_id:
+        return f"list:{sender_owner(from_address)} {list_id}"
+    address = normalize_address(from_address)
+    return f"addr:{address}" if address else None
+
+
+def _key_owner(key: str) -> str:
+    tag, _, rest = key.partition(":")
+    return rest.split(" ", 1)[0] if tag == "list" else sender_owner(rest)
+
+
+class SenderReputationStore:
+    """Bounded in-memory outcome counts per ``(kind, sender key)`` with file snapshots."""
+
+    def __init__(
+        self,
+        snapshot_path: str = "",
+        snapshot_interval_sec: float = 60.0,
+        max_senders: int = 100_000,
+    ) -> None:
+        self._snapshot_path = snapshot_path
+        self._snapshot_interval_sec = snapshot_interval_sec
+        self._max_senders = max(1, max_senders)
+        # "kind|key" -> {outcome: count}, least recently updated first
+        self._counts: OrderedDict[str, dict[str, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_snapshot = time.monotonic()
+        self._dirty = False
+        self._lookups = 0
+        self._answers = 0
+        if snapshot_path:
+            self.load()
+
+    def record(
+        self, kind: str, from_address: str, outcome: str, list_id: str | None = None
+    ) -> None:
+        """Count one authoritative outcome for the list, or else the exact sender address."""
+        key = _sender_key(from_address, list_id)
+        if key is None:
+            return
+        slot = f"{kind}|{key}"
+        with self._lock:
+            outcomes = self._counts.setdefault(slot, {})
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            self._counts.move_to_end(slot)
+            while len(self._counts) > self._max_senders:
+                self._counts.popitem(last=False)
+            self._dirty = True
+            due = (
+                self._snapshot_path
+                and time.monotonic() - self._last_snapshot >= self._snapshot_interval_sec
+            )
+        if due:
+            self.snapshot()
+
+    def verdict(
+        self,
+        kind: str,
+        from_address: str,
+        min_count: int | None = None,
+        min_share: float | None = None,
+        list_id: str | None = None,
+    ) -> tuple[str, float] | None:
+        """Dominant outcome and its share when the history is confidently one-sided."""
+
+        needed = settings.sender_reputation_min_count if min_count is None else min_count
+        share_needed = settings.sender_reputation_min_share if min_share is None else min_share
+        key = _sender_key(from_address, list_id)
+        with self._lock:
+            self._lookups += 1
+            outcomes = self._counts.get(f"{kind}|{key}") if key else None
+            if not outcomes:
+                return None
+            total = sum(outcomes.values())
+            outcome, count = max(outcomes.items(), key=lambda item: item[1])
+            if total >= needed and count / total >= share_needed:
+                self._answers += 1
+                return outcome, count / total
+        return None
+
+    def forget(self, kind: str, sender: str) -> int:
+        """Drop the ``kind`` history a sender address or domain owns; returns the count.
+
+        Ownership follows ``sender_owner``: an address on a company domain
+        covers the whole domain, one on a shared mailbox domain only itself.
+        """
+        matches = owner_matcher(sender)
+        if matches is None:
+            return 0
+        prefix = f"{kind}|"
+        with self._lock:
+            dropped = [
+                slot
+                for slot in self._counts
+                if slot.startswith(prefix) and matches(_key_owner(slot[len(prefix) :]))
+            ]
+            for slot in dropped:
+                del self._counts[slot]
+            if dropped:
+                self._dirty = True
+        return len(dropped)
+
+    def load(self) -> None:
+        try:
+            with open(self._snapshot_path, encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning(
+                "sender reputation snapshot unreadable path=%s error=%s", self._snapshot_path, exc
+            )
+            return
+        if payload.get("version") != _SNAPSHOT_VERSION:
+            return
+        with self._lock:
+            self._counts = OrderedDict(
+                (slot, {str(k): int(v) for k, v in outcomes.items()})
+                for slot, outcomes in payload.get("counts", {}).items()
+            )
+        logger.info(
+            "sender reputation loaded path=%s senders=%d", self._snapshot_path, len(self._counts)
+        )
+
+    def snapshot(self) -> None:
+        """Atomically write the counts to the snapshot file (no-op when clean)."""
+        if not self._snapshot_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {
+                "version": _SNAPSHOT_VERSION,
+                "counts": {slot: dict(outcomes) for slot, outcomes in self._counts.items()},
+            }
+            self._dirty = False
+            self._last_snapshot = time.monotonic()
+        tmp_path = f"{self._snapshot_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle)
+            os.replace(tmp_path, self._snapshot_path)
+        except OSError as exc:
+            logger.warning(
+                "sender reputation snapshot failed path=%s error=%s", self._snapshot_path, exc
+            )
+            with self._lock:
+                self._dirty = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._dirty = True
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "senders": len(self._counts),
+                "maxSenders": self._max_senders,
+                "lookups": self._lookups,
+                "answered": self._answers,
+                "answerRatio": round(self._answers / self._lookups, 4) if self._lookups else 0.0,
+                "snapshotPath": self._snapshot_path or None,
+            }
+
+
+sender_reputation = SenderReputationStore(
+    snapshot_path=settings.sender_reputation_snapshot_path,
+    snapshot_interval_sec=settings.sender_reputation_snapshot_interval_sec,
+    max_senders=settings.sender_reputation_max_senders,
+)
+atexit.register(sender_reputation.snapshot)
@@ -0,0 +1,131 @@
+"""Server-side conversation sessions so clients send only new messages per turn.
+
+A request with ``sessionId`` appends its messages to the stored history
+instead of carrying the whole conversation; a turn is only stored once its
+skill run succeeds. Each session keeps its recent
+messages (already validated) and their serialized ``ROLE: content`` lines,
+so a turn never re-validates or re-serializes earlier messages.
+Sessions live in an LRU+TTL cache and are refreshed on every turn.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from contextvars import ContextVar
+from uuid import uuid4
+
+from app.config.settings import settings
+from app.contracts.agent_request import AgentMessage
+from app.core.ttl_cache import TTLCache
+
+
+class ConversationSession:
+    """Bounded message history plus its pre-serialized prompt context."""
+
+    def __init__(self, session_id: str, max_messages: int) -> None:
+        self.session_id = session_id
+        # Distinguishes this history from an earlier session that reused the same id.
+        self.history_key = f"{session_id}:{uuid4().hex[:12]}"
+        self.turns = 0
+        # Messages ever appended; the oldest are dropped once ``max_messages`` is reached.
+        self.appended = 0
+        self._messages: deque[AgentMessage] = deque(maxlen=max_messages)
+        self._lines: deque[str] = deque(maxlen=max_messages)
+        self._lock = threading.Lock()
+
+    def append(self, messages: list[AgentMessage]) -> None:
+        limit = settings.max_message_chars
+        with self._lock:
+            for message in messages:
+                self.appended += 1
+                self._messages.append(message)
+                self._lines.append(f"{message.role.upper()}: {message.content[:limit]}")
+
+    def with_pending(self, messages: list[AgentMessage]) -> ConversationSession:
+        """A copy with ``messages`` appended, leaving this session untouched.
+
+        Skills run against the copy; the turn is written to the stored session
+        only once the skill has succeeded.
+        """
+        view = ConversationSession(self.session_id, self._messages.maxlen or 0)
+        view.history_key = self.history_key
+        with self._lock:
+            view.turns = self.turns
+            view.appended = self.appended
+            view._messages.extend(self._messages)
+            view._lines.extend(self._lines)
+        view.append(messages)
+        return view
+
+    def window(self, size: int) -> list[AgentMessage]:
+        """The most recent ``size`` messages, oldest first."""
+        with self._lock:
+            return list(self._messages)[-size:]
+
+    def lines(self) -> tuple[int, list[str]]:
+        """Position of the first kept message and the serialized ``ROLE: content`` lines."""
+        with self._lock:
+            return self.appended - len(self._lines), list(self._lines)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._messages)
+
+
+class SessionStore:
+    """LRU+TTL map of ``sessionId`` to conversation history."""
+
+    def __init__(self, max_entries: int, ttl_sec: float) -> None:
+        self._sessions: TTLCache[str, ConversationSession] = TTLCache(
+            max_entries=max_entries, ttl_sec=ttl_sec
+        )
+        self._create_lock = threading.Lock()
+
+    def open(self, session_id: str) -> ConversationSession:
+        """The stored session, or a new one that is only stored on its first commit."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = ConversationSession(session_id, settings.session_history_messages)
+        return session
+
+    def commit(
+        self, session: ConversationSession, messages: list[AgentMessage]
+    ) -> ConversationSession:
+        """Record a completed turn's messages; returns the stored session."""
+        with self._create_lock:
+            stored = self._sessions.get(session.session_id)
+            if stored is None:
+                stored = session
+            stored.turns += 1
+            # Re-set on every turn so an active session's TTL keeps sliding.
+            self._sessions.set(stored.session_id, stored)
+        stored.append(messages)
+        return stored
+
+    def append(self, session_id: str, messages: list[AgentMessage]) -> ConversationSession:
+        """Add a turn's new messages to the session (created on first use)."""
+        return self.commit(self.open(session_id), messages)
+
+    def get(self, session_id: str) -> ConversationSession | None:
+        return self._sessions.get(session_id)
+
+    def end(self, session_id: str) -> bool:
+        return self._sessions.invalidate(session_id)
+
+    def clear(self) -> None:
+        self._sessions.clear()
+
+    def stats(self) -> dict[str, object]:
+        return self._sessions.stats()
+
+
+session_store = SessionStore(
+    max_entries=settings.session_max_entries,
+    ttl_sec=settings.session_ttl_sec,
+)
+
+# Session of the request being executed, so skills can reuse its serialized history.
+current_session: ContextVar[ConversationSession | None] = ContextVar(
+    "current_session", default=None
+)
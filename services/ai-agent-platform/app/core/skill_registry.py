@@ -43,6 +43,7 @@ class SkillRegistry:
     def _init_factories(self) -> None:
         from app.skills.auth.skill import AuthSkill  # noqa: PLC0415
         from app.skills.coordinator.skill import CoordinatorSkill  # noqa: PLC0415
+        from app.skills.digest.skill import DigestSkill  # noqa: PLC0415
         from app.skills.followup.skill import FollowupSkill  # noqa: PLC0415
         from app.skills.inbox.skill import InboxSkill  # noqa: PLC0415
         from app.skills.summarize.skill import SummarizeSkill  # noqa: PLC0415
@@ -59,6 +60,7 @@ class SkillRegistry:
             "followup": lambda: FollowupSkill(mp),
             "unsubscribe": lambda: UnsubscribeSkill(mp),
             "coordinator": lambda: CoordinatorSkill(mp, self),
+            "digest": lambda: DigestSkill(self),
         }
 
     def get_skill(self, skill_name: str) -> object:
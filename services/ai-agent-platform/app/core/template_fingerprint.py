@@ -0,0 +1,58 @@
+"""Sender-template fingerprints and the outcome cache keyed by them.
+
+Receipts, shipping notices and digests from one sender differ only in names,
+numbers and URLs. Masking those variable tokens leaves a stable skeleton; its
+hash together with the sender domain identifies the template, so a previous
+triage or unsubscribe outcome for the same template can be reused.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+from app.config.settings import settings
+from app.core.sender_identity import sender_domain
+from app.core.ttl_cache import TTLCache
+
+# Only the head of long bodies matters for identifying the template.
+_BODY_SKELETON_CHARS = 2000
+
+_MASKS: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE), "<url>"),
+    (re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), "<email>"),
+    (
+        re.compile(r"\b(hi|hello|hey|dear)\s+[A-Z][\w'-]*(?:\s+[A-Z][\w'-]*)?", re.IGNORECASE),
+        r"\1 <name>",
+    ),
+    # Order numbers, tracking codes, hashes: any token mixing letters and digits.
+    (re.compile(r"\b(?=[A-Za-z-]*\d)(?=[\d-]*[A-Za-z])[A-Za-z0-9-]{5,}\b"), "<id>"),
+    (re.compile(r"[$€£₹]?\d[\d,.:/-]*"), "<num>"),
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def template_skeleton(text: str) -> str:
+    """Mask variable tokens (URLs, addresses, names, ids, numbers) in ``text``."""
+    skeleton = text
+    for pattern, replacement in _MASKS:
+        skeleton = pattern.sub(replacement, skeleton)
+    return _WHITESPACE.sub(" ", skeleton).strip().lower()
+
+
+def template_fingerprint(from_address: str, subject: str, body: str) -> str:
+    """Stable hash of sender domain + masked subject/body skeleton."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(sender_domain(from_address).encode())
+    digest.update(b"\x00")
+    digest.update(template_skeleton(subject).encode())
+    digest.update(b"\x00")
+    digest.update(template_skeleton(body[:_BODY_SKELETON_CHARS]).encode())
+    return digest.hexdigest()
+
+
+# Keys are ``(skill, fingerprint, ...)`` tuples; values are skill-specific outcome dicts.
+template_outcome_cache: TTLCache[tuple[str, ...], dict[str, object]] = TTLCache(
+    max_entries=settings.template_cache_max_entries,
+    ttl_sec=settings.template_cache_ttl_sec,
+)
@@ -0,0 +1,104 @@
+"""Per-thread result reuse keyed on a hash of the content a skill actually reads.
+
+The backend re-sends a thread whenever anything about it changes (labels,
+read state, new metadata keys), but triage only reads the subject, sender and
+the head of the body. Each participating skill declares its relevant fields;
+when their hash matches the last processed request for the same ``threadId``
+the stored response is returned without running the skill.
+
+Field specs (``settings.thread_result_fields``)::
+
+    "emailBody|body:1500"   metadata ``emailBody`` (else ``body``), first 1500 chars
+    "@locale"               request attribute: ``locale`` or ``requestedAction``
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+
+from app.config.settings import settings
+from app.contracts.agent_request import AgentRequest
+from app.contracts.agent_response import AgentResponse
+from app.core.ttl_cache import TTLCache
+
+
+def _field_value(request: AgentRequest, spec: str) -> str:
+    name, _, limit = spec.partition(":")
+    if name == "@locale":
+        value = request.context.locale
+    elif name == "@requestedAction":
+        value = request.requestedAction or ""
+    else:
+        metadata = request.context.metadata
+        value = next((metadata[key] for key in name.split("|") if metadata.get(key)), "")
+    return value[: int(limit)] if limit else value
+
+
+def relevant_content_hash(request: AgentRequest, fields: list[str]) -> str:
+    """Hash of the request content named by ``fields`` (order-sensitive)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for spec in fields:
+        digest.update(_field_value(request, spec).encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ThreadResultStore:
+    """Last response per ``(skill, threadId)`` together with its content hash."""
+
+    def __init__(self, max_entries: int, ttl_sec: float) -> None:
+        self._entries: TTLCache[tuple[str, str], tuple[str, AgentResponse]] = TTLCache(
+            max_entries=max_entries, ttl_sec=ttl_sec
+        )
+        self._lock = threading.Lock()
+        self._reused = 0
+        self._changed = 0
+
+    @staticmethod
+    def _key(request: AgentRequest) -> tuple[tuple[str, str], str] | None:
+        fields = settings.thread_result_fields.get(request.skill)
+        thread_id = request.context.metadata.get("threadId", "")
+        if not fields or not thread_id:
+            return None
+        return (request.skill, thread_id), relevant_content_hash(request, fields)
+
+    def lookup(self, request: AgentRequest) -> AgentResponse | None:
+        """Stored response when the thread's relevant content is unchanged."""
+        keyed = self._key(request)
+        if keyed is None:
+            return None
+        key, content_hash = keyed
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_hash, response = entry
+        with self._lock:
+            if stored_hash != content_hash:
+                self._changed += 1
+                return None
+            self._reused += 1
+        return response.model_copy(deep=True)
+
+    def store(self, request: AgentRequest, response: AgentResponse) -> None:
+        keyed = self._key(request)
+        if keyed is not None:
+            key, content_hash = keyed
+            self._entries.set(key, (content_hash, response.model_copy(deep=True)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        with self._lock:
+            self._reused = 0
+            self._changed = 0
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            counts = {"reused": self._reused, "contentChanged": self._changed}
+        return {**self._entries.stats(), **counts}
+
+
+thread_result_store = ThreadResultStore(
+    max_entries=settings.thread_result_max_entries,
+    ttl_sec=settings.thread_result_ttl_sec,
+)
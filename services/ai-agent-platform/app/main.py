@@ -7,17 +7,43 @@ from time import perf_counter
 from uuid import uuid4
 
 from fastapi import Depends, FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
 from app.config.settings import settings
+from app.contracts.agent_batch import AgentBatchRequest, AgentBatchResponse
 from app.contracts.agent_request import AgentRequest
 from app.contracts.agent_response import AgentResponse
+from app.contracts.followup_scan import FollowupScanRequest, FollowupScanResponse
+from app.contracts.progressive import ProgressiveRequest, ProgressiveResult
+from app.contracts.list_decision import (
+    ListDecisionInvalidateRequest,
+    ListDecisionInvalidateResponse,
+)
+from app.contracts.subscription_census import SubscriptionCensusResponse
+from app.contracts.triage_batch import TriageBatchRequest, TriageBatchResponse
 from app.core.agent_runtime import AgentRuntime
+from app.core.near_duplicate import near_duplicate_totals
+from app.core.progressive import progressive_results
+from app.core.prompt_budget import prompt_budget_stats
+from app.core.sender_reputation import sender_reputation
+from app.core.session_store import session_store
+from app.core.template_fingerprint import template_outcome_cache
+from app.core.thread_result_store import thread_result_store
+from app.skills.coordinator.graph import coordinator_skill_stats
+from app.skills.followup.templates import followup_template_stats
+from app.skills.inbox.compaction import conversation_summary_cache
+from app.skills.unsubscribe.census import SubscriptionCensus
+from app.skills.unsubscribe.decision_cache import list_decision_cache
+from app.skills.unsubscribe.graph import invalidate_sender_verdicts
 
 app = FastAPI(title=settings.service_name, version=settings.api_version)
 runtime = AgentRuntime()
 logger = logging.getLogger("ai_agent_platform")
 
+# Census bytes handed to a worker thread at a time.
+_CENSUS_FEED_BATCH_BYTES = 256 * 1024
+
 if not logger.handlers:
     logging.basicConfig(level=logging.INFO)
 
@@ -144,6 +170,19 @@ def health() -> dict[str, object]:
         "latencyWarnMs": settings.latency_warn_ms,
         "errorRateWarnPercent": settings.error_rate_warn_percent,
         "alertingState": alerting_state,
+        "promptBudget": prompt_budget_stats.snapshot(),
+        "caches": {
+            "templateOutcomes": template_outcome_cache.stats(),
+            "threadResults": thread_result_store.stats(),
+            "listDecisions": list_decision_cache.stats(),
+            "sessions": session_store.stats(),
+            "conversationSummaries": conversation_summary_cache.stats(),
+        },
+        "senderReputation": sender_reputation.stats(),
+        "nearDuplicates": near_duplicate_totals.snapshot(),
+        "followupTemplates": followup_template_stats.snapshot(),
+        "coordinatorSkills": coordinator_skill_stats.snapshot(),
+        "progressive": progressive_results.stats(),
     }
 
 
@@ -161,3 +200,129 @@ def respond(
     # Request ID can be sourced from header or payload.
     request.requestId = x_request_id or request.requestId
     return runtime.respond(request)
+
+
+@app.post(
+    "/v1/agent/respond/progressive",
+    response_model=ProgressiveResult,
+    dependencies=[Depends(verify_inbound_key)],
+)
+def respond_progressive(
+    request: ProgressiveRequest,
+    x_request_id: str | None = Header(default=None),
+) -> ProgressiveResult:
+    """Return the rule-tier answer now; the LLM-refined result follows by callback or poll."""
+
+    request.request.requestId = x_request_id or request.request.requestId
+    return runtime.respond_progressive(request)
+
+
+@app.get(
+    "/v1/agent/results/{result_id}",
+    response_model=ProgressiveResult,
+    dependencies=[Depends(verify_inbound_key)],
+)
+def progressive_result(result_id: str) -> ProgressiveResult:
+    """Poll a progressive result: pending (rule-tier answer), complete or failed."""
+
+    result = progressive_results.get(result_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="unknown or expired result id")
+    return result
+
+
+@app.post(
+    "/v1/agent/respond/batch",
+    response_model=AgentBatchResponse,
+    dependencies=[Depends(verify_inbound_key)],
+)
+def respond_batch(
+    request: AgentBatchRequest,
+    x_request_id: str | None = Header(default=None),
+) -> AgentBatchResponse:
+    """Run many skill requests; near-duplicate emails are executed once per cluster."""
+
+    request.requestId = x_request_id or request.requestId
+    return runtime.respond_batch(request)
+
+
+@app.post(
+    "/v1/agent/triage/batch",
+    response_model=TriageBatchResponse,
+    dependencies=[Depends(verify_inbound_key)],
+)
+def triage_batch(
+    request: TriageBatchRequest,
+    x_request_id: str | None = Header(default=None),
+) -> TriageBatchResponse:
+    """Triage a page of emails in one call; results are returned per email."""
+
+    request.requestId = x_request_id or request.requestId
+    return runtime.triage_batch(request)
+
+
+@app.post(
+    "/v1/agent/followup/scan",
+    response_model=FollowupScanResponse,
+    dependencies=[Depends(verify_inbound_key)],
+)
+def followup_scan(
+    request: FollowupScanRequest,
+    x_request_id: str | None = Header(default=None),
+) -> FollowupScanResponse:
+    """Rank thousands of unanswered threads by follow-up urgency; draft the top N."""
+
+    request.requestId = x_request_id or request.requestId
+    return runtime.followup_scan(request)
+
+
+@app.post(
+    "/v1/agent/unsubscribe/census",
+    response_model=SubscriptionCensusResponse,
+    dependencies=[Depends(verify_inbound_key)],
+)
+async def subscription_census(request: Request) -> SubscriptionCensusResponse:
+    """Aggregate an NDJSON stream of email headers per list; one verdict per list."""
+
+    # The body is consumed chunk by chunk, so memory stays bounded by the list count.
+    # Parsing runs off the event loop, a batch of chunks at a time.
+    census = SubscriptionCensus()
+    batch: list[bytes] = []
+    batched = 0
+    async for chunk in request.stream():
+        batch.append(chunk)
+        batched += len(chunk)
+        if batched >= _CENSUS_FEED_BATCH_BYTES:
+            await run_in_threadpool(census.feed, b"".join(batch))
+            batch, batched = [], 0
+    if batch:
+        await run_in_threadpool(census.feed, b"".join(batch))
+    census.close()
+    return await run_in_threadpool(
+        runtime.subscription_census, request.state.request_id, census
+    )
+
+
+@app.post(
+    "/v1/agent/unsubscribe/decisions/invalidate",
+    response_model=ListDecisionInvalidateResponse,
+    dependencies=[Depends(verify_inbound_key)],
+)
+def invalidate_list_decisions(
+    request: ListDecisionInvalidateRequest,
+) -> ListDecisionInvalidateResponse:
+    """Drop every cached keep/unsubscribe verdict for a sender address or domain."""
+
+    return ListDecisionInvalidateResponse(
+        invalidated=invalidate_sender_verdicts(request.sender)
+    )
+
+
+@app.delete(
+    "/v1/agent/sessions/{session_id}",
+    dependencies=[Depends(verify_inbound_key)],
+)
+def end_session(session_id: str) -> dict[str, object]:
+    """Discard a conversation session's stored history."""
+
+    return {"sessionId": session_id, "ended": session_store.end(session_id)}
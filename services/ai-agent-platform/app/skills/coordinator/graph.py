@@ -3,13 +3,20 @@
 from __future__ import annotations
 
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
 from typing import TYPE_CHECKING, TypedDict
 
 from langgraph.graph import END, START, StateGraph
 
-from app.contracts.agent_request import AgentContext, AgentMessage, AgentRequest
+from app.config.settings import settings
+from app.contracts.agent_request import AgentMessage, AgentRequest
 from app.contracts.agent_response import AgentResponse, SafetyFlag, SuggestedAction
+from app.core.agent_trace import current_trace
+from app.core.blackboard import Blackboard, current_blackboard
+from app.core.deadline import Deadline, current_deadline
 from app.core.model_provider import BaseModelProvider
 
 if TYPE_CHECKING:
@@ -25,6 +32,14 @@ _ROUTING_MAP = {
     "inbox": ["reply", "draft", "compose", "respond", "open thread"],
 }
 
+# Blackboard facts each sub-skill publishes for the others (see app.core.blackboard).
+_PUBLISHED_FACTS = {"triage": ("triage.classification",)}
+
+# Upstream skills whose published facts a skill consumes; must stay acyclic.
+# Unsubscribe only reads triage's verdict on its fallback path, where
+# ``await_fact`` already waits for the declared producer, so it starts at once.
+_SKILL_DEPENDENCIES = {"followup": ("triage",)}
+
 
 class CoordinatorGraphState(TypedDict):
     """Execution state for the coordinator skill graph."""
@@ -32,6 +47,10 @@ class CoordinatorGraphState(TypedDict):
     request: AgentRequest
     routed_skills: list[str]
     sub_responses: list[AgentResponse]
+    timed_out_skills: list[str]
+    failed_skills: list[str]
+    shared_facts: dict[str, int]
+    critical_path: list[str]
     assistant_text: str
     suggested_actions: list[SuggestedAction]
     safety_flags: list[SafetyFlag]
@@ -39,6 +58,51 @@ class CoordinatorGraphState(TypedDict):
     confidence: float
 
 
+class CoordinatorSkillStats:
+    """Thread-safe per-sub-skill outcome counts and latency for coordinator fan-out."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._skills: dict[str, dict[str, float]] = {}
+
+    def record(self, skill: str, outcome: str, latency_ms: float) -> None:
+        """``outcome`` is ``completed``, ``failed`` or ``timedOut``."""
+        with self._lock:
+            entry = self._skills.setdefault(
+                skill,
+                {"calls": 0, "completed": 0, "failed": 0, "timedOut": 0, "totalLatencyMs": 0.0},
+            )
+            entry["calls"] += 1
+            entry[outcome] += 1
+            entry["totalLatencyMs"] += latency_ms
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                skill: {
+                    "calls": int(entry["calls"]),
+                    "completed": int(entry["completed"]),
+                    "failed": int(entry["failed"]),
+                    "timedOut": int(entry["timedOut"]),
+                    "avgLatencyMs": round(entry["totalLatencyMs"] / entry["calls"], 2),
+                }
+                for skill, entry in self._skills.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._skills.clear()
+
+
+coordinator_skill_stats = CoordinatorSkillStats()
+
+
+def skill_deadline_sec(skill: str) -> float:
+    """Deadline configured for a coordinator sub-skill, in seconds."""
+    ms = settings.coordinator_skill_deadlines_ms.get(skill, settings.coordinator_deadline_ms)
+    return ms / 1000
+
+
 def route_intent_node(
     state: CoordinatorGraphState, model_provider: BaseModelProvider
 ) -> dict[str, object]:
@@ -71,30 +135,53 @@ def route_intent_node(
     }
 
 
+def execution_plan(routed_skills: list[str]) -> dict[str, tuple[str, ...]]:
+    """Dependency DAG of the routed skills: each skill's routed upstream skills."""
+    return {
+        skill: tuple(d for d in _SKILL_DEPENDENCIES.get(skill, ()) if d in routed_skills)
+        for skill in routed_skills
+    }
+
+
+def critical_path(plan: dict[str, tuple[str, ...]], settled_ms: dict[str, float]) -> list[str]:
+    """Dependency chain ending at the last skill to settle, upstream first."""
+    if not settled_ms:
+        return []
+    skill = max(settled_ms, key=settled_ms.__getitem__)
+    path = [skill]
+    while upstream := [d for d in plan[skill] if d in settled_ms]:
+        skill = max(upstream, key=settled_ms.__getitem__)
+        path.append(skill)
+    return path[::-1]
+
+
 def dispatch_skills_node(
     state: CoordinatorGraphState, registry: "SkillRegistry"
 ) -> dict[str, object]:
-    """Execute routed skills in parallel using ThreadPoolExecutor."""
+    """Execute routed skills as a dependency DAG, each bounded by its own deadline.
+
+    Independent skills run concurrently; a skill that consumes another's
+    output (``_SKILL_DEPENDENCIES``, e.g. followup needs triage's priority)
+    starts once its upstream skills have settled, so it reads their facts
+    from the blackboard instead of guessing. A skill whose upstream fails or
+    times out still runs, with its usual fallbacks.
+
+    A sub-skill that misses its deadline is cancelled (its next model call
+    raises ``DeadlineExceeded``; a task not yet started never runs) and is
+    reported in ``timed_out_skills``; results of the others are kept.
+
+    All sub-skills share one ``Blackboard``, so facts derived from the email
+    are computed once. The critical path (the dependency chain that finished
+    last) is recorded on the request trace.
+    """
     request = state["request"]
     routed_skills = state["routed_skills"]
-    sub_responses: list[AgentResponse] = []
 
-    def run_skill(skill_name: str) -> AgentResponse | None:
+    def run_skill(skill_name: str, deadline: Deadline) -> AgentResponse | None:
+        current_deadline.set(deadline)
         try:
-            # Build a sub-request with the same context but targeted skill
-            sub_request = AgentRequest(
-                version="v1",
-                skill=skill_name,
-                requestId=f"{request.requestId}:{skill_name}",
-                messages=request.messages,
-                context=AgentContext(
-                    surface=request.context.surface,
-                    locale=request.context.locale,
-                    email=request.context.email,
-                    metadata=request.context.metadata,
-                ),
-                allowedActions=request.allowedActions,
-            )
+            # Same validated messages and context, targeted at the sub-skill
+            sub_request = request.for_skill(skill_name, f"{request.requestId}:{skill_name}")
             skill = registry.get_skill(skill_name)
             if hasattr(skill, "run"):
                 return skill.run(sub_request)  # type: ignore[union-attr]
@@ -102,25 +189,116 @@ def dispatch_skills_node(
             logger.warning("coordinator sub-skill %s failed: %s", skill_name, exc)
         return None
 
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = {executor.submit(run_skill, s): s for s in routed_skills}
-        for future in as_completed(futures, timeout=10):
-            result = future.result()
-            if result is not None:
-                sub_responses.append(result)
+    plan = execution_plan(routed_skills)
+    started = time.monotonic()
+    results: dict[str, AgentResponse] = {}
+    timed_out: list[str] = []
+    failed: list[str] = []
+    # Milliseconds after dispatch at which each skill completed, failed or timed out.
+    settled_ms: dict[str, float] = {}
+    waiting = list(routed_skills)
+    blackboard = Blackboard(
+        expected=tuple(fact for s in routed_skills for fact in _PUBLISHED_FACTS.get(s, ()))
+    )
+    executor = ThreadPoolExecutor(max_workers=4)
+    tasks: dict[Future[AgentResponse | None], tuple[str, Deadline, float]] = {}
+
+    def submit_ready() -> set[Future[AgentResponse | None]]:
+        """Start every waiting skill whose upstream skills have all settled."""
+        submitted: set[Future[AgentResponse | None]] = set()
+        for skill_name in [s for s in waiting if all(d in settled_ms for d in plan[s])]:
+            waiting.remove(skill_name)
+            # A dependent skill's deadline runs from its own start, not the coordinator's.
+            deadline = Deadline(skill_deadline_sec(skill_name))
+            # Each task runs in a copy of this context so model calls reach the
+            # trace and the blackboard.
+            future = executor.submit(copy_context().run, run_skill, skill_name, deadline)
+            tasks[future] = (skill_name, deadline, time.monotonic())
+            submitted.add(future)
+        return submitted
+
+    token = current_blackboard.set(blackboard)
+    try:
+        pending = submit_ready()
+        while pending:
+            next_expiry = min(tasks[f][1].remaining() for f in pending)
+            done, pending = wait(pending, timeout=next_expiry, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in done:
+                skill_name, _, submitted_at = tasks[future]
+                _abandon_facts(blackboard, skill_name)
+                result = future.result()
+                if result is None:
+                    failed.append(skill_name)
+                else:
+                    results[skill_name] = result
+                settled_ms[skill_name] = (now - started) * 1000
+                coordinator_skill_stats.record(
+                    skill_name,
+                    "completed" if result is not None else "failed",
+                    (now - submitted_at) * 1000,
+                )
+            for future in [f for f in pending if tasks[f][1].remaining() <= 0]:
+                skill_name, deadline, submitted_at = tasks[future]
+                deadline.cancel()
+                future.cancel()
+                pending.discard(future)
+                timed_out.append(skill_name)
+                _abandon_facts(blackboard, skill_name)
+                settled_ms[skill_name] = (now - started) * 1000
+                coordinator_skill_stats.record(skill_name, "timedOut", (now - submitted_at) * 1000)
+                logger.warning(
+                    "coordinator sub-skill %s timed out after %.1fs", skill_name, deadline.timeout_sec
+                )
+            # Downstream skills start as soon as their inputs are settled.
+            pending |= submit_ready()
+    finally:
+        current_blackboard.reset(token)
+        # Do not wait for cancelled stragglers; they stop at their next model call.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    path = critical_path(plan, settled_ms)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.critical_path = path
+        trace.critical_path_ms = round(settled_ms[path[-1]], 2) if path else 0.0
+
+    return {
+        "sub_responses": [results[s] for s in routed_skills if s in results],
+        "timed_out_skills": timed_out,
+        "failed_skills": failed,
+        "shared_facts": blackboard.stats(),
+        "critical_path": path,
+    }
 
-    return {"sub_responses": sub_responses}
+
+def _abandon_facts(blackboard: Blackboard, skill_name: str) -> None:
+    """Stop other sub-skills waiting on facts a finished skill did not publish."""
+    for fact in _PUBLISHED_FACTS.get(skill_name, ()):
+        blackboard.abandon(fact)
 
 
 def aggregate_results_node(state: CoordinatorGraphState) -> dict[str, object]:
     """Merge results from all sub-skills into a unified response."""
     sub_responses = state["sub_responses"]
+    timed_out = state.get("timed_out_skills", [])
+    partial_flags = (
+        [
+            SafetyFlag(
+                code="partial_results",
+                severity="info",
+                message=f"Some skills did not finish in time: {', '.join(timed_out)}.",
+            )
+        ]
+        if timed_out
+        else []
+    )
 
     if not sub_responses:
         return {
             "assistant_text": "I couldn't process your request at this time. Please try again.",
             "suggested_actions": [],
-            "safety_flags": [],
+            "safety_flags": partial_flags,
         }
 
     # Aggregate text responses
@@ -147,7 +325,7 @@ def aggregate_results_node(state: CoordinatorGraphState) -> dict[str, object]:
     return {
         "assistant_text": combined_text[:1000],
         "suggested_actions": unique_actions[:10],
-        "safety_flags": all_flags[:5],
+        "safety_flags": (partial_flags + all_flags)[:5],
     }
 
 
@@ -35,6 +35,10 @@ class CoordinatorSkill:
                 "request": request,
                 "routed_skills": [],
                 "sub_responses": [],
+                "timed_out_skills": [],
+                "failed_skills": [],
+                "shared_facts": {},
+                "critical_path": [],
                 "assistant_text": "",
                 "suggested_actions": [],
                 "safety_flags": [],
@@ -53,6 +57,19 @@ class CoordinatorSkill:
             uiHints={
                 "surface": request.context.surface,
                 "locale": request.context.locale,
+                "completedSkills": ",".join(r.skill for r in state["sub_responses"]),
+                "sharedFactHits": str(state["shared_facts"].get("hits", 0)),
+                "criticalPath": ">".join(state["critical_path"]),
+                **(
+                    {"partial": "true", "timedOutSkills": ",".join(state["timed_out_skills"])}
+                    if state["timed_out_skills"]
+                    else {}
+                ),
+                **(
+                    {"failedSkills": ",".join(state["failed_skills"])}
+                    if state["failed_skills"]
+                    else {}
+                ),
             },
             safetyFlags=state["safety_flags"],
         )
@@ -0,0 +1,252 @@
+"""LangGraph flow for a multi-thread daily digest — one round trip for many threads."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import TYPE_CHECKING, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from app.config.settings import settings
+from app.contracts.agent_request import AgentContext, AgentRequest
+from app.contracts.agent_response import AgentResponse, SafetyFlag, SuggestedAction
+from app.core.date_extraction import parse_email_date
+from app.core.fallback import fallback_tracking
+from app.core.thread_result_store import thread_result_store
+
+if TYPE_CHECKING:
+    from app.core.skill_registry import SkillRegistry
+
+logger = logging.getLogger("ai_agent_platform.digest")
+
+_PRIORITY_RANK = {"urgent": 0, "high": 1, "normal": 2, "low": 3}
+# AgentRequest.requestId limit.
+_MAX_REQUEST_ID = 128
+
+
+class DigestGraphState(TypedDict):
+    """Execution state for the digest skill graph."""
+
+    request: AgentRequest
+    threads: list[dict[str, object]]
+    entries: list[dict[str, object]]
+    assistant_text: str
+    suggested_actions: list[SuggestedAction]
+    safety_flags: list[SafetyFlag]
+    intent: str
+    confidence: float
+
+
+def _parse_threads(request: AgentRequest) -> list[dict[str, object]]:
+    raw = request.context.metadata.get("digestThreads", "")
+    try:
+        threads = json.loads(raw) if raw else []
+    except (json.JSONDecodeError, TypeError):
+        return []
+    if not isinstance(threads, list):
+        return []
+    return [t for t in threads if isinstance(t, dict) and t.get("threadId")]
+
+
+def parse_threads_node(state: DigestGraphState) -> dict[str, object]:
+    """Read the thread list from ``digestThreads`` metadata (JSON array)."""
+    threads = _parse_threads(state["request"])
+    limit = settings.digest_max_threads
+    flags: list[SafetyFlag] = []
+    if len(threads) > limit:
+        flags.append(
+            SafetyFlag(
+                code="digest_truncated",
+                severity="info",
+                message=f"Digest covers the first {limit} of {len(threads)} threads.",
+            )
+        )
+    return {"threads": threads[:limit], "safety_flags": flags}
+
+
+def _sub_request(request: AgentRequest, skill: str, thread: dict[str, object]) -> AgentRequest:
+    """Per-thread summarize/triage request carrying the thread's email fields."""
+    messages = thread.get("messages")
+    latest = messages[-1] if isinstance(messages, list) and messages else {}
+    if not isinstance(latest, dict):
+        latest = {}
+    metadata = {
+        "threadId": str(thread["threadId"]),
+        "emailSubject": str(thread.get("subject", "")),
+        "emailFrom": str(thread.get("from") or latest.get("from", "")),
+        "emailBody": str(thread.get("body") or latest.get("body", "")),
+        "emailDate": str(thread.get("date") or latest.get("date", "")),
+    }
+    if isinstance(messages, list) and messages:
+        metadata["threadMessages"] = json.dumps(messages)
+    request_id = f"{request.requestId}:{skill}:{thread['threadId']}"
+    if len(request_id) > _MAX_REQUEST_ID:
+        # Keep long thread ids within the contract's limit, stable per thread
+        digest = hashlib.blake2b(str(thread["threadId"]).encode(), digest_size=8).hexdigest()
+        request_id = f"{request.requestId[: _MAX_REQUEST_ID - len(skill) - 18]}:{skill}:{digest}"
+    return AgentRequest(
+        version="v1",
+        skill=skill,
+        requestId=request_id,
+        messages=request.messages,
+        context=AgentContext(
+            surface=request.context.surface,
+            locale=request.context.locale,
+            email=request.context.email,
+            metadata={k: v for k, v in metadata.items() if v},
+        ),
+    )
+
+
+def _action_payload(response: AgentResponse | None, name: str) -> dict[str, str]:
+    if response is None:
+        return {}
+    return next((a.payload for a in response.suggestedActions if a.name == name), {})
+
+
+def summarize_threads_node(
+    state: DigestGraphState, registry: "SkillRegistry"
+) -> dict[str, object]:
+    """Triage and summarize every thread in parallel, reusing stored per-thread results.
+
+    Summaries come from the summarize skill, whose per-thread state makes an
+    unchanged thread free and a thread with one new reply a single small
+    call; triage results are reused while the thread's content hash matches.
+    Threads that already carry a ``priority`` skip triage.
+    """
+
+    request = state["request"]
+
+    def run(skill_name: str, thread: dict[str, object]) -> AgentResponse | None:
+        try:
+            # Built inside the try: a thread that fails validation only loses its own entry.
+            sub_request = _sub_request(request, skill_name, thread)
+            cached = thread_result_store.lookup(sub_request)
+            if cached is not None:
+                return cached
+            skill = registry.get_skill(skill_name)
+            with fallback_tracking() as fallbacks:
+                response: AgentResponse = skill.run(sub_request)  # type: ignore[attr-defined]
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "digest sub-skill %s failed thread=%s: %s", skill_name, thread["threadId"], exc
+            )
+            return None
+        if not fallbacks:
+            thread_result_store.store(sub_request, response)
+        return response
+
+    jobs: list[tuple[int, str]] = []
+    for index, thread in enumerate(state["threads"]):
+        jobs.append((index, "summarize"))
+        if not thread.get("priority"):
+            jobs.append((index, "triage"))
+
+    results: dict[tuple[int, str], AgentResponse | None] = {}
+    if jobs:
+        workers = max(1, min(settings.digest_concurrency, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Each task runs in a copy of this context so model calls reach the trace.
+            futures = {
+                job: pool.submit(copy_context().run, run, job[1], state["threads"][job[0]])
+                for job in jobs
+            }
+            results = {job: future.result() for job, future in futures.items()}
+
+    entries: list[dict[str, object]] = []
+    for index, thread in enumerate(state["threads"]):
+        summary_response = results.get((index, "summarize"))
+        summary = _action_payload(summary_response, "summarize.view_summary")
+        labels = _action_payload(results.get((index, "triage")), "triage.apply_labels")
+        priority = str(thread.get("priority") or labels.get("priority") or "normal").lower()
+        entries.append(
+            {
+                "threadId": str(thread["threadId"]),
+                "subject": str(thread.get("subject", "")) or "(no subject)",
+                "date": str(thread.get("date", "")),
+                "priority": priority if priority in _PRIORITY_RANK else "normal",
+                "category": labels.get("category", str(thread.get("category", ""))),
+                "requiresReply": labels.get("requiresReply") == "true",
+                "summary": summary.get("summary")
+                or (summary_response.assistantText if summary_response else ""),
+                "deadlines": json.loads(summary.get("deadlines", "[]")),
+            }
+        )
+    return {"entries": entries}
+
+
+def rank_threads_node(state: DigestGraphState) -> dict[str, object]:
+    """Order threads by triage priority, then reply-needed, then most recent."""
+    def received_at(entry: dict[str, object]) -> float:
+        parsed = parse_email_date(str(entry["date"]))
+        return parsed.timestamp() if parsed is not None else 0.0
+
+    entries = sorted(state["entries"], key=received_at, reverse=True)
+    entries.sort(key=lambda e: (_PRIORITY_RANK[str(e["priority"])], not e["requiresReply"]))
+    return {"entries": entries}
+
+
+def compose_digest_node(state: DigestGraphState) -> dict[str, object]:
+    """Render the ranked entries as one digest text plus per-thread actions."""
+    entries = state["entries"]
+    if not entries:
+        return {
+            "assistant_text": "No threads to include in your digest.",
+            "suggested_actions": [],
+            "intent": "digest_empty",
+            "confidence": 0.5,
+        }
+
+    counts = {p: sum(1 for e in entries if e["priority"] == p) for p in _PRIORITY_RANK}
+    headline = f"Your digest: {len(entries)} threads"
+    notable = [f"{counts[p]} {p}" for p in ("urgent", "high") if counts[p]]
+    lines = [headline + (f" ({', '.join(notable)})." if notable else ".")]
+    for position, entry in enumerate(entries, start=1):
+        line = f"{position}. [{str(entry['priority']).upper()}] {entry['subject']}"
+        if entry["summary"]:
+            line += f" — {entry['summary']}"
+        if entry["deadlines"]:
+            line += f" (due: {entry['deadlines'][0]})"
+        lines.append(line)
+
+    actions = [
+        SuggestedAction(
+            name="digest.open_thread",
+            label=f"Open: {str(entry['subject'])[:100]}",
+            payload={
+                "threadId": str(entry["threadId"]),
+                "priority": str(entry["priority"]),
+                "summary": str(entry["summary"])[:255],
+            },
+        )
+        for entry in entries[:10]
+    ]
+    return {
+        "assistant_text": "\n".join(lines),
+        "suggested_actions": actions,
+        "intent": "digest_compose",
+        "confidence": 0.85,
+    }
+
+
+def build_digest_skill_graph(registry: "SkillRegistry"):
+    """Build and compile the digest skill LangGraph workflow."""
+    graph = StateGraph(DigestGraphState)
+    graph.add_node("parse_threads", parse_threads_node)
+    graph.add_node(
+        "summarize_threads",
+        lambda state: summarize_threads_node(state, registry),
+    )
+    graph.add_node("rank_threads", rank_threads_node)
+    graph.add_node("compose_digest", compose_digest_node)
+
+    graph.add_edge(START, "parse_threads")
+    graph.add_edge("parse_threads", "summarize_threads")
+    graph.add_edge("summarize_threads", "rank_threads")
+    graph.add_edge("rank_threads", "compose_digest")
+    graph.add_edge("compose_digest", END)
+    return graph.compile()
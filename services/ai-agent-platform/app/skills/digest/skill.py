@@ -0,0 +1,55 @@
+"""Digest skill plugin — one ranked morning digest over many threads."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from app.contracts.agent_request import AgentRequest
+from app.contracts.agent_response import AgentResponse
+from app.skills.digest.graph import build_digest_skill_graph
+
+if TYPE_CHECKING:
+    from app.core.skill_registry import SkillRegistry
+
+
+class DigestSkill:
+    """Summarizes and triages many threads in parallel and ranks them into one digest."""
+
+    def __init__(self, registry: "SkillRegistry | None" = None) -> None:
+        from app.core.skill_registry import SkillRegistry as SR  # noqa: PLC0415
+
+        self._registry = registry or SR()
+        self._graph = build_digest_skill_graph(self._registry)
+
+    def run(self, request: AgentRequest) -> AgentResponse:
+        """Execute digest graph and return the aggregated digest response."""
+        state = self._graph.invoke(
+            {
+                "request": request,
+                "threads": [],
+                "entries": [],
+                "assistant_text": "",
+                "suggested_actions": [],
+                "safety_flags": [],
+                "intent": "digest_compose",
+                "confidence": 0.5,
+            }
+        )
+
+        entries = state["entries"]
+        return AgentResponse(
+            version="v1",
+            skill="digest",
+            assistantText=state["assistant_text"],
+            intent=state["intent"],
+            confidence=float(state["confidence"]),
+            suggestedActions=state["suggested_actions"],
+            uiHints={
+                "surface": request.context.surface,
+                "locale": request.context.locale,
+                "threadCount": str(len(entries)),
+                "urgentCount": str(sum(1 for e in entries if e["priority"] == "urgent")),
+                "rankedThreadIds": ",".join(str(e["threadId"]) for e in entries),
+            },
+            safetyFlags=state["safety_flags"],
+        )
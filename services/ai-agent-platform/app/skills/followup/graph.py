@@ -8,12 +8,25 @@ from typing import TypedDict
 
 from langgraph.graph import END, START, StateGraph
 
+from app.config.settings import settings
 from app.contracts.agent_request import AgentRequest
 from app.contracts.agent_response import SafetyFlag, SuggestedAction
+from app.core.blackboard import await_fact
+from app.core.date_extraction import parse_email_date
+from app.core.fallback import note_fallback
 from app.core.model_provider import BaseModelProvider
+from app.core.prompt_budget import PromptSection, fit_prompt, generate_budgeted
+from app.skills.followup.templates import (
+    bespoke_reason,
+    followup_template_stats,
+    render_template,
+)
 
 logger = logging.getLogger("ai_agent_platform.followup")
 
+# Days without a reply before a thread needs a follow-up, by priority.
+FOLLOWUP_THRESHOLDS = {"urgent": 1, "high": 2, "normal": 3, "low": 7}
+
 
 class FollowupGraphState(TypedDict):
     """Execution state for the followup skill graph."""
@@ -23,6 +36,7 @@ class FollowupGraphState(TypedDict):
     needs_followup: bool
     urgency_score: float
     draft_followup: str
+    draft_source: str
     suggested_send_at: str
     assistant_text: str
     suggested_actions: list[SuggestedAction]
@@ -41,28 +55,33 @@ def _get_days_unanswered(request: AgentRequest) -> int:
         except ValueError:
             pass
 
-    sent_date_str = md.get("sentAt") or md.get("sent_at", "")
-    if sent_date_str:
-        try:
-            sent_date = datetime.fromisoformat(sent_date_str.replace("Z", "+00:00"))
-            delta = datetime.now(tz=timezone.utc) - sent_date
-            return max(0, delta.days)
-        except ValueError:
-            pass
+    # ISO 8601, RFC 2822 (raw Date header) or epoch seconds/milliseconds
+    sent_date = parse_email_date(md.get("sentAt") or md.get("sent_at", ""))
+    if sent_date is not None:
+        delta = datetime.now(tz=timezone.utc) - sent_date
+        return max(0, delta.days)
 
     return 0
 
 
+def _thread_priority(request: AgentRequest) -> str:
+    """Caller-supplied priority, else triage's verdict from the same coordinator request."""
+    md = request.context.metadata
+    priority = md.get("priority") or md.get("aiPriority", "")
+    if priority:
+        return priority
+    triage = await_fact("triage.classification")
+    return str(triage["priority"]) if triage is not None else "normal"
+
+
 def detect_stale_thread_node(state: FollowupGraphState) -> dict[str, object]:
     """Determine if a thread is stale and needs follow-up based on time rules."""
     request = state["request"]
     days = _get_days_unanswered(request)
-    md = request.context.metadata
-    priority = md.get("priority") or md.get("aiPriority", "normal")
+    priority = _thread_priority(request)
 
     # Urgency thresholds by priority level
-    thresholds = {"urgent": 1, "high": 2, "normal": 3, "low": 7}
-    threshold = thresholds.get(priority.lower(), 3)
+    threshold = FOLLOWUP_THRESHOLDS.get(priority.lower(), 3)
 
     needs_followup = days >= threshold
     urgency_score = min(1.0, days / (threshold * 2)) if threshold > 0 else 0.0
@@ -76,10 +95,20 @@ def detect_stale_thread_node(state: FollowupGraphState) -> dict[str, object]:
     }
 
 
+def _draft_instructions(request: AgentRequest) -> str:
+    """Caller guidance for the draft: explicit metadata, else the latest user message."""
+    md = request.context.metadata
+    explicit = md.get("followupInstructions", "")
+    if explicit:
+        return explicit
+    user_messages = [m.content for m in request.messages if m.role == "user"]
+    return user_messages[-1] if user_messages else ""
+
+
 def draft_followup_node(
     state: FollowupGraphState, model_provider: BaseModelProvider
 ) -> dict[str, object]:
-    """Draft a polite follow-up message using LLM context."""
+    """Draft a polite follow-up: a filled template for routine nudges, else the LLM."""
     request = state["request"]
     md = request.context.metadata
     subject = md.get("emailSubject") or md.get("subject", "my previous email")
@@ -89,38 +118,86 @@ def draft_followup_node(
     if not state["needs_followup"]:
         return {
             "draft_followup": "",
+            "draft_source": "",
             "assistant_text": f"No follow-up needed yet. This email was sent {days} day(s) ago.",
         }
 
+    days_str = f"{days} day{'s' if days != 1 else ''}"
+    assistant_text = (
+        f"No reply received in {days_str}. "
+        f"I've drafted a follow-up message you can review and send."
+    )
+    instructions = _draft_instructions(request)
+    reason = (
+        bespoke_reason(request.context.locale, instructions)
+        if settings.followup_template_drafts
+        else "disabled"
+    )
+    followup_template_stats.record(reason)
+    if reason is None:
+        draft = render_template(
+            request.context.locale, _thread_priority(request), days, subject, recipient
+        )
+        return {
+            "draft_followup": draft,
+            "draft_source": "template",
+            "assistant_text": assistant_text,
+        }
+
     system = (
         "You are MailZen, helping draft concise follow-up emails. "
         "Be polite, professional, and brief. Don't be pushy."
     )
-    prompt = (
-        f"Draft a short follow-up email for this situation:\n"
-        f"- Original email subject: {subject}\n"
-        f"- Sent to: {recipient or 'the recipient'}\n"
-        f"- Days with no reply: {days}\n\n"
-        f"Write only the email body (2-3 sentences). "
-        f"Start with 'Hi,' or 'Hello,'. Be warm and professional."
+    budgeted = fit_prompt(
+        "followup",
+        system,
+        [
+            PromptSection(
+                name="email",
+                text=subject,
+                priority=1,
+                min_tokens=16,
+                prefix="Draft a short follow-up email for this situation:\n- Original email subject: ",
+                suffix=(
+                    f"\n- Sent to: {recipient or 'the recipient'}\n"
+                    f"- Days with no reply: {days}\n\n"
+                ),
+            ),
+            *(
+                [
+                    PromptSection(
+                        name="notes",
+                        text=instructions,
+                        priority=5,
+                        prefix="Sender's instructions: ",
+                        suffix="\n\n",
+                    )
+                ]
+                if reason == "instructions"
+                else []
+            ),
+            PromptSection(
+                name="instructions",
+                text=(
+                    "Write only the email body (2-3 sentences). "
+                    "Start with 'Hi,' or 'Hello,'. Be warm and professional."
+                ),
+                priority=9,
+            ),
+        ],
     )
 
     try:
-        draft = model_provider.generate(prompt, system=system, max_tokens=200)
+        draft = generate_budgeted(model_provider, budgeted, max_tokens=200)
     except RuntimeError:
+        note_fallback("followup_llm")
         draft = (
             f"Hi,\n\nI wanted to follow up on my email from {days} days ago "
             f"regarding {subject}. Please let me know if you have any questions "
             f"or if you need additional information.\n\nBest regards"
         )
 
-    days_str = f"{days} day{'s' if days != 1 else ''}"
-    assistant_text = (
-        f"No reply received in {days_str}. "
-        f"I've drafted a follow-up message you can review and send."
-    )
-
-    return {"draft_followup": draft, "assistant_text": assistant_text}
+    return {"draft_followup": draft, "draft_source": "llm", "assistant_text": assistant_text}
 
 
 def suggest_followup_schedule_node(state: FollowupGraphState) -> dict[str, object]:
@@ -0,0 +1,185 @@
+"""Bulk stale-thread scan — days unanswered and urgency for thousands of threads at once.
+
+Timestamps are parsed into one ``datetime64`` array (a per-row fallback
+covers RFC 2822, epoch and offset forms), and days, thresholds, urgency and
+the top-N ranking are computed with array operations using the same
+priority thresholds as ``detect_stale_thread_node``. Only the top N threads
+get an LLM follow-up draft.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.config.settings import settings
+from app.contracts.agent_request import AgentContext, AgentMessage, AgentRequest
+from app.contracts.followup_scan import (
+    FollowupScanRequest,
+    FollowupScanResponse,
+    FollowupScanResult,
+)
+from app.core.date_extraction import parse_email_date
+from app.core.model_provider import BaseModelProvider
+from app.skills.followup.graph import FOLLOWUP_THRESHOLDS, draft_followup_node
+
+logger = logging.getLogger("ai_agent_platform.followup.scan")
+
+# Naive or UTC ISO timestamps numpy can parse directly.
+_NUMPY_ISO = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?$")
+_PRIORITIES = list(FOLLOWUP_THRESHOLDS)
+_DEFAULT_PRIORITY = _PRIORITIES.index("normal")
+_THRESHOLD_DAYS = np.array([FOLLOWUP_THRESHOLDS[p] for p in _PRIORITIES], dtype=np.int64)
+# AgentRequest.requestId limit.
+_MAX_REQUEST_ID = 128
+
+
+def parse_sent_at(values: list[str]) -> np.ndarray:
+    """``datetime64[s]`` (UTC) per value; unparseable values become ``NaT``."""
+    sent = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[s]")
+    fast_rows: list[int] = []
+    fast_values: list[str] = []
+    for i, value in enumerate(values):
+        candidate = value.strip().removesuffix("Z").replace(" ", "T", 1)
+        if _NUMPY_ISO.match(candidate):
+            fast_rows.append(i)
+            fast_values.append(candidate)
+            continue
+        parsed = parse_email_date(value)
+        if parsed is not None:
+            sent[i] = np.datetime64(int(parsed.timestamp()), "s")
+    if fast_rows:
+        try:
+            sent[fast_rows] = np.array(fast_values, dtype="datetime64[s]")
+        except ValueError:
+            # An out-of-range field (e.g. month 13) fails the whole array; retry per row
+            for row, value in zip(fast_rows, fast_values):
+                try:
+                    sent[row] = np.datetime64(value, "s")
+                except ValueError:
+                    pass
+    return sent
+
+
+def stale_thread_scores(
+    sent_at: np.ndarray, priorities: list[str], now: datetime
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Days unanswered, threshold, urgency and needs-followup per thread."""
+    now64 = np.datetime64(int(now.timestamp()), "s")
+    valid = ~np.isnat(sent_at)
+    elapsed = np.where(valid, now64 - sent_at, np.timedelta64(0, "s"))
+    days = np.maximum(elapsed // np.timedelta64(1, "D"), 0).astype(np.int64)
+
+    lookup = {name: index for index, name in enumerate(_PRIORITIES)}
+    codes = np.fromiter(
+        (lookup.get(p.strip().lower(), _DEFAULT_PRIORITY) for p in priorities),
+        dtype=np.int64,
+        count=len(priorities),
+    )
+    thresholds = _THRESHOLD_DAYS[codes]
+    urgency = np.minimum(1.0, days / (thresholds * 2.0))
+    return days, thresholds, np.round(urgency, 2), valid & (days >= thresholds)
+
+
+def _draft(
+    request: FollowupScanRequest,
+    thread_index: int,
+    days: int,
+    model_provider: BaseModelProvider,
+) -> str:
+    thread = request.threads[thread_index]
+    request_id = f"{request.requestId}:{thread.threadId}"
+    if len(request_id) > _MAX_REQUEST_ID:
+        # Keep long thread ids within the contract's limit, stable per thread
+        digest = hashlib.blake2b(thread.threadId.encode(), digest_size=8).hexdigest()
+        request_id = f"{request.requestId[: _MAX_REQUEST_ID - 17]}:{digest}"
+    sub_request = AgentRequest(
+        skill="followup",
+        requestId=request_id,
+        messages=[AgentMessage(content="Draft a follow-up")],
+        context=AgentContext(
+            locale=request.locale,
+            metadata={
+                k: v
+                for k, v in {
+                    "threadId": thread.threadId,
+                    "emailSubject": thread.subject,
+                    "emailTo": thread.to,
+                    "priority": thread.priority,
+                }.items()
+                if v
+            }
+        ),
+    )
+    state = {"request": sub_request, "days_unanswered": days, "needs_followup": True}
+    # Routine nudges come from the template bank; the model is only called for bespoke drafts.
+    return str(draft_followup_node(state, model_provider)["draft_followup"])  # type: ignore[arg-type]
+
+
+def followup_scan(
+    request: FollowupScanRequest, model_provider: BaseModelProvider
+) -> FollowupScanResponse:
+    """Rank stale threads by urgency and draft follow-ups for the top N."""
+
+    now = parse_email_date(request.now or "") or datetime.now(tz=timezone.utc)
+    threads = request.threads
+    sent_at = parse_sent_at([t.sentAt for t in threads])
+    days, _, urgency, needs = stale_thread_scores(sent_at, [t.priority for t in threads], now)
+
+    stale = np.flatnonzero(needs)
+    # Most urgent first; ties broken by longest wait.
+    order = stale[np.lexsort((-days[stale], -urgency[stale]))][: request.topN]
+    top = [int(i) for i in order]
+
+    drafts: list[str | None] = [None] * len(top)
+    failed = 0
+    if request.draft and top:
+        workers = max(1, min(settings.followup_scan_draft_concurrency, len(top)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    copy_context().run, _draft, request, i, int(days[i]), model_provider
+                )
+                for i in top
+            ]
+            for position, future in enumerate(futures):
+                try:
+                    drafts[position] = future.result()
+                except Exception as exc:  # noqa: BLE001
+                    # One bad thread keeps its ranking but gets no draft.
+                    logger.warning(
+                        "followup_scan draft failed request=%s thread=%s: %s",
+                        request.requestId,
+                        threads[top[position]].threadId,
+                        exc,
+                    )
+                    failed += 1
+
+    stats = {
+        "scanned": len(threads),
+        "unparseableSentAt": int(np.isnat(sent_at).sum()),
+        "stale": int(stale.size),
+        "returned": len(top),
+        "drafted": sum(1 for d in drafts if d),
+        "draftFailed": failed,
+    }
+    logger.info("followup_scan request=%s stats=%s", request.requestId, stats)
+    return FollowupScanResponse(
+        results=[
+            FollowupScanResult(
+                threadId=threads[i].threadId,
+                daysUnanswered=int(days[i]),
+                urgencyScore=float(urgency[i]),
+                priority=threads[i].priority.strip().lower(),
+                draft=draft,
+            )
+            for i, draft in zip(top, drafts)
+        ],
+        stats=stats,
+    )
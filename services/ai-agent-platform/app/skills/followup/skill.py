@@ -2,15 +2,18 @@
 
 from app.contracts.agent_request import AgentRequest
 from app.contracts.agent_response import AgentResponse
+from app.contracts.followup_scan import FollowupScanRequest, FollowupScanResponse
 from app.core.model_provider import BaseModelProvider, RuleBasedModelProvider
 from app.skills.followup.graph import build_followup_skill_graph
+from app.skills.followup.scan import followup_scan
 
 
 class FollowupSkill:
     """Detects unanswered sent emails and autonomously drafts follow-up messages."""
 
     def __init__(self, model_provider: BaseModelProvider | None = None) -> None:
-        self._graph = build_followup_skill_graph(model_provider or RuleBasedModelProvider())
+        self._model_provider = model_provider or RuleBasedModelProvider()
+        self._graph = build_followup_skill_graph(self._model_provider)
 
     def run(self, request: AgentRequest) -> AgentResponse:
         """Execute followup graph and return follow-up assessment response."""
@@ -21,6 +24,7 @@ class FollowupSkill:
                 "needs_followup": False,
                 "urgency_score": 0.0,
                 "draft_followup": "",
+                "draft_source": "",
                 "suggested_send_at": "",
                 "assistant_text": "",
                 "suggested_actions": [],
@@ -40,6 +44,11 @@ class FollowupSkill:
             uiHints={
                 "surface": request.context.surface,
                 "locale": request.context.locale,
+                **({"draftSource": state["draft_source"]} if state["draft_source"] else {}),
             },
             safetyFlags=state["safety_flags"],
         )
+
+    def run_scan(self, request: FollowupScanRequest) -> FollowupScanResponse:
+        """Rank many sent threads by follow-up urgency; draft only the top N."""
+        return followup_scan(request, self._model_provider)
@@ -0,0 +1,245 @@
+"""Precompiled follow-up draft templates keyed by language, tone and wait bucket.
+
+Most follow-ups are interchangeable polite nudges, so the followup skill
+fills one of these with the subject and recipient name instead of calling
+the LLM. The model is still used when the request carries instructions of its
+own (a bespoke draft) or when the locale has no template set.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+
+# A user message that only asks for "a follow-up" carries no instructions of its
+# own: every word is a follow-up verb/noun or filler ("Can you send them a quick
+# follow-up on this thread, please?"). Any other word makes the ask bespoke.
+_WORD = re.compile(r"[a-z']+")
+_FOLLOWUP_WORDS = frozenset("follow followup nudge remind reminder ping chase bump".split())
+_FILLER_WORDS = frozenset(
+    (
+        # requests and verbs
+        "please pls kindly can could would will you i we need want like to let's lets just "
+        "draft write send create suggest compose prepare make give do put together "
+        # articles and pronouns
+        "a an the me us them him her my our their it this that one another "
+        # tone
+        "polite politely short quick quickly gentle gently brief friendly simple standard "
+        "usual little nice "
+        # what, where and when
+        "up email e mail message note reply on about re regarding for with in thread again "
+        "now today if they haven't havent replied responded yet"
+    ).split()
+)
+_NAME_ADDRESS = re.compile(r'^\s*"?([^"<@]+?)"?\s*<')
+_LOCAL_PART_NAME = re.compile(r"^([a-z]{2,})(?:[._-][a-z]+)*@", re.IGNORECASE)
+
+# Urgent and high priority threads get the firmer wording.
+_TONES = {"urgent": "firm", "high": "firm", "normal": "gentle", "low": "gentle"}
+
+_BANK: dict[str, dict[str, str]] = {
+    "en": {
+        "greeting": "Hi {name},",
+        "greeting_plain": "Hi,",
+        "signoff": "Best regards",
+        "gentle:recent": (
+            "Just a quick follow-up on my email about {subject}. "
+            "Whenever you get a chance, I'd appreciate your thoughts."
+        ),
+        "gentle:week": (
+            "I wanted to follow up on my email about {subject} from {days} days ago. "
+            "Please let me know if you need anything else from me."
+        ),
+        "gentle:long": (
+            "I'm circling back on {subject}, which I sent a while ago. "
+            "If this is no longer relevant, just let me know and I'll close it out."
+        ),
+        "firm:recent": (
+            "Following up on {subject}, as this is time-sensitive. "
+            "Could you reply when you have a moment today?"
+        ),
+        "firm:week": (
+            "I'm following up again on {subject} from {days} days ago, as it is blocking "
+            "next steps. Could you get back to me at your earliest convenience?"
+        ),
+        "firm:long": (
+            "I still need your response on {subject}, sent {days} days ago. "
+            "If someone else should handle this, could you point me to them?"
+        ),
+    },
+    "es": {
+        "greeting": "Hola {name},",
+        "greeting_plain": "Hola,",
+        "signoff": "Saludos cordiales",
+        "gentle:recent": (
+            "Solo quería dar seguimiento a mi correo sobre {subject}. "
+            "Cuando tengas un momento, agradecería tus comentarios."
+        ),
+        "gentle:week": (
+            "Te escribo para dar seguimiento a mi correo sobre {subject} de hace {days} días. "
+            "Avísame si necesitas algo más de mi parte."
+        ),
+        "gentle:long": (
+            "Retomo el tema de {subject}, que te envié hace un tiempo. "
+            "Si ya no es relevante, avísame y lo doy por cerrado."
+        ),
+        "firm:recent": (
+            "Doy seguimiento a {subject}, ya que es urgente. "
+            "¿Podrías responderme hoy cuando tengas un momento?"
+        ),
+        "firm:week": (
+            "Vuelvo a escribir sobre {subject} de hace {days} días, ya que bloquea los "
+            "siguientes pasos. ¿Podrías responderme lo antes posible?"
+        ),
+        "firm:long": (
+            "Sigo necesitando tu respuesta sobre {subject}, enviado hace {days} días. "
+            "Si otra persona debe encargarse, ¿podrías indicarme quién?"
+        ),
+    },
+    "fr": {
+        "greeting": "Bonjour {name},",
+        "greeting_plain": "Bonjour,",
+        "signoff": "Cordialement",
+        "gentle:recent": (
+            "Je me permets de revenir vers vous au sujet de {subject}. "
+            "N'hésitez pas à me faire part de votre retour quand vous le pourrez."
+        ),
+        "gentle:week": (
+            "Je reviens vers vous concernant mon e-mail sur {subject} d'il y a {days} jours. "
+            "Dites-moi si vous avez besoin d'autre chose de ma part."
+        ),
+        "gentle:long": (
+            "Je relance au sujet de {subject}, envoyé il y a quelque temps. "
+            "Si ce n'est plus d'actualité, dites-le-moi et je clôturerai le sujet."
+        ),
+        "firm:recent": (
+            "Je reviens vers vous au sujet de {subject}, car c'est urgent. "
+            "Pourriez-vous me répondre aujourd'hui si possible ?"
+        ),
+        "firm:week": (
+            "Je relance de nouveau au sujet de {subject}, envoyé il y a {days} jours, car cela "
+            "bloque la suite. Pourriez-vous me répondre dès que possible ?"
+        ),
+        "firm:long": (
+            "J'attends toujours votre réponse sur {subject}, envoyé il y a {days} jours. "
+            "Si quelqu'un d'autre doit s'en charger, pourriez-vous me l'indiquer ?"
+        ),
+    },
+    "de": {
+        "greeting": "Hallo {name},",
+        "greeting_plain": "Hallo,",
+        "signoff": "Viele Grüße",
+        "gentle:recent": (
+            "ich wollte kurz an meine E-Mail zu {subject} erinnern. "
+            "Ich freue mich über eine Rückmeldung, wenn du Zeit hast."
+        ),
+        "gentle:week": (
+            "ich melde mich noch einmal wegen meiner E-Mail zu {subject} von vor {days} Tagen. "
+            "Sag gern Bescheid, falls du noch etwas von mir brauchst."
+        ),
+        "gentle:long": (
+            "ich komme noch einmal auf {subject} zurück. "
+            "Falls das Thema erledigt ist, gib mir kurz Bescheid, dann schließe ich es ab."
+        ),
+        "firm:recent": (
+            "ich melde mich wegen {subject}, da es zeitkritisch ist. "
+            "Könntest du mir heute noch antworten?"
+        ),
+        "firm:week": (
+            "ich melde mich erneut wegen {subject} von vor {days} Tagen, da es die nächsten "
+            "Schritte blockiert. Könntest du mir so bald wie möglich antworten?"
+        ),
+        "firm:long": (
+            "ich benötige weiterhin deine Antwort zu {subject}, gesendet vor {days} Tagen. "
+            "Falls jemand anderes zuständig ist, nenne mir bitte die Person."
+        ),
+    },
+}
+
+# (language, tone, bucket) -> body; built once at import.
+_TEMPLATES: dict[tuple[str, str, str], str] = {
+    (language, *key.split(":")): text
+    for language, entries in _BANK.items()
+    for key, text in entries.items()
+    if ":" in key
+}
+
+
+def wait_bucket(days: int) -> str:
+    """``recent`` (up to 3 days), ``week`` (up to 10) or ``long``."""
+    if days <= 3:
+        return "recent"
+    return "week" if days <= 10 else "long"
+
+
+def recipient_name(address: str) -> str:
+    """First name from ``"Priya Shah <priya@x>"``, ``"Shah, Priya" <p@x>`` or ``priya.shah@x``."""
+    match = _NAME_ADDRESS.match(address or "")
+    if match:
+        display = match.group(1)
+        if "," in display:
+            # "Last, First" — the given name follows the comma.
+            display = display.split(",", 1)[1]
+        words = display.split()
+        return words[0].title() if words else ""
+    match = _LOCAL_PART_NAME.match((address or "").strip())
+    return match.group(1).title() if match else ""
+
+
+def bespoke_reason(locale: str, instructions: str) -> str | None:
+    """Why a request needs an LLM draft (``None`` when a template fits)."""
+    if locale.split("-")[0].lower() not in _BANK:
+        return "locale"
+    if instructions.strip() and not _is_generic_ask(instructions):
+        return "instructions"
+    return None
+
+
+def _is_generic_ask(text: str) -> bool:
+    """True when ``text`` only asks for a follow-up, with no content of its own."""
+    words = _WORD.findall(text.lower().replace("’", "'"))
+    if not any(word in _FOLLOWUP_WORDS for word in words):
+        return False
+    return all(word in _FOLLOWUP_WORDS or word in _FILLER_WORDS for word in words)
+
+
+def render_template(locale: str, priority: str, days: int, subject: str, recipient: str) -> str:
+    """Filled follow-up body for a supported locale."""
+    language = locale.split("-")[0].lower()
+    entries = _BANK[language]
+    tone = _TONES.get(priority.lower(), "gentle")
+    name = recipient_name(recipient)
+    greeting = entries["greeting"].format(name=name) if name else entries["greeting_plain"]
+    body = _TEMPLATES[(language, tone, wait_bucket(days))].format(subject=subject, days=days)
+    return f"{greeting}\n\n{body}\n\n{entries['signoff']}"
+
+
+class FollowupTemplateStats:
+    """Thread-safe counts of template vs LLM follow-up drafts."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._template = 0
+        self._llm: dict[str, int] = {}
+
+    def record(self, reason: str | None) -> None:
+        """``reason`` is ``None`` for a template draft, else why the LLM was used."""
+        with self._lock:
+            if reason is None:
+                self._template += 1
+            else:
+                self._llm[reason] = self._llm.get(reason, 0) + 1
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            llm = sum(self._llm.values())
+            total = self._template + llm
+            return {
+                "templateDrafts": self._template,
+                "llmDrafts": llm,
+                "llmReasons": dict(self._llm),
+                "hitRate": round(self._template / total, 4) if total else 0.0,
+            }
+
+
+followup_template_stats = FollowupTemplateStats()
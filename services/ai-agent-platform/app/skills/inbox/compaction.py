@@ -0,0 +1,128 @@
+"""Rolling compaction of long inbox conversations.
+
+Older turns are replaced by a running summary; the most recent turns stay
+verbatim. The summarized prefix only grows in whole blocks of
+``inbox_compaction_block_messages``, so its cache key (a chained digest of
+the prefix's blocks) changes once per block rather than every turn. A
+refresh folds just the newly covered messages into the previous block
+boundary's summary, keeping both the summarization call and the inbox
+prompt bounded however long the conversation gets.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+
+from app.config.settings import settings
+from app.core.model_provider import BaseModelProvider, RuleBasedModelProvider
+from app.core.prompt_budget import PromptSection, fit_prompt, generate_budgeted
+from app.core.ttl_cache import TTLCache
+from app.skills.summarize.extractive import shrink_text
+
+logger = logging.getLogger("ai_agent_platform.inbox.compaction")
+
+# Running summaries keyed by the chained digest of the summarized prefix.
+conversation_summary_cache: TTLCache[str, str] = TTLCache(
+    max_entries=settings.conversation_summary_max_entries,
+    ttl_sec=settings.conversation_summary_ttl_sec,
+)
+
+
+def _prefix_digests(lines: list[str], blocks: int, block_size: int) -> list[str]:
+    """Digest of ``lines[: k * block_size]`` for k = 1..blocks, each chained on the last."""
+    digests: list[str] = []
+    previous = b""
+    for k in range(blocks):
+        digest = hashlib.blake2b(previous, digest_size=16)
+        for line in lines[k * block_size : (k + 1) * block_size]:
+            digest.update(line.encode())
+            digest.update(b"\x00")
+        previous = digest.digest()
+        digests.append(digest.hexdigest())
+    return digests
+
+
+def _fold_summary(
+    previous: str, new_lines: list[str], model_provider: BaseModelProvider
+) -> str:
+    """Previous running summary updated with ``new_lines``."""
+    budget = settings.inbox_compaction_summary_tokens
+    new_text = "\n".join(new_lines)
+    if not isinstance(model_provider, RuleBasedModelProvider):
+        budgeted = fit_prompt(
+            "inbox",
+            "You maintain a running summary of an email assistant conversation. "
+            "Keep facts, decisions, requests and open questions; drop pleasantries.",
+            [
+                PromptSection(
+                    name="summary",
+                    text=previous or "(none yet)",
+                    priority=5,
+                    prefix="Summary so far:\n",
+                    suffix="\n\n",
+                ),
+                PromptSection(
+                    name="history",
+                    text=new_text,
+                    priority=1,
+                    min_tokens=64,
+                    prefix="New messages:\n",
+                    suffix="\n\n",
+                ),
+                PromptSection(
+                    name="instructions",
+                    text=f"Return the updated summary only, under {budget} tokens.",
+                    priority=9,
+                ),
+            ],
+        )
+        try:
+            return generate_budgeted(model_provider, budgeted, max_tokens=budget).strip()
+        except RuntimeError as exc:
+            logger.warning("conversation compaction fell back to extractive: %s", exc)
+    return shrink_text(f"{previous}\n{new_text}".strip(), budget)
+
+
+def compact_conversation(
+    lines: list[str],
+    model_provider: BaseModelProvider,
+    start: int = 0,
+    history_key: str | None = None,
+) -> str:
+    """``ROLE: content`` lines with every complete older block summarized.
+
+    ``start`` is the position of ``lines[0]`` in the whole conversation (a
+    session drops its oldest lines). Session history is append-only, so with a
+    ``history_key`` prefixes are keyed by ``(history_key, blocks)`` instead of a
+    content digest, which also survives the session dropping old lines.
+    """
+
+    recent = settings.inbox_compaction_recent_messages
+    block_size = max(1, settings.inbox_compaction_block_messages)
+    total = start + len(lines)
+    blocks = max(0, total - recent) // block_size
+    if blocks == 0:
+        return "\n".join(lines)
+
+    if history_key is not None:
+        keys = [f"session:{history_key}:{k}" for k in range(1, blocks + 1)]
+    else:
+        keys = _prefix_digests(lines, blocks, block_size)
+    summary = conversation_summary_cache.get(keys[-1])
+    if summary is None:
+        # Start from the longest prefix already summarized (e.g. the previous block).
+        covered, previous = 0, ""
+        for k in range(blocks - 1, 0, -1):
+            cached = conversation_summary_cache.get(keys[k - 1])
+            if cached is not None:
+                covered, previous = k, cached
+                break
+        first = max(covered * block_size, start) - start
+        summary = _fold_summary(
+            previous, lines[first : blocks * block_size - start], model_provider
+        )
+        conversation_summary_cache.set(keys[-1], summary)
+
+    verbatim = "\n".join(lines[max(0, blocks * block_size - start) :])
+    return f"[Summary of {blocks * block_size} earlier messages] {summary}\n{verbatim}"
@@ -6,9 +6,13 @@ from typing import TypedDict
 
 from langgraph.graph import END, START, StateGraph
 
+from app.config.settings import settings
 from app.contracts.agent_request import AgentRequest
 from app.contracts.agent_response import SafetyFlag, SuggestedAction
 from app.core.model_provider import BaseModelProvider
+from app.core.prompt_budget import PromptSection, fit_prompt, generate_budgeted
+from app.core.session_store import current_session
+from app.skills.inbox.compaction import compact_conversation
 
 
 class InboxGraphState(TypedDict):
@@ -48,11 +52,18 @@ def classify_intent_node(state: InboxGraphState) -> dict[str, object]:
     return {"intent": "inbox_general_help", "confidence": 0.73}
 
 
-def _build_conversation_context(request: AgentRequest) -> str:
-    """Serialize message history into a readable context string."""
-    return "\n".join(
-        f"{msg.role.upper()}: {msg.content}" for msg in request.messages
-    )
+def _build_conversation_context(
+    request: AgentRequest, model_provider: BaseModelProvider
+) -> str:
+    """Serialize message history, with older turns compacted into a running summary."""
+    session = current_session.get()
+    if session is not None and session.session_id == request.sessionId:
+        # Session turns reuse the history serialized as messages arrived.
+        start, lines = session.lines()
+        return compact_conversation(lines, model_provider, start, session.history_key)
+    limit = settings.max_message_chars
+    lines = [f"{msg.role.upper()}: {msg.content[:limit]}" for msg in request.messages]
+    return compact_conversation(lines, model_provider)
 
 
 def draft_response_node(
@@ -65,7 +76,7 @@ def draft_response_node(
     metadata = request.context.metadata
     subject = metadata.get("subject", "this email thread")
     thread_id = metadata.get("threadId", "")
-    conversation = _build_conversation_context(request)
+    conversation = _build_conversation_context(request, model_provider)
 
     intent_instructions = {
         "summarize_thread": (
@@ -95,14 +106,35 @@ def draft_response_node(
         "Be concise, warm, and action-oriented. "
         "Respond in 1-2 sentences. Do not repeat the user's question."
     )
-    prompt = (
-        f"Email subject: {subject}\n"
-        f"Thread ID: {thread_id}\n\n"
-        f"Conversation history:\n{conversation}\n\n"
-        f"Your task: {task_instruction}"
+    budgeted = fit_prompt(
+        "inbox",
+        system,
+        [
+            PromptSection(
+                name="email",
+                text=f"Email subject: {subject}\nThread ID: {thread_id}",
+                priority=5,
+                suffix="\n\n",
+            ),
+            PromptSection(
+                name="history",
+                text=conversation,
+                priority=1,
+                min_tokens=64,
+                keep="tail",
+                prefix="Conversation history:\n",
+                suffix="\n\n",
+            ),
+            PromptSection(
+                name="instructions",
+                text=task_instruction,
+                priority=9,
+                prefix="Your task: ",
+            ),
+        ],
     )
 
-    assistant_text = model_provider.generate(prompt, system=system, max_tokens=200)
+    assistant_text = generate_budgeted(model_provider, budgeted, max_tokens=200)
     return {"assistant_text": assistant_text}
 
 
@@ -0,0 +1,129 @@
+"""Local extractive summarization with vectorized TF-IDF sentence scoring.
+
+Sentences are scored by cosine similarity of their TF-IDF vector to the
+thread centroid (sentences that carry the thread's dominant vocabulary rank
+highest), with a small boost for early sentences. Used for a usable summary
+when no LLM is available and to shrink long message bodies before they are
+put into an LLM prompt.
+"""
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+
+from app.core.prompt_budget import estimate_tokens
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[a-z][a-z'-]+")
+_ACTION_CUES = re.compile(
+    r"\b(please|can you|could you|need to|needs to|must|action|todo|to-do|deadline|"
+    r"by (?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|tomorrow|eod|end of))\b",
+    re.IGNORECASE,
+)
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can could did do does for from had has have he her "
+    "here him his how i if in into is it its just me my no not of on or our out she so "
+    "that the their them then there these they this to up us was we were what when which "
+    "who will with would you your hi hello thanks thank regards best dear".split()
+)
+# Sentences shorter than this are greetings, sign-offs or fragments.
+_MIN_SENTENCE_WORDS = 4
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into trimmed sentences (line breaks also end a sentence)."""
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text) if s and s.strip()]
+
+
+def _tfidf(sentences: list[str]) -> tuple[np.ndarray, list[str]]:
+    vocabulary: dict[str, int] = {}
+    rows: list[int] = []
+    cols: list[int] = []
+    for row, sentence in enumerate(sentences):
+        for word in _WORD.findall(sentence.lower()):
+            if word not in _STOPWORDS:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(word, len(vocabulary)))
+    counts = np.zeros((len(sentences), len(vocabulary)), dtype=np.float32)
+    np.add.at(counts, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1.0 + len(sentences)) / (1.0 + document_frequency)) + 1.0
+    tfidf = np.log1p(counts) * idf.astype(np.float32)
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    np.divide(tfidf, norms, out=tfidf, where=norms > 0)
+    return tfidf, list(vocabulary)
+
+
+def sentence_scores(sentences: list[str]) -> np.ndarray:
+    """Relevance score per sentence (higher is more central to the text)."""
+    if not sentences:
+        return np.empty(0, dtype=np.float32)
+    tfidf, _ = _tfidf(sentences)
+    if tfidf.shape[1] == 0:
+        return np.zeros(len(sentences), dtype=np.float32)
+    centroid = tfidf.mean(axis=0)
+    norm = float(np.linalg.norm(centroid))
+    scores = tfidf @ (centroid / norm) if norm else np.zeros(len(sentences), dtype=np.float32)
+    positions = np.arange(len(sentences), dtype=np.float32)
+    scores = scores * (1.0 + 0.15 / (1.0 + positions))
+    word_counts = np.array([len(s.split()) for s in sentences])
+    return np.where(word_counts >= _MIN_SENTENCE_WORDS, scores, scores * 0.1)
+
+
+def top_sentences(
+    text: str, max_sentences: int | None = None, token_budget: int | None = None
+) -> list[str]:
+    """Highest-scoring sentences of ``text`` in their original order.
+
+    Selection stops at ``max_sentences`` and/or once ``token_budget``
+    (estimated tokens) would be exceeded; the best sentence is always kept.
+    """
+
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+    ranked = np.argsort(-sentence_scores(sentences), kind="stable")
+    chosen: list[int] = []
+    used = 0
+    for index in ranked:
+        if max_sentences is not None and len(chosen) >= max_sentences:
+            break
+        cost = estimate_tokens(sentences[index])
+        if token_budget is not None and chosen and used + cost > token_budget:
+            continue
+        chosen.append(int(index))
+        used += cost
+    return [sentences[i] for i in sorted(chosen)]
+
+
+def shrink_text(text: str, token_budget: int) -> str:
+    """``text`` unchanged if within ``token_budget``, else its top-ranked sentences."""
+    if token_budget <= 0 or estimate_tokens(text) <= token_budget:
+        return text
+    return " ".join(top_sentences(text, token_budget=token_budget))
+
+
+def top_terms(text: str, limit: int = 3) -> list[str]:
+    """Most characteristic non-stopword terms of ``text`` (summed TF-IDF weight)."""
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+    tfidf, vocabulary = _tfidf(sentences)
+    if not vocabulary:
+        return []
+    weights = tfidf.sum(axis=0)
+    return [vocabulary[i] for i in np.argsort(-weights, kind="stable")[:limit]]
+
+
+def extractive_summary(text: str, max_sentences: int = 3) -> dict[str, object]:
+    """Summary JSON in the summarize schema, produced without any model call."""
+    summary = " ".join(top_sentences(text, max_sentences=max_sentences))
+    actions = [s for s in split_sentences(text) if _ACTION_CUES.search(s)]
+    return {
+        "summary": summary,
+        "action_items": actions[:5],
+        "topics": top_terms(text),
+    }
@@ -5,13 +5,26 @@ from __future__ import annotations
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from typing import TypedDict
 
 from langgraph.graph import END, START, StateGraph
 
+from app.config.settings import settings
 from app.contracts.agent_request import AgentRequest
 from app.contracts.agent_response import SafetyFlag, SuggestedAction
-from app.core.model_provider import BaseModelProvider
+from app.core.date_extraction import ExtractedDate, extract_deadlines, parse_email_date
+from app.core.fallback import note_fallback
+from app.core.model_provider import BaseModelProvider, RuleBasedModelProvider
+from app.core.prompt_budget import PromptSection, estimate_tokens, fit_prompt, generate_budgeted
+from app.skills.summarize.extractive import extractive_summary, shrink_text
+from app.skills.summarize.summary_store import (
+    ThreadSummaryState,
+    chunk_summary_cache,
+    prefix_digest,
+    thread_summary_store,
+)
 
 logger = logging.getLogger("ai_agent_platform.summarize")
 
@@ -21,6 +34,10 @@ class SummarizeGraphState(TypedDict):
 
     request: AgentRequest
     thread_context: str
+    thread_messages: list[dict[str, object]]
+    prior_state: ThreadSummaryState | None
+    summary_mode: str
+    extracted_deadlines: list[ExtractedDate]
     summary: str
     action_items: list[str]
     key_people: list[str]
@@ -33,35 +50,48 @@ class SummarizeGraphState(TypedDict):
     confidence: float
 
 
+def _thread_subject(request: AgentRequest) -> str:
+    md = request.context.metadata
+    return md.get("emailSubject") or md.get("subject", "(no subject)")
+
+
+def _parse_thread_messages(request: AgentRequest) -> list[dict[str, object]]:
+    """Thread messages from the ``threadMessages`` JSON metadata, if well-formed."""
+    raw = request.context.metadata.get("threadMessages", "")
+    if not raw:
+        return []
+    try:
+        msgs = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    if not isinstance(msgs, list):
+        return []
+    return [m for m in msgs if isinstance(m, dict)]
+
+
+def _format_messages(subject: str, messages: list[dict[str, object]]) -> str:
+    lines = [f"Subject: {subject}", "---"]
+    for m in messages:
+        sender = m.get("from", "Unknown")
+        date = m.get("date", "")
+        body = str(m.get("body", m.get("snippet", "")))[: settings.summary_message_max_chars]
+        body = shrink_text(body, settings.summary_extractive_message_tokens)
+        lines.append(f"From: {sender}  Date: {date}\n{body}")
+        lines.append("---")
+    return "\n".join(lines)
+
+
 def _build_thread_context(request: AgentRequest) -> str:
-    """Construct readable thread context from metadata and messages."""
+    """Construct readable context for a single email (no ``threadMessages``)."""
     md = request.context.metadata
-    subject = md.get("emailSubject") or md.get("subject", "(no subject)")
-    thread_messages_raw = md.get("threadMessages", "")
-
-    # Parse thread messages if provided as JSON
-    if thread_messages_raw:
-        try:
-            msgs = json.loads(thread_messages_raw)
-            lines = [f"Subject: {subject}", "---"]
-            for m in msgs[:10]:  # Cap at 10 messages
-                sender = m.get("from", "Unknown")
-                date = m.get("date", "")
-                body = m.get("body", m.get("snippet", ""))[:500]
-                lines.append(f"From: {sender}  Date: {date}\n{body}")
-                lines.append("---")
-            return "\n".join(lines)
-        except (json.JSONDecodeError, TypeError):
-            pass
-
-    # Fall back to conversation messages
     email_body = md.get("emailBody") or md.get("body", "")
     email_from = md.get("emailFrom") or md.get("from", "")
-    lines = [f"Subject: {subject}"]
+    lines = [f"Subject: {_thread_subject(request)}"]
     if email_from:
         lines.append(f"From: {email_from}")
     if email_body:
-        lines.append(f"\n{email_body[:2000]}")
+        body = shrink_text(email_body[:2000], settings.summary_extractive_message_tokens)
+        lines.append(f"\n{body}")
     return "\n".join(lines)
 
 
@@ -75,57 +105,328 @@ def _parse_summary_json(raw: str) -> dict[str, object]:
 
 
 def prepare_thread_node(state: SummarizeGraphState) -> dict[str, object]:
-    """Build structured thread context for the LLM."""
-    thread_context = _build_thread_context(state["request"])
-    return {"thread_context": thread_context}
+    """Parse thread messages and load the thread's running summary, if any."""
+    request = state["request"]
+    messages = _parse_thread_messages(request)
+    if not messages:
+        return {"thread_context": _build_thread_context(request), "thread_messages": []}
+    thread_id = request.context.metadata.get("threadId", "")
+    prior = thread_summary_store.get(thread_id) if thread_id else None
+    # Edited or reordered history invalidates the cursor: start over.
+    if prior is not None and not prior.covers_prefix_of(messages):
+        prior = None
+    return {"thread_messages": messages, "prior_state": prior}
 
 
-def generate_summary_node(
-    state: SummarizeGraphState, model_provider: BaseModelProvider
+def extract_deadlines_node(state: SummarizeGraphState) -> dict[str, object]:
+    """Find deadlines with the rule-based extractor, resolved against each message date."""
+    request = state["request"]
+    md = request.context.metadata
+    locale = request.context.locale
+    email_date = parse_email_date(md.get("emailDate") or md.get("date", ""))
+    if state["thread_messages"]:
+        sources = [
+            (
+                str(m.get("body", m.get("snippet", ""))),
+                parse_email_date(str(m.get("date", ""))) or email_date,
+            )
+            for m in state["thread_messages"]
+        ]
+    else:
+        sources = [(md.get("emailBody") or md.get("body", ""), email_date)]
+    sources.insert(0, (_thread_subject(request), email_date))
+
+    found: dict[str, ExtractedDate] = {}
+    for text, reference in sources:
+        for deadline in extract_deadlines(text, reference, locale):
+            found.setdefault(deadline.date.isoformat(), deadline)
+    return {"extracted_deadlines": sorted(found.values(), key=lambda d: d.date)}
+
+
+def _merge_deadlines(extracted: list[ExtractedDate], llm_deadlines: list[str]) -> list[str]:
+    """Rule-extracted deadlines first (with resolved dates), then any others the LLM found."""
+    merged = [d.label() for d in extracted]
+    texts = {d.text.lower() for d in extracted}
+    merged += [d for d in llm_deadlines if d.lower() not in texts and d not in merged]
+    return merged[:5]
+
+
+_SYSTEM = (
+    "You are MailZen, an intelligent email summarization assistant. "
+    "Extract key information concisely. Return ONLY valid JSON."
+)
+_FULL_INSTRUCTIONS = (
+    f"Return a JSON object with these keys:\n"
+    f'- "summary": 2-3 sentence summary of the thread\n'
+    f'- "action_items": list of specific tasks/actions required (empty list if none)\n'
+    f'- "key_people": list of email addresses or names involved\n'
+    f'- "deadlines": list of mentioned dates or deadlines (empty list if none)\n'
+    f'- "topics": list of 1-3 word topic tags\n\n'
+    f"Return ONLY the JSON object."
+)
+_DELTA_INSTRUCTIONS = (
+    f"Return a JSON object with these keys:\n"
+    f'- "summary": updated 2-3 sentence summary of the whole thread so far\n'
+    f'- "action_items": only NEW tasks/actions from the new messages (empty list if none)\n'
+    f'- "key_people": only people newly involved in the new messages\n'
+    f'- "deadlines": only dates or deadlines mentioned in the new messages\n'
+    f'- "topics": only new 1-3 word topic tags\n\n'
+    f"Return ONLY the JSON object."
+)
+
+# Response confidence by summary mode; a stale summary predates the newest messages.
+_MODE_CONFIDENCE = {"extractive": 0.6, "stale": 0.45}
+
+
+def _request_summary(
+    model_provider: BaseModelProvider, text: str, prior: ThreadSummaryState | None
+) -> dict[str, object]:
+    """One summarize call: the full text, or new messages merged into ``prior``."""
+    if prior is None:
+        sections = [
+            PromptSection(
+                name="email",
+                text=text,
+                priority=1,
+                min_tokens=128,
+                prefix="Summarize this email thread:\n\n",
+                suffix="\n\n",
+            ),
+            PromptSection(name="instructions", text=_FULL_INSTRUCTIONS, priority=9),
+        ]
+    else:
+        sections = [
+            PromptSection(
+                name="prior_summary",
+                text=prior.summary,
+                priority=2,
+                min_tokens=48,
+                prefix="Summary of the thread so far:\n",
+                suffix="\n\n",
+            ),
+            PromptSection(
+                name="email",
+                text=text,
+                priority=1,
+                min_tokens=128,
+                prefix="New messages since that summary:\n\n",
+                suffix="\n\n",
+            ),
+            PromptSection(name="instructions", text=_DELTA_INSTRUCTIONS, priority=9),
+        ]
+    budgeted = fit_prompt("summarize", _SYSTEM, sections)
+    try:
+        raw = generate_budgeted(model_provider, budgeted, max_tokens=400)
+    except RuntimeError:
+        return {}
+    return _parse_summary_json(raw)
+
+
+def _chunk_messages(messages: list[dict[str, object]]) -> list[list[dict[str, object]]]:
+    """Greedy consecutive chunks of at most ``settings.summary_chunk_tokens`` each."""
+    budget = max(1, settings.summary_chunk_tokens)
+    chunks: list[list[dict[str, object]]] = []
+    current: list[dict[str, object]] = []
+    used = 0
+    for message in messages:
+        cost = estimate_tokens(_format_messages("", [message]))
+        if current and used + cost > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(message)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _map_chunk(
+    model_provider: BaseModelProvider, subject: str, chunk: list[dict[str, object]]
 ) -> dict[str, object]:
-    """Use LLM to generate a comprehensive thread summary."""
-    thread_context = state["thread_context"]
+    """Summarize one chunk, reusing a cached result for the same messages."""
+    key = f"{subject}\x00{prefix_digest(chunk)}"
+    cached = chunk_summary_cache.get(key)
+    if cached is not None:
+        return cached
+    parsed = _request_summary(model_provider, _format_messages(subject, chunk), None)
+    if parsed:
+        chunk_summary_cache.set(key, parsed)
+    return parsed
+
+
+def _format_partials(partials: list[dict[str, object]]) -> str:
+    lines: list[str] = []
+    for index, partial in enumerate(partials, start=1):
+        lines.append(f"Part {index}: {partial.get('summary', '')}")
+        for name, label in (
+            ("action_items", "Action items"),
+            ("deadlines", "Deadlines"),
+            ("key_people", "People"),
+            ("topics", "Topics"),
+        ):
+            values = [str(v) for v in partial.get(name, []) or [] if v]  # type: ignore[union-attr]
+            if values:
+                lines.append(f"{label}: {'; '.join(values)}")
+        lines.append("")
+    return "\n".join(lines)
 
-    system = (
-        "You are MailZen, an intelligent email summarization assistant. "
-        "Extract key information concisely. Return ONLY valid JSON."
-    )
-    prompt = (
-        f"Summarize this email thread:\n\n{thread_context}\n\n"
-        f"Return a JSON object with these keys:\n"
-        f'- "summary": 2-3 sentence summary of the thread\n'
-        f'- "action_items": list of specific tasks/actions required (empty list if none)\n'
-        f'- "key_people": list of email addresses or names involved\n'
-        f'- "deadlines": list of mentioned dates or deadlines (empty list if none)\n'
-        f'- "topics": list of 1-3 word topic tags\n\n'
-        f"Return ONLY the JSON object."
-    )
 
+def _map_reduce_summary(
+    model_provider: BaseModelProvider,
+    subject: str,
+    chunks: list[list[dict[str, object]]],
+    prior: ThreadSummaryState | None,
+) -> dict[str, object]:
+    """Summarize chunks in parallel, then reduce the partials into one result."""
+    workers = max(1, min(settings.summary_map_concurrency, len(chunks)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Each task runs in a copy of this context so model calls reach the trace.
+        futures = [
+            pool.submit(copy_context().run, _map_chunk, model_provider, subject, chunk)
+            for chunk in chunks
+        ]
+        partials = [future.result() for future in futures]
+    if not all(partials):
+        return {}
+
+    sections = [
+        PromptSection(
+            name="partials",
+            text=_format_partials(partials),
+            priority=1,
+            min_tokens=256,
+            prefix="Summaries of consecutive parts of an email thread, in order:\n\n",
+            suffix="\n\n",
+        ),
+        PromptSection(
+            name="instructions",
+            text=_FULL_INSTRUCTIONS if prior is None else _DELTA_INSTRUCTIONS,
+            priority=9,
+        ),
+    ]
+    if prior is not None:
+        sections.insert(
+            0,
+            PromptSection(
+                name="prior_summary",
+                text=prior.summary,
+                priority=2,
+                min_tokens=48,
+                prefix="Summary of the earlier thread:\n",
+                suffix="\n\n",
+            ),
+        )
+    budgeted = fit_prompt("summarize", _SYSTEM, sections)
     try:
-        raw = model_provider.generate(prompt, system=system, max_tokens=400)
-        parsed = _parse_summary_json(raw)
+        raw = generate_budgeted(model_provider, budgeted, max_tokens=400)
     except RuntimeError:
-        parsed = {}
+        return {}
+    return _parse_summary_json(raw)
+
+
+def _extractive_state(state: SummarizeGraphState) -> ThreadSummaryState | None:
+    """Summary built from top-ranked sentences, with no model call."""
+    messages = state["thread_messages"]
+    if messages:
+        text = "\n".join(str(m.get("body", m.get("snippet", ""))) for m in messages)
+        people = list(dict.fromkeys(str(m["from"]) for m in messages if m.get("from")))
+    else:
+        md = state["request"].context.metadata
+        text = md.get("emailBody") or md.get("body", "")
+        sender = md.get("emailFrom") or md.get("from", "")
+        people = [sender] if sender else []
+    extracted = extractive_summary(text)
+    if not extracted["summary"]:
+        return None
+    return ThreadSummaryState(summary="").merged({**extracted, "key_people": people}, [])
 
-    summary = str(parsed.get("summary", "Unable to generate summary at this time."))
-    action_items = [str(x) for x in parsed.get("action_items", []) if x]
-    key_people = [str(x) for x in parsed.get("key_people", []) if x]
-    deadlines = [str(x) for x in parsed.get("deadlines", []) if x]
-    topics = [str(x) for x in parsed.get("topics", []) if x]
 
-    assistant_text = summary
-    if action_items:
-        assistant_text += f" Action items: {', '.join(action_items[:3])}."
+def generate_summary_node(
+    state: SummarizeGraphState, model_provider: BaseModelProvider
+) -> dict[str, object]:
+    """Summarize the thread, folding only messages newer than the stored cursor.
+
+    New messages that fit one chunk are summarized in a single call against
+    the running summary, so an active thread costs one small call per reply.
+    Longer spans (first contact with a long thread) go through map-reduce:
+    token-budgeted chunks are summarized in parallel and reduced, so no
+    message is dropped and no single prompt grows with the thread.
+
+    Without an LLM (rule-based provider, provider errors, unparseable output)
+    the summary is extracted locally from the top-ranked sentences. If an
+    incremental update fails, the prior summary is returned as ``stale``
+    with lower confidence.
+    """
+
+    request = state["request"]
+    messages = state["thread_messages"]
+    llm_available = not isinstance(model_provider, RuleBasedModelProvider)
+    if not messages:
+        parsed = (
+            _request_summary(model_provider, state["thread_context"], None) if llm_available else {}
+        )
+        current = ThreadSummaryState(summary="").merged(parsed, []) if parsed else None
+        mode = "single"
+    else:
+        prior = state["prior_state"]
+        current = prior
+        pending = messages[prior.cursor :] if prior is not None else messages
+        subject = _thread_subject(request)
+        chunks = _chunk_messages(pending) if llm_available else []
+        if len(chunks) == 1:
+            parsed = _request_summary(model_provider, _format_messages(subject, pending), prior)
+        elif chunks:
+            parsed = _map_reduce_summary(model_provider, subject, chunks, prior)
+        else:
+            parsed = {}
+        if parsed:
+            current = (prior or ThreadSummaryState(summary="")).merged(parsed, messages)
+
+        thread_id = request.context.metadata.get("threadId", "")
+        if current is not None and current is not prior and thread_id:
+            thread_summary_store.set(thread_id, current)
+        if prior is None:
+            mode = "full"
+        elif not pending:
+            mode = "unchanged"
+        else:
+            # Without a parsed update the prior summary misses the new messages.
+            mode = "incremental" if parsed else "stale"
+
+    if current is None or not current.summary:
+        current = _extractive_state(state)
+        if current is not None:
+            mode = "extractive"
+
+    if llm_available and (current is None or mode in ("extractive", "stale")):
+        note_fallback("summarize_llm")
+
+    llm_deadlines = list(current.deadlines) if current is not None else []
+    deadlines = _merge_deadlines(state["extracted_deadlines"], llm_deadlines)
+    if current is None:
+        return {
+            "summary": "Unable to generate summary at this time.",
+            "deadlines": deadlines,
+            "assistant_text": "Unable to generate summary at this time.",
+            "summary_mode": mode,
+            "intent": "summarize_thread",
+            "confidence": 0.5,
+        }
+
+    assistant_text = current.summary
+    if current.action_items:
+        assistant_text += f" Action items: {', '.join(current.action_items[:3])}."
 
     return {
-        "summary": summary,
-        "action_items": action_items[:10],
-        "key_people": key_people[:8],
-        "deadlines": deadlines[:5],
-        "topics": topics[:5],
+        "summary": current.summary,
+        "action_items": list(current.action_items),
+        "key_people": list(current.key_people),
+        "deadlines": deadlines,
+        "topics": list(current.topics),
         "assistant_text": assistant_text,
+        "summary_mode": mode,
         "intent": "summarize_thread",
-        "confidence": 0.92 if parsed else 0.5,
+        "confidence": _MODE_CONFIDENCE.get(mode, 0.92),
     }
 
 
@@ -164,11 +465,15 @@ def suggest_summary_actions_node(state: SummarizeGraphState) -> dict[str, object
         )
 
     if deadlines:
+        payload = {"threadId": thread_id, "deadline": deadlines[0]}
+        # Rule-extracted deadlines come first and carry a resolved calendar date.
+        if state["extracted_deadlines"]:
+            payload["dueDate"] = state["extracted_deadlines"][0].date.isoformat()
         actions.append(
             SuggestedAction(
                 name="summarize.set_reminder",
                 label=f"Set reminder for: {deadlines[0]}",
-                payload={"threadId": thread_id, "deadline": deadlines[0]},
+                payload=payload,
             )
         )
 
@@ -179,6 +484,7 @@ def build_summarize_skill_graph(model_provider: BaseModelProvider):
     """Build and compile the summarize skill LangGraph workflow."""
     graph = StateGraph(SummarizeGraphState)
     graph.add_node("prepare_thread", prepare_thread_node)
+    graph.add_node("extract_deadlines", extract_deadlines_node)
     graph.add_node(
         "generate_summary",
         lambda state: generate_summary_node(state, model_provider),
@@ -186,7 +492,8 @@ def build_summarize_skill_graph(model_provider: BaseModelProvider):
     graph.add_node("suggest_summary_actions", suggest_summary_actions_node)
 
     graph.add_edge(START, "prepare_thread")
-    graph.add_edge("prepare_thread", "generate_summary")
+    graph.add_edge("prepare_thread", "extract_deadlines")
+    graph.add_edge("extract_deadlines", "generate_summary")
     graph.add_edge("generate_summary", "suggest_summary_actions")
     graph.add_edge("suggest_summary_actions", END)
     return graph.compile()
@@ -18,6 +18,10 @@ class SummarizeSkill:
             {
                 "request": request,
                 "thread_context": "",
+                "thread_messages": [],
+                "prior_state": None,
+                "summary_mode": "single",
+                "extracted_deadlines": [],
                 "summary": "",
                 "action_items": [],
                 "key_people": [],
@@ -41,6 +45,7 @@ class SummarizeSkill:
             uiHints={
                 "surface": request.context.surface,
                 "locale": request.context.locale,
+                "summaryMode": state["summary_mode"],
             },
             safetyFlags=state["safety_flags"],
         )
@@ -0,0 +1,95 @@
+"""Per-thread summary state for incremental summarization.
+
+Each thread keeps its running summary, extracted lists and a cursor: how many
+messages have been folded in and a digest of their identities. A new request
+for the same thread only summarizes messages after the cursor and merges the
+result, provided the thread's prefix is unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field, replace
+
+from app.config.settings import settings
+from app.core.ttl_cache import TTLCache
+
+# Caps on the merged lists, matching what the summarize response exposes.
+_LIST_CAPS = {"action_items": 10, "key_people": 8, "deadlines": 5, "topics": 5}
+
+
+def message_key(message: dict[str, object]) -> str:
+    """Stable identity of a thread message: its id, else a hash of sender/date/body."""
+    message_id = message.get("id") or message.get("messageId")
+    if message_id:
+        return str(message_id)
+    digest = hashlib.blake2b(digest_size=12)
+    for part in ("from", "date", "body", "snippet"):
+        digest.update(str(message.get(part, ""))[:500].encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def prefix_digest(messages: list[dict[str, object]]) -> str:
+    """Digest of the identities of ``messages`` in order."""
+    digest = hashlib.blake2b(digest_size=16)
+    for message in messages:
+        digest.update(message_key(message).encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class ThreadSummaryState:
+    """Running summary of the first ``cursor`` messages of a thread."""
+
+    summary: str
+    action_items: list[str] = field(default_factory=list)
+    key_people: list[str] = field(default_factory=list)
+    deadlines: list[str] = field(default_factory=list)
+    topics: list[str] = field(default_factory=list)
+    cursor: int = 0
+    covered_digest: str = ""
+
+    def covers_prefix_of(self, messages: list[dict[str, object]]) -> bool:
+        """Whether ``messages`` still starts with the messages already summarized."""
+        return 0 < self.cursor <= len(messages) and (
+            prefix_digest(messages[: self.cursor]) == self.covered_digest
+        )
+
+    def merged(
+        self, parsed: dict[str, object], messages: list[dict[str, object]]
+    ) -> ThreadSummaryState:
+        """Fold an LLM delta (new summary + new list entries) for the next ``messages``.
+
+        ``messages`` must be the thread prefix up to the new cursor.
+        """
+        lists: dict[str, list[str]] = {}
+        for name, cap in _LIST_CAPS.items():
+            entries = list(getattr(self, name))
+            for item in parsed.get(name, []) or []:  # type: ignore[union-attr]
+                text = str(item).strip()
+                if text and text.lower() not in {e.lower() for e in entries}:
+                    entries.append(text)
+            # Newest entries win once a list is full.
+            lists[name] = entries[-cap:]
+        return replace(
+            self,
+            summary=str(parsed.get("summary") or self.summary),
+            cursor=len(messages),
+            covered_digest=prefix_digest(messages),
+            **lists,
+        )
+
+
+thread_summary_store: TTLCache[str, ThreadSummaryState] = TTLCache(
+    max_entries=settings.summary_state_max_entries,
+    ttl_sec=settings.summary_state_ttl_sec,
+)
+
+# Map-step results keyed by subject + digest of the chunk's message ids, so
+# overlapping requests for the same thread reuse already summarized chunks.
+chunk_summary_cache: TTLCache[str, dict[str, object]] = TTLCache(
+    max_entries=settings.summary_chunk_cache_max_entries,
+    ttl_sec=settings.summary_state_ttl_sec,
+)
@@ -0,0 +1,178 @@
+"""Bulk triage — classify a mailbox page in one call with shared tiers.
+
+Rules run rule by rule over the whole page. The remaining emails are deduped
+by sender template, then near-duplicate templates are folded together with
+MinHash clustering. History and the local model answer what they can, and
+only the residual ambiguous templates go to the LLM, concurrently.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from app.config.settings import settings
+from app.contracts.triage_batch import TriageBatchRequest, TriageBatchResponse, TriageBatchResult
+from app.core.date_extraction import earliest_deadline, parse_email_date
+from app.core.model_provider import BaseModelProvider
+from app.core.near_duplicate import cluster_near_duplicates
+from app.core.sender_identity import sender_domain
+from app.core.template_fingerprint import template_fingerprint
+from app.skills.triage.graph import (
+    _rule_based_triage_batch,
+    known_classification,
+    llm_classification,
+    local_classification,
+    rule_classification,
+)
+from app.skills.triage.local_classifier import load_local_classifier
+
+logger = logging.getLogger("ai_agent_platform.triage.batch")
+
+
+def _to_result(
+    email_id: str, classification: dict[str, object], source: str, due_date: str | None
+) -> TriageBatchResult:
+    return TriageBatchResult(
+        id=email_id,
+        category=str(classification["category"]),
+        priority=str(classification["priority"]),
+        sentiment=str(classification["sentiment"]),
+        requiresReply=bool(classification["requires_reply"]),
+        estimatedReadTimeSec=int(classification["estimated_read_time_sec"]),  # type: ignore[arg-type]
+        confidence=float(classification["confidence"]),  # type: ignore[arg-type]
+        source=source,
+        dueDate=due_date,
+    )
+
+
+def _merge_near_duplicates(
+    templates: dict[str, list[int]],
+    subjects: list[str],
+    from_addresses: list[str],
+    bodies: list[str],
+) -> int:
+    """Fold near-duplicate templates from one sender domain into one; returns merges."""
+
+    by_domain: dict[str, list[str]] = {}
+    for fingerprint, members in templates.items():
+        by_domain.setdefault(sender_domain(from_addresses[members[0]]), []).append(fingerprint)
+
+    merged = 0
+    for fingerprints in by_domain.values():
+        if len(fingerprints) < 2:
+            continue
+        reps = [templates[fp][0] for fp in fingerprints]
+        grouped = cluster_near_duplicates(
+            [f"{subjects[i]} {bodies[i]}" for i in reps],
+            threshold=settings.near_duplicate_threshold,
+            num_perm=settings.near_duplicate_permutations,
+            bands=settings.near_duplicate_bands,
+        )
+        for cluster in grouped.clusters:
+            keep = fingerprints[cluster[0]]
+            for j in cluster[1:]:
+                templates[keep].extend(templates.pop(fingerprints[j]))
+                merged += 1
+    return merged
+
+
+def triage_batch(
+    request: TriageBatchRequest, model_provider: BaseModelProvider
+) -> TriageBatchResponse:
+    """Classify every email in ``request``; results come back in request order."""
+
+    emails = request.emails
+    subjects = [e.subject or "(no subject)" for e in emails]
+    from_addresses = [e.fromAddress or "unknown" for e in emails]
+    bodies = [e.body[:1500] for e in emails]
+
+    classified: list[tuple[dict[str, object], str] | None] = [None] * len(emails)
+    prechecks = _rule_based_triage_batch(subjects, from_addresses, bodies)
+
+    # Decisive rules first; dedupe everything else by sender template
+    templates: dict[str, list[int]] = {}
+    for i, precheck in enumerate(prechecks):
+        result = rule_classification(precheck, bodies[i])
+        if result is not None:
+            classified[i] = (result, "rules")
+        else:
+            fingerprint = template_fingerprint(from_addresses[i], subjects[i], bodies[i])
+            templates.setdefault(fingerprint, []).append(i)
+    unique_templates = len(templates)
+    near_duplicates = _merge_near_duplicates(templates, subjects, from_addresses, bodies)
+
+    by_template: dict[str, tuple[dict[str, object], str]] = {}
+    pending: list[str] = []
+    for fingerprint, members in templates.items():
+        rep = members[0]
+        hint = str(prechecks[rep].get("priority", ""))
+        known = known_classification(fingerprint, from_addresses[rep], bodies[rep], hint)
+        if known is not None:
+            by_template[fingerprint] = known
+        else:
+            pending.append(fingerprint)
+
+    # Local model over all unresolved representatives in one vectorized pass
+    local_classifier = load_local_classifier(settings.triage_local_model_path)
+    if local_classifier is not None and pending:
+        reps = [templates[fp][0] for fp in pending]
+        predictions = local_classifier.predict_batch(
+            [(subjects[i], from_addresses[i], bodies[i]) for i in reps]
+        )
+        still_pending: list[str] = []
+        for fingerprint, rep, prediction in zip(pending, reps, predictions):
+            hint = str(prechecks[rep].get("priority", ""))
+            result = local_classification(prediction, bodies[rep], hint)
+            if result is not None:
+                by_template[fingerprint] = (result, "local_model")
+            else:
+                still_pending.append(fingerprint)
+        pending = still_pending
+
+    # Residual ambiguous templates go to the LLM concurrently
+    def classify_with_llm(fingerprint: str) -> tuple[dict[str, object], str]:
+        rep = templates[fingerprint][0]
+        hint = str(prechecks[rep].get("priority", ""))
+        result = llm_classification(
+            subjects[rep], from_addresses[rep], bodies[rep], fingerprint, hint, model_provider
+        )
+        return result, "llm"
+
+    if pending:
+        workers = max(1, min(settings.triage_batch_llm_concurrency, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Each worker runs in a copy of the caller's context (trace, deadline).
+            futures = [pool.submit(copy_context().run, classify_with_llm, fp) for fp in pending]
+            for fingerprint, future in zip(pending, futures):
+                by_template[fingerprint] = future.result()
+
+    for fingerprint, members in templates.items():
+        for i in members:
+            classified[i] = by_template[fingerprint]
+
+    # Rule-based deadline extraction is cheap enough to run on every email
+    due_dates: list[str | None] = []
+    for email, subject, body in zip(emails, subjects, bodies):
+        reference = parse_email_date(email.date or "")
+        deadline = earliest_deadline(f"{subject}\n{body}", reference, request.locale)
+        due_dates.append(deadline.date.isoformat() if deadline else None)
+
+    stats: Counter[str] = Counter(source for _, source in classified)  # type: ignore[misc]
+    stats["total"] = len(emails)
+    stats["uniqueTemplates"] = unique_templates
+    stats["nearDuplicateTemplates"] = near_duplicates
+    stats["deduplicated"] = sum(len(m) - 1 for m in templates.values())
+    stats["llmCalls"] = len(pending)
+    stats["withDeadline"] = sum(1 for due in due_dates if due)
+    logger.info("triage_batch request=%s stats=%s", request.requestId, dict(stats))
+
+    return TriageBatchResponse(
+        results=[
+            _to_result(email.id, *outcome, due)  # type: ignore[misc]
+            for email, outcome, due in zip(emails, classified, due_dates)
+        ],
+        stats=dict(stats),
+    )
@@ -9,9 +9,22 @@ from typing import TypedDict
 
 from langgraph.graph import END, START, StateGraph
 
+from app.config.settings import settings
 from app.contracts.agent_request import AgentRequest
 from app.contracts.agent_response import SafetyFlag, SuggestedAction
+from app.core.blackboard import publish_fact
+from app.core.email_facts import email_facts
+from app.core.fallback import note_fallback
 from app.core.model_provider import BaseModelProvider
+from app.core.prompt_budget import PromptSection, fit_prompt, generate_budgeted
+from app.core.sender_kb import sender_kb
+from app.core.sender_reputation import sender_reputation
+from app.core.template_fingerprint import template_fingerprint, template_outcome_cache
+from app.skills.triage.local_classifier import (
+    LocalTriagePrediction,
+    append_label_record,
+    load_local_classifier,
+)
 
 logger = logging.getLogger("ai_agent_platform.triage")
 
@@ -19,6 +32,16 @@ _VALID_CATEGORIES = {"work", "personal", "newsletter", "transaction", "social",
 _VALID_PRIORITIES = {"urgent", "high", "normal", "low"}
 _VALID_SENTIMENTS = {"positive", "neutral", "negative", "urgent"}
 
+# Knowledge base sender categories -> high-confidence triage pre-classification
+_KB_TRIAGE = {
+    "newsletter": {"category": "newsletter", "priority": "low", "requires_reply": False},
+    "promotional": {"category": "newsletter", "priority": "low", "requires_reply": False},
+    "transactional": {"category": "transaction", "priority": "normal", "requires_reply": False},
+    "social": {"category": "social", "priority": "low", "requires_reply": False},
+    "notification": {"category": "notification", "priority": "low", "requires_reply": False},
+    "esp": {"category": "notification", "priority": "low", "requires_reply": False},
+}
+
 
 class TriageGraphState(TypedDict):
     """Execution state for the triage skill graph."""
@@ -38,41 +61,102 @@ class TriageGraphState(TypedDict):
 
 def _extract_email_context(request: AgentRequest) -> dict[str, str]:
     """Pull email fields from context metadata with safe fallbacks."""
-    md = request.context.metadata
+    facts = email_facts(request)
     return {
-        "subject": md.get("emailSubject") or md.get("subject", "(no subject)"),
-        "from_address": md.get("emailFrom") or md.get("from", "unknown"),
-        "body": md.get("emailBody") or md.get("body", ""),
-        "date": md.get("emailDate") or md.get("date", ""),
-        "labels": md.get("labels", ""),
+        "subject": facts.subject or "(no subject)",
+        "from_address": facts.from_address or "unknown",
+        "body": facts.body,
+        "date": facts.date,
+        "labels": facts.labels,
     }
 
 
-def _rule_based_triage(subject: str, from_address: str, body: str) -> dict[str, object]:
-    """Fast deterministic pre-classification before LLM call."""
-    subject_lower = subject.lower()
-    body_lower = body.lower()
-    from_lower = from_address.lower()
+def _any_token(*tokens: str) -> re.Pattern[str]:
+    """Substring alternation — equivalent to ``any(t in text for t in tokens)``."""
+    return re.compile("|".join(re.escape(t) for t in tokens))
 
-    # Newsletter/promo detection
-    if any(t in body_lower for t in ("unsubscribe", "list-unsubscribe", "opt out", "manage preferences")):
-        return {"category": "newsletter", "priority": "low", "requires_reply": False}
-    if any(t in subject_lower for t in ("newsletter", "weekly digest", "monthly update", "promo", "sale", "offer", "% off")):
-        return {"category": "newsletter", "priority": "low", "requires_reply": False}
 
-    # Transaction detection
-    if any(t in subject_lower for t in ("invoice", "receipt", "order", "payment", "subscription", "billing", "charged")):
-        return {"category": "transaction", "priority": "normal", "requires_reply": False}
+_NEWSLETTER = {"category": "newsletter", "priority": "low", "requires_reply": False}
 
+# Ordered rule-based pre-classification steps: (field, pattern, outcome). The
+# "kb" step consults the curated sender knowledge base at that position.
+_PRECHECK_STEPS: tuple[tuple[str, re.Pattern[str] | None, dict[str, object]], ...] = (
+    # Newsletter/promo detection
+    ("body", _any_token("unsubscribe", "list-unsubscribe", "opt out", "manage preferences"), _NEWSLETTER),
+    ("subject", _any_token("newsletter", "weekly digest", "monthly update", "promo", "sale", "offer", "% off"), _NEWSLETTER),
+    # Transaction detection
+    (
+        "subject",
+        _any_token("invoice", "receipt", "order", "payment", "subscription", "billing", "charged"),
+        {"category": "transaction", "priority": "normal", "requires_reply": False},
+    ),
+    # Curated sender/domain knowledge base
+    ("kb", None, {}),
     # Notification detection
-    if any(t in from_lower for t in ("noreply", "no-reply", "donotreply", "notifications@", "alerts@", "support@")):
-        return {"category": "notification", "priority": "low", "requires_reply": False}
-
+    (
+        "from",
+        _any_token("noreply", "no-reply", "donotreply", "notifications@", "alerts@", "support@"),
+        {"category": "notification", "priority": "low", "requires_reply": False},
+    ),
     # Urgency detection
-    if any(t in subject_lower for t in ("urgent", "asap", "critical", "action required", "immediate", "deadline")):
-        return {"priority": "urgent"}
+    (
+        "subject",
+        _any_token("urgent", "asap", "critical", "action required", "immediate", "deadline"),
+        {"priority": "urgent"},
+    ),
+)
+
+
+def _rule_based_triage_batch(
+    subjects: list[str], from_addresses: list[str], bodies: list[str]
+) -> list[dict[str, object]]:
+    """Run the pre-classification rules over many emails, one rule at a time.
+
+    Each step loops over only the rows no earlier step has decided, so the
+    result matches evaluating the rules one email at a time; the lowercased
+    columns and bound pattern methods are shared across the page. This is a
+    per-row Python loop, not a vectorized pass.
+    """
+
+    columns = {
+        "subject": [s.lower() for s in subjects],
+        "from": [f.lower() for f in from_addresses],
+        "body": [b.lower() for b in bodies],
+    }
+    results: list[dict[str, object]] = [{} for _ in subjects]
+    pending = list(range(len(subjects)))
+    kb = sender_kb()
+
+    for field, pattern, outcome in _PRECHECK_STEPS:
+        if not pending:
+            break
+        undecided: list[int] = []
+        if field == "kb":
+            for i in pending:
+                kb_category = kb.lookup_sender(from_addresses[i]) if kb is not None else None
+                if kb_category in _KB_TRIAGE:
+                    results[i] = dict(_KB_TRIAGE[kb_category])
+                else:
+                    undecided.append(i)
+        else:
+            column = columns[field]
+            search = pattern.search  # type: ignore[union-attr]
+            for i in pending:
+                if search(column[i]):
+                    results[i] = dict(outcome)
+                else:
+                    undecided.append(i)
+        pending = undecided
+    return results
 
-    return {}
+
+def _rule_based_triage(subject: str, from_address: str, body: str) -> dict[str, object]:
+    """Fast deterministic pre-classification before LLM call."""
+    return _rule_based_triage_batch([subject], [from_address], [body])[0]
+
+
+def _reputation_outcome(category: str, priority: str, requires_reply: bool) -> str:
+    return f"{category}|{priority}|{'reply' if requires_reply else 'no_reply'}"
 
 
 def _parse_llm_json(raw: str) -> dict[str, object]:
@@ -84,44 +168,89 @@ def _parse_llm_json(raw: str) -> dict[str, object]:
         return {}
 
 
-def classify_email_node(
-    state: TriageGraphState, model_provider: BaseModelProvider
-) -> dict[str, object]:
-    """Use LLM to classify email category, priority, and metadata."""
+def _default_read_time(body: str) -> int:
+    return max(30, len(body) // 5)
 
-    request = state["request"]
-    ctx = _extract_email_context(request)
-    subject = ctx["subject"]
-    from_address = ctx["from_address"]
-    body = ctx["body"][:1500]  # Truncate to avoid token overflow
 
-    # Fast rule-based pre-check
-    precheck = _rule_based_triage(subject, from_address, body)
+def rule_classification(precheck: dict[str, object], body: str) -> dict[str, object] | None:
+    """Full classification from a decisive rule pre-check, else ``None``."""
+    if "category" not in precheck or "priority" not in precheck:
+        return None
+    requires_reply = bool(precheck.get("requires_reply", False))
+    return {
+        "category": precheck["category"],
+        "priority": precheck["priority"],
+        "sentiment": "neutral",
+        "requires_reply": requires_reply,
+        "estimated_read_time_sec": _default_read_time(body),
+        "intent": "triage_classify",
+        "confidence": 0.9,
+    }
 
-    # If pre-check gives high-confidence result, skip LLM
-    if "category" in precheck and "priority" in precheck:
+
+def known_classification(
+    fingerprint: str, from_address: str, body: str, priority_hint: str
+) -> tuple[dict[str, object], str] | None:
+    """Classification from history — same sender template, then sender reputation.
+
+    Returns the classification and the tier that produced it.
+    """
+
+    # Same sender template seen before — reuse the previous LLM outcome
+    cached = template_outcome_cache.get(("triage", fingerprint))
+    if cached is not None:
+        return {**cached, "intent": "triage_classify"}, "template_cache"
+
+    # This exact address's LLM history is confidently one-sided — answer from
+    # reputation. A domain verdict is too coarse to skip the model tiers.
+    reputation = sender_reputation.verdict("triage", from_address)
+    if reputation is not None:
+        outcome, share = reputation
+        category, priority, reply = outcome.split("|")
         return {
-            "category": precheck["category"],
-            "priority": precheck["priority"],
+            "category": category,
+            "priority": priority_hint or priority,
             "sentiment": "neutral",
-            "requires_reply": precheck.get("requires_reply", False),
-            "estimated_read_time_sec": max(30, len(body) // 5),
+            "requires_reply": reply == "reply",
+            "estimated_read_time_sec": _default_read_time(body),
             "intent": "triage_classify",
-            "confidence": 0.9,
-        }
+            "confidence": round(min(share, 0.95), 2),
+        }, "reputation"
+    return None
 
-    # Override with any precheck signals before LLM
-    priority_hint = precheck.get("priority", "")
+
+def local_classification(
+    prediction: LocalTriagePrediction, body: str, priority_hint: str
+) -> dict[str, object] | None:
+    """Classification from a local model prediction when it is confident enough."""
+    if prediction.confidence < settings.triage_local_min_confidence:
+        return None
+    return {
+        "category": prediction.category,
+        "priority": priority_hint or prediction.priority,
+        "sentiment": "neutral",
+        "requires_reply": prediction.requires_reply,
+        "estimated_read_time_sec": _default_read_time(body),
+        "intent": "triage_classify",
+        "confidence": round(prediction.confidence, 2),
+    }
+
+
+def llm_classification(
+    subject: str,
+    from_address: str,
+    body: str,
+    fingerprint: str,
+    priority_hint: str,
+    model_provider: BaseModelProvider,
+) -> dict[str, object]:
+    """Classify with the LLM and feed the outcome back into the history tiers."""
 
     system = (
         "You are an email classification AI. Analyze emails and return precise JSON classifications. "
         "Never include explanations — return ONLY valid JSON."
     )
-    prompt = (
-        f"Classify this email:\n\n"
-        f"From: {from_address}\n"
-        f"Subject: {subject}\n"
-        f"Body: {body}\n\n"
+    instructions = (
         f"Return a JSON object with these exact keys:\n"
         f'- "category": one of {list(_VALID_CATEGORIES)}\n'
         f'- "priority": one of {list(_VALID_PRIORITIES)}'
@@ -132,12 +261,29 @@ def classify_email_node(
         f'- "estimated_read_time_sec": integer (30-600)\n\n'
         f"Return ONLY the JSON object."
     )
+    budgeted = fit_prompt(
+        "triage",
+        system,
+        [
+            PromptSection(
+                name="email",
+                text=body,
+                priority=1,
+                min_tokens=64,
+                prefix=f"Classify this email:\n\nFrom: {from_address}\nSubject: {subject}\nBody: ",
+                suffix="\n\n",
+            ),
+            PromptSection(name="instructions", text=instructions, priority=9),
+        ],
+    )
 
     try:
-        raw = model_provider.generate(prompt, system=system, max_tokens=150)
+        raw = generate_budgeted(model_provider, budgeted, max_tokens=150)
         parsed = _parse_llm_json(raw)
     except RuntimeError:
         parsed = {}
+    if not parsed:
+        note_fallback("triage_llm")
 
     category = parsed.get("category", "work")
     if category not in _VALID_CATEGORIES:
@@ -152,19 +298,104 @@ def classify_email_node(
         sentiment = "neutral"
 
     requires_reply = bool(parsed.get("requires_reply", False))
-    read_time = int(parsed.get("estimated_read_time_sec", max(30, len(body) // 5)))
+    read_time = int(parsed.get("estimated_read_time_sec", _default_read_time(body)))
+    read_time = max(15, min(read_time, 600))
+
+    if parsed:
+        sender_reputation.record(
+            "triage", from_address, _reputation_outcome(category, priority, requires_reply)
+        )
+        template_outcome_cache.set(
+            ("triage", fingerprint),
+            {
+                "category": category,
+                "priority": priority,
+                "sentiment": sentiment,
+                "requires_reply": requires_reply,
+                "estimated_read_time_sec": read_time,
+                "confidence": 0.88,
+            },
+        )
+
+    if parsed and settings.triage_label_log_path:
+        append_label_record(
+            settings.triage_label_log_path,
+            {
+                "subject": subject,
+                "from": from_address,
+                "body": body,
+                "category": category,
+                "priority": priority,
+                "requires_reply": requires_reply,
+            },
+        )
 
     return {
         "category": category,
         "priority": priority,
         "sentiment": sentiment,
         "requires_reply": requires_reply,
-        "estimated_read_time_sec": max(15, min(read_time, 600)),
+        "estimated_read_time_sec": read_time,
         "intent": "triage_classify",
         "confidence": 0.88 if parsed else 0.6,
     }
 
 
+def classify_email_node(
+    state: TriageGraphState, model_provider: BaseModelProvider
+) -> dict[str, object]:
+    """Use LLM to classify email category, priority, and metadata."""
+    result = _classify_email(state, model_provider)
+    # Other coordinator sub-skills reuse the verdict instead of re-deriving it.
+    publish_fact(
+        "triage.classification",
+        {
+            "category": str(result["category"]),
+            "priority": str(result["priority"]),
+            "requires_reply": bool(result["requires_reply"]),
+        },
+    )
+    return result
+
+
+def _classify_email(
+    state: TriageGraphState, model_provider: BaseModelProvider
+) -> dict[str, object]:
+    """Cheapest tier that can classify the email: rules, history, local model, LLM."""
+
+    request = state["request"]
+    ctx = _extract_email_context(request)
+    subject = ctx["subject"]
+    from_address = ctx["from_address"]
+    body = ctx["body"][:1500]  # Truncate to avoid token overflow
+
+    # Fast rule-based pre-check; a high-confidence result skips the LLM
+    precheck = _rule_based_triage(subject, from_address, body)
+    result = rule_classification(precheck, body)
+    if result is not None:
+        return result
+
+    # Override with any precheck signals before LLM
+    priority_hint = str(precheck.get("priority", ""))
+
+    fingerprint = template_fingerprint(from_address, subject, body)
+    known = known_classification(fingerprint, from_address, body, priority_hint)
+    if known is not None:
+        return known[0]
+
+    # Local linear classifier tier — confident predictions skip the LLM entirely
+    local_classifier = load_local_classifier(settings.triage_local_model_path)
+    if local_classifier is not None:
+        prediction = local_classifier.predict(subject, from_address, body)
+        result = local_classification(prediction, body, priority_hint)
+        if result is not None:
+            return result
+
+    return llm_classification(
+        subject, from_address, body, fingerprint, priority_hint, model_provider
+    )
+
+
 def draft_triage_response_node(state: TriageGraphState) -> dict[str, object]:
     """Generate a human-readable summary of the triage result."""
     category = state["category"]
@@ -0,0 +1,285 @@
+"""Local hashed bag-of-words classifier — the tier between triage rules and the LLM.
+
+Features are hashed word unigrams/bigrams (plus sender domain and subject-tagged
+tokens) and each output head (category, priority, requires_reply) is a linear
+softmax model over them. Weights are trained offline from logged LLM labels and
+shipped as a compact ``.npz`` array file.
+
+Train from a JSONL label log::
+
+    python -m app.skills.triage.local_classifier --labels triage-labels.jsonl --out triage-local.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from app.core.sender_identity import sender_domain
+
+logger = logging.getLogger("ai_agent_platform.triage.local_classifier")
+
+_FORMAT_VERSION = 1
+_DEFAULT_N_FEATURES = 1 << 18
+_WORD_PATTERN = re.compile(r"[a-z0-9]+(?:['.@-][a-z0-9]+)*")
+HEADS = ("category", "priority", "requires_reply")
+
+_label_log_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class LocalTriagePrediction:
+    """Local classifier output; ``confidence`` is the weakest head's probability."""
+
+    category: str
+    priority: str
+    requires_reply: bool
+    confidence: float
+
+
+def _tokens(subject: str, from_address: str, body: str) -> list[str]:
+    subject_words = _WORD_PATTERN.findall(subject.lower())
+    body_words = _WORD_PATTERN.findall(body.lower())
+    tokens = [f"d:{sender_domain(from_address)}"]
+    tokens.extend(f"s:{w}" for w in subject_words)
+    words = subject_words + body_words
+    tokens.extend(words)
+    tokens.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return tokens
+
+
+def hash_features(
+    emails: Iterable[tuple[str, str, str]], n_features: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Hash ``(subject, from, body)`` rows into a CSR-like layout.
+
+    Returns ``(indices, offsets, scales)``: feature ids of every row concatenated,
+    the start offset of each row, and a per-row 1/sqrt(len) length normalizer.
+    """
+
+    indices: list[int] = []
+    offsets: list[int] = []
+    scales: list[float] = []
+    for subject, from_address, body in emails:
+        tokens = _tokens(subject, from_address, body)
+        offsets.append(len(indices))
+        indices.extend(zlib.crc32(t.encode()) % n_features for t in tokens)
+        scales.append(1.0 / np.sqrt(len(tokens)))
+    return (
+        np.asarray(indices, dtype=np.int64),
+        np.asarray(offsets, dtype=np.int64),
+        np.asarray(scales, dtype=np.float32),
+    )
+
+
+def _row_scores(
+    weights: np.ndarray,
+    bias: np.ndarray,
+    indices: np.ndarray,
+    offsets: np.ndarray,
+    scales: np.ndarray,
+) -> np.ndarray:
+    """Sparse-dense product: sum the weight rows of each email's features."""
+    sums = np.add.reduceat(weights[indices].astype(np.float32), offsets, axis=0)
+    return sums * scales[:, None] + bias
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    shifted = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+class LocalTriageClassifier:
+    """Multi-head linear classifier over hashed n-gram features."""
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        bias: np.ndarray,
+        labels: dict[str, list[str]],
+        n_features: int,
+    ) -> None:
+        self._weights = weights
+        self._bias = bias.astype(np.float32)
+        self._labels = labels
+        self.n_features = n_features
+        self._slices: dict[str, slice] = {}
+        start = 0
+        for head in HEADS:
+            width = len(labels[head])
+            self._slices[head] = slice(start, start + width)
+            start += width
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LocalTriageClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != _FORMAT_VERSION:
+                raise ValueError(f"unsupported local classifier format v{version}")
+            return cls(
+                weights=data["weights"],
+                bias=data["bias"],
+                labels=json.loads(str(data["labels"])),
+                n_features=int(data["n_features"]),
+            )
+
+    def save(self, path: str | Path) -> None:
+        # float16 weights halve the file; compression squeezes the unused buckets.
+        np.savez_compressed(
+            path,
+            version=np.int64(_FORMAT_VERSION),
+            weights=self._weights.astype(np.float16),
+            bias=self._bias,
+            labels=np.asarray(json.dumps(self._labels)),
+            n_features=np.int64(self.n_features),
+        )
+
+    def predict(self, subject: str, from_address: str, body: str) -> LocalTriagePrediction:
+        return self.predict_batch([(subject, from_address, body)])[0]
+
+    def predict_batch(
+        self, emails: list[tuple[str, str, str]]
+    ) -> list[LocalTriagePrediction]:
+        """Classify many ``(subject, from, body)`` rows in one vectorized pass."""
+
+        if not emails:
+            return []
+        indices, offsets, scales = hash_features(emails, self.n_features)
+        scores = _row_scores(self._weights, self._bias, indices, offsets, scales)
+
+        picks: dict[str, np.ndarray] = {}
+        confidence = np.ones(len(emails), dtype=np.float32)
+        for head in HEADS:
+            probs = _softmax(scores[:, self._slices[head]])
+            picks[head] = probs.argmax(axis=1)
+            confidence = np.minimum(confidence, probs.max(axis=1))
+
+        category_labels = self._labels["category"]
+        priority_labels = self._labels["priority"]
+        reply_labels = self._labels["requires_reply"]
+        return [
+            LocalTriagePrediction(
+                category=category_labels[c],
+                priority=priority_labels[p],
+                requires_reply=reply_labels[r] == "true",
+                confidence=float(conf),
+            )
+            for c, p, r, conf in zip(
+                picks["category"], picks["priority"], picks["requires_reply"], confidence
+            )
+        ]
+
+
+def train_local_classifier(
+    records: list[dict[str, object]],
+    n_features: int = _DEFAULT_N_FEATURES,
+    epochs: int = 60,
+    learning_rate: float = 2.0,
+    l2: float = 1e-5,
+) -> LocalTriageClassifier:
+    """Fit the linear heads by full-batch gradient descent on logged LLM labels.
+
+    Each record needs ``subject``, ``from``, ``body``, ``category``, ``priority``
+    and ``requires_reply``.
+    """
+
+    if not records:
+        raise ValueError("no training records")
+
+    labels: dict[str, list[str]] = {
+        head: sorted({str(r[head]).lower() for r in records}) for head in HEADS
+    }
+    labels["requires_reply"] = ["false", "true"]
+    widths = [len(labels[head]) for head in HEADS]
+    n_outputs = sum(widths)
+
+    targets = np.zeros((len(records), n_outputs), dtype=np.float32)
+    start = 0
+    for head, width in zip(HEADS, widths):
+        lookup = {label: i for i, label in enumerate(labels[head])}
+        for row, record in enumerate(records):
+            targets[row, start + lookup[str(record[head]).lower()]] = 1.0
+        start += width
+
+    indices, offsets, scales = hash_features(
+        (
+            (str(r.get("subject", "")), str(r.get("from", "")), str(r.get("body", "")))
+            for r in records
+        ),
+        n_features,
+    )
+    row_of_index = np.repeat(
+        np.arange(len(records)), np.diff(np.append(offsets, len(indices)))
+    )
+
+    weights = np.zeros((n_features, n_outputs), dtype=np.float32)
+    bias = np.zeros(n_outputs, dtype=np.float32)
+    for _ in range(epochs):
+        scores = _row_scores(weights, bias, indices, offsets, scales)
+        grad = np.empty_like(scores)
+        start = 0
+        for width in widths:
+            block = slice(start, start + width)
+            grad[:, block] = _softmax(scores[:, block]) - targets[:, block]
+            start += width
+        grad /= len(records)
+
+        grad_weights = np.zeros_like(weights)
+        np.add.at(grad_weights, indices, grad[row_of_index] * scales[row_of_index, None])
+        weights -= learning_rate * (grad_weights + l2 * weights)
+        bias -= learning_rate * grad.sum(axis=0)
+
+    return LocalTriageClassifier(weights, bias, labels, n_features)
+
+
+@lru_cache(maxsize=4)
+def load_local_classifier(path: str) -> LocalTriageClassifier | None:
+    """Load (once per process) the classifier at ``path``; ``None`` when unavailable."""
+    if not path:
+        return None
+    try:
+        classifier = LocalTriageClassifier.load(path)
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("local triage classifier unavailable path=%s error=%s", path, exc)
+        return None
+    logger.info("local triage classifier loaded path=%s", path)
+    return classifier
+
+
+def append_label_record(path: str, record: dict[str, object]) -> None:
+    """Append one LLM-labelled email to the JSONL training log."""
+    line = json.dumps(record, ensure_ascii=False)
+    try:
+        with _label_log_lock, open(path, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+    except OSError as exc:
+        logger.warning("triage label log write failed path=%s error=%s", path, exc)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Train the local triage classifier.")
+    parser.add_argument("--labels", required=True, help="JSONL file of LLM-labelled emails")
+    parser.add_argument("--out", required=True, help="output .npz path")
+    parser.add_argument("--features", type=int, default=_DEFAULT_N_FEATURES)
+    parser.add_argument("--epochs", type=int, default=60)
+    args = parser.parse_args(argv)
+
+    with open(args.labels, encoding="utf-8") as handle:
+        records = [json.loads(line) for line in handle if line.strip()]
+    classifier = train_local_classifier(records, n_features=args.features, epochs=args.epochs)
+    classifier.save(args.out)
+    print(f"trained on {len(records)} records -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
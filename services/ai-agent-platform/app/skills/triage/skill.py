@@ -2,7 +2,9 @@
 
 from app.contracts.agent_request import AgentRequest
 from app.contracts.agent_response import AgentResponse
+from app.contracts.triage_batch import TriageBatchRequest, TriageBatchResponse
 from app.core.model_provider import BaseModelProvider, RuleBasedModelProvider
+from app.skills.triage.batch import triage_batch
 from app.skills.triage.graph import build_triage_skill_graph
 
 
@@ -10,7 +12,8 @@ class TriageSkill:
     """Autonomously triages incoming emails: category, priority, sentiment, reply-required."""
 
     def __init__(self, model_provider: BaseModelProvider | None = None) -> None:
-        self._graph = build_triage_skill_graph(model_provider or RuleBasedModelProvider())
+        self._model_provider = model_provider or RuleBasedModelProvider()
+        self._graph = build_triage_skill_graph(self._model_provider)
 
     def run(self, request: AgentRequest) -> AgentResponse:
         """Execute triage graph and return structured classification response."""
@@ -43,3 +46,7 @@ class TriageSkill:
             },
             safetyFlags=state["safety_flags"],
         )
+
+    def run_batch(self, request: TriageBatchRequest) -> TriageBatchResponse:
+        """Triage many emails in one call (rules, dedupe, history, local model, LLM)."""
+        return triage_batch(request, self._model_provider)
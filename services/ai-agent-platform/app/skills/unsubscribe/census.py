@@ -0,0 +1,216 @@
+"""Streaming subscription census — per-list aggregation over a whole mailbox.
+
+An NDJSON stream of email headers/metadata is folded line by line into one
+aggregate per mailing list (``List-Id``) or, without one, per sender: volume,
+last seen, latest subject/headers and the first unsubscribe URL found. Memory
+is bounded by ``census_max_lists``; when it is exceeded the lowest-volume,
+least recently seen aggregates are dropped. Classification then runs the
+unsubscribe graph's detect and ``classify_value_node`` steps once per
+distinct list instead of once per email.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass
+
+from pydantic import ValidationError
+
+from app.config.settings import settings
+from app.contracts.agent_request import AgentContext, AgentMessage, AgentRequest
+from app.contracts.subscription_census import (
+    CensusEmail,
+    CensusList,
+    SubscriptionCensusResponse,
+)
+from app.core.date_extraction import parse_email_date
+from app.core.list_headers import ListHeaders, parse_list_headers
+from app.core.model_provider import BaseModelProvider
+from app.core.sender_identity import normalize_address
+from app.skills.unsubscribe.graph import (
+    classify_value_node,
+    detect_list_email_node,
+    find_unsubscribe_url,
+)
+
+logger = logging.getLogger("ai_agent_platform.unsubscribe.census")
+
+# Per-aggregate samples and partial NDJSON lines are capped to keep memory bounded.
+_MAX_SAMPLE_CHARS = 4000
+_MAX_LINE_BYTES = 1 << 20
+
+
+@dataclass(slots=True)
+class _ListAggregate:
+    key: str
+    list_id: str | None
+    sender: str
+    volume: int = 0
+    last_seen: float = 0.0
+    last_seen_raw: str | None = None
+    subject: str = ""
+    headers: str = ""
+    body: str = ""
+    unsubscribe_url: str = ""
+
+
+def list_key(email: CensusEmail, list_headers: ListHeaders) -> str:
+    """Aggregation key: the normalized List-Id when present, else the sender address."""
+    if list_headers.list_id:
+        return f"list:{list_headers.list_id}"
+    return f"sender:{normalize_address(email.fromAddress)}"
+
+
+class SubscriptionCensus:
+    """Incremental NDJSON consumer; ``feed`` raw chunks, then ``close``."""
+
+    def __init__(self, max_lists: int | None = None) -> None:
+        self._max_lists = max_lists or settings.census_max_lists
+        self._lists: dict[str, _ListAggregate] = {}
+        self._pending = b""
+        self.stats = {"emails": 0, "invalidLines": 0, "evictedLists": 0}
+
+    def feed(self, chunk: bytes) -> None:
+        """Consume a chunk of the stream; a trailing partial line waits for the next chunk."""
+        lines = (self._pending + chunk).split(b"\n")
+        self._pending = lines.pop()
+        if len(self._pending) > _MAX_LINE_BYTES:
+            self._pending = b""
+            self.stats["invalidLines"] += 1
+        for line in lines:
+            self._add_line(line)
+
+    def close(self) -> None:
+        """Consume the final line when the stream does not end with a newline."""
+        if self._pending:
+            self._add_line(self._pending)
+            self._pending = b""
+
+    def _add_line(self, line: bytes) -> None:
+        line = line.strip()
+        if not line:
+            return
+        try:
+            email = CensusEmail.model_validate(json.loads(line))
+        except (ValueError, ValidationError):
+            self.stats["invalidLines"] += 1
+            return
+        self.add(email)
+
+    def add(self, email: CensusEmail) -> None:
+        """Fold one email into its list aggregate."""
+        self.stats["emails"] += 1
+        list_headers = parse_list_headers(email.headers)
+        key = list_key(email, list_headers)
+        aggregate = self._lists.get(key)
+        if aggregate is None:
+            aggregate = self._lists[key] = _ListAggregate(
+                key=key, list_id=list_headers.list_id, sender=email.fromAddress
+            )
+        aggregate.volume += 1
+
+        sent = parse_email_date(email.date or "")
+        timestamp = sent.timestamp() if sent is not None else 0.0
+        if timestamp >= aggregate.last_seen:
+            # The newest email represents the list for classification.
+            aggregate.last_seen = timestamp
+            aggregate.last_seen_raw = sent.isoformat() if sent is not None else None
+            aggregate.sender = email.fromAddress or aggregate.sender
+            aggregate.subject = email.subject
+            aggregate.headers = email.headers[:_MAX_SAMPLE_CHARS]
+            aggregate.body = email.body[:_MAX_SAMPLE_CHARS]
+        if not aggregate.unsubscribe_url:
+            aggregate.unsubscribe_url = find_unsubscribe_url(list_headers, email.body)
+        if len(self._lists) > self._max_lists:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop the smallest, stalest tenth of the aggregates (amortized O(1) per email)."""
+        keep = max(1, int(self._max_lists * 0.9))
+        ranked = sorted(
+            self._lists.values(), key=lambda a: (a.volume, a.last_seen), reverse=True
+        )
+        self.stats["evictedLists"] += len(ranked) - keep
+        self._lists = {a.key: a for a in ranked[:keep]}
+
+    def aggregates(self) -> list[_ListAggregate]:
+        """Aggregates by volume, highest first."""
+        return sorted(self._lists.values(), key=lambda a: (-a.volume, -a.last_seen))
+
+
+def _classify(
+    request_id: str, aggregate: _ListAggregate, model_provider: BaseModelProvider
+) -> CensusList | None:
+    """Run detect + classify once for a list's representative email."""
+    request = AgentRequest(
+        skill="unsubscribe",
+        requestId=f"{request_id}:{aggregate.key}"[:128],
+        messages=[AgentMessage(content="Should I keep this subscription?")],
+        context=AgentContext(
+            metadata={
+                "emailFrom": aggregate.sender,
+                "emailSubject": aggregate.subject,
+                "emailHeaders": aggregate.headers,
+                "emailBody": aggregate.body,
+            }
+        ),
+    )
+    state: dict[str, object] = {"request": request, "unsubscribe_url": aggregate.unsubscribe_url}
+    state.update(detect_list_email_node(state))  # type: ignore[arg-type]
+    if not state["is_list_email"]:
+        return None
+    state.update(classify_value_node(state, model_provider))  # type: ignore[arg-type]
+    return CensusList(
+        listKey=aggregate.key,
+        listId=aggregate.list_id,
+        sender=aggregate.sender,
+        listType=str(state["list_type"]),
+        volume=aggregate.volume,
+        lastSeen=aggregate.last_seen_raw,
+        unsubscribeUrl=aggregate.unsubscribe_url or None,
+        keep=bool(state["keep_recommendation"]),
+        reason=str(state["keep_reason"]),
+    )
+
+
+def classify_census(
+    request_id: str, census: SubscriptionCensus, model_provider: BaseModelProvider
+) -> SubscriptionCensusResponse:
+    """One keep/unsubscribe verdict per distinct list, highest volume first."""
+
+    aggregates = census.aggregates()
+    verdicts: list[CensusList | None] = []
+    failed = 0
+    if aggregates:
+        workers = max(1, min(settings.census_classify_concurrency, len(aggregates)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(copy_context().run, _classify, request_id, a, model_provider)
+                for a in aggregates
+            ]
+            for aggregate, future in zip(aggregates, futures):
+                try:
+                    verdicts.append(future.result())
+                except Exception as exc:
+                    # One bad list must not fail the whole mailbox census.
+                    logger.warning(
+                        "subscription_census request=%s list=%s failed: %s",
+                        request_id,
+                        aggregate.key,
+                        exc,
+                    )
+                    failed += 1
+
+    lists = [v for v in verdicts if v is not None]
+    stats = {
+        **census.stats,
+        "senders": len(aggregates),
+        "lists": len(lists),
+        "nonListSenders": len(verdicts) - len(lists),
+        "failedLists": failed,
+    }
+    logger.info("subscription_census request=%s stats=%s", request_id, stats)
+    return SubscriptionCensusResponse(requestId=request_id, lists=lists, stats=stats)
@@ -0,0 +1,79 @@
+"""Per-list keep/unsubscribe decisions reused across every email of a list.
+
+Whether a subscription is worth keeping depends on the list, not on the
+individual issue, so one LLM verdict is stored per ``List-Id`` (or per
+sender domain for list mail without one) and list type. Shared mailbox
+domains such as gmail.com stand in for no one, so mail from them without a
+``List-Id`` is keyed by the full sender address instead. Entries expire
+after ``list_decision_cache_ttl_sec`` and can be dropped per sender when the
+user overrides a verdict.
+"""
+
+from __future__ import annotations
+
+from app.config.settings import settings
+from app.core.list_headers import ListHeaders
+from app.core.sender_identity import (
+    SHARED_MAILBOX_DOMAINS,
+    owner_matcher,
+    sender_domain,
+    sender_owner,
+)
+from app.core.ttl_cache import TTLCache
+
+# Key: (scope, identifier, sender owner, list type) — the owner is the sender domain,
+# or the full address on a shared mailbox domain; value: {"keep": bool, "reason": str}.
+DecisionKey = tuple[str, str, str, str]
+
+
+class ListDecisionCache:
+    """TTL/LRU-bounded verdict cache keyed by list-id, sender domain or sender address."""
+
+    def __init__(self, max_entries: int, ttl_sec: float) -> None:
+        self._entries: TTLCache[DecisionKey, dict[str, object]] = TTLCache(
+            max_entries=max_entries, ttl_sec=ttl_sec
+        )
+
+    @staticmethod
+    def key(list_headers: ListHeaders, from_address: str, list_type: str) -> DecisionKey | None:
+        """``None`` when there is neither a List-Id nor a sender domain to key on."""
+        domain = sender_domain(from_address)
+        owner = sender_owner(from_address)
+        if list_headers.list_id:
+            return ("list", list_headers.list_id, owner, list_type)
+        if domain in SHARED_MAILBOX_DOMAINS:
+            return ("address", owner, owner, list_type)
+        if domain:
+            return ("domain", domain, domain, list_type)
+        return None
+
+    def get(self, key: DecisionKey | None) -> tuple[bool, str] | None:
+        if key is None:
+            return None
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        return bool(cached["keep"]), str(cached["reason"])
+
+    def set(self, key: DecisionKey | None, keep: bool, reason: str) -> None:
+        if key is not None:
+            self._entries.set(key, {"keep": keep, "reason": reason})
+
+    def invalidate_sender(self, sender: str) -> int:
+        """Drop every decision for a sender address or domain; returns the count."""
+        matches = owner_matcher(sender)
+        if matches is None:
+            return 0
+        return self._entries.invalidate_where(lambda key: matches(key[2]))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, object]:
+        return self._entries.stats()
+
+
+list_decision_cache = ListDecisionCache(
+    max_entries=settings.list_decision_cache_max_entries,
+    ttl_sec=settings.list_decision_cache_ttl_sec,
+)
@@ -10,7 +10,17 @@ from langgraph.graph import END, START, StateGraph
 
 from app.contracts.agent_request import AgentRequest
 from app.contracts.agent_response import SafetyFlag, SuggestedAction
+from app.core.blackboard import await_fact
+from app.core.email_facts import email_facts
+from app.core.fallback import note_fallback
+from app.core.list_headers import EMPTY_LIST_HEADERS, ListHeaders
 from app.core.model_provider import BaseModelProvider
+from app.core.prompt_budget import PromptSection, fit_prompt, generate_budgeted
+from app.core.sender_identity import owner_matcher, sender_domain, sender_owner
+from app.core.sender_kb import sender_kb
+from app.core.sender_reputation import sender_reputation
+from app.core.template_fingerprint import template_fingerprint, template_outcome_cache
+from app.skills.unsubscribe.decision_cache import DecisionKey, list_decision_cache
 
 logger = logging.getLogger("ai_agent_platform.unsubscribe")
 
@@ -31,6 +41,17 @@ _PROMO_SUBJECT_PATTERNS = [
     r"(?:newsletter|bulletin|dispatch)\s*(?:#\d+)?$",
 ]
 
+# Knowledge base categories that by themselves identify bulk/list mail
+_KB_BULK_CATEGORIES = {"newsletter", "promotional", "esp"}
+# Knowledge base categories that pin down the list type of a list email
+_KB_LIST_TYPES = {
+    "newsletter": "newsletter",
+    "promotional": "promotional",
+    "transactional": "transactional",
+    "notification": "notification",
+    "social": "notification",
+}
+
 _UNSUBSCRIBE_URL_PATTERN = re.compile(
     r'https?://[^\s"\'<>]+(?:unsubscribe|optout|opt-out|remove|preference)[^\s"\'<>]*',
     re.IGNORECASE,
@@ -41,6 +62,8 @@ class UnsubscribeGraphState(TypedDict):
     """Execution state for the unsubscribe skill graph."""
 
     request: AgentRequest
+    # Parsed once in detect_list_email and reused by the later nodes.
+    list_headers: ListHeaders | None
     is_list_email: bool
     list_type: str
     unsubscribe_url: str
@@ -55,31 +78,51 @@ class UnsubscribeGraphState(TypedDict):
 
 def detect_list_email_node(state: UnsubscribeGraphState) -> dict[str, object]:
     """Detect if email is a newsletter/promo using header patterns and heuristics."""
-    request = state["request"]
-    md = request.context.metadata
-    body = (md.get("emailBody") or md.get("body", "")).lower()
-    subject = (md.get("emailSubject") or md.get("subject", "")).lower()
-    headers = (md.get("emailHeaders") or md.get("headers", "")).lower()
+    facts = email_facts(state["request"])
+    body = facts.body_lower
+    subject = facts.subject_lower
+    list_headers = state.get("list_headers") or facts.list_headers
 
     # Check explicit unsubscribe headers (most reliable signal)
-    has_list_header = "list-unsubscribe" in headers or "list-id" in headers
+    has_list_header = list_headers.has_list_headers
 
-    # Check body patterns
-    body_signals = sum(
-        1 for p in _LIST_PATTERNS if re.search(p, body + headers, re.IGNORECASE)
-    )
+    # Check body patterns; a List-Unsubscribe header counts as one more signal
+    body_signals = sum(1 for p in _LIST_PATTERNS if re.search(p, body, re.IGNORECASE))
+    body_signals += bool(list_headers.https_urls or list_headers.mailto_urls)
 
     # Check subject patterns
     subject_signals = sum(
         1 for p in _PROMO_SUBJECT_PATTERNS if re.search(p, subject, re.IGNORECASE)
     )
 
-    is_list_email = has_list_header or body_signals >= 2 or subject_signals >= 1
+    # Curated list-id / sender knowledge base
+    kb = sender_kb()
+    kb_category = None
+    if kb is not None:
+        if list_headers.list_id:
+            kb_category = kb.lookup_list_id(list_headers.list_id)
+        if kb_category is None:
+            kb_category = kb.lookup_domain(sender_domain(facts.from_address))
+
+    is_list_email = (
+        has_list_header
+        or body_signals >= 2
+        or subject_signals >= 1
+        or kb_category in _KB_BULK_CATEGORIES
+    )
+    # Under the coordinator, triage may already have classified the email as a newsletter
+    triaged_newsletter = False
+    if not is_list_email:
+        triage = await_fact("triage.classification")
+        triaged_newsletter = triage is not None and triage["category"] == "newsletter"
+        is_list_email = triaged_newsletter
 
     # Determine list type
     list_type = "unknown"
     if is_list_email:
-        if any(t in subject for t in ("newsletter", "digest", "roundup", "weekly", "monthly")):
+        if kb_category in _KB_LIST_TYPES:
+            list_type = _KB_LIST_TYPES[kb_category]
+        elif any(t in subject for t in ("newsletter", "digest", "roundup", "weekly", "monthly")):
             list_type = "newsletter"
         elif any(t in subject for t in ("sale", "offer", "% off", "promo", "deal")):
             list_type = "promotional"
@@ -91,38 +134,150 @@ def detect_list_email_node(state: UnsubscribeGraphState) -> dict[str, object]:
             list_type = "newsletter"
 
     return {
+        "list_headers": list_headers,
         "is_list_email": is_list_email,
         "list_type": list_type,
         "intent": "unsubscribe_detect",
-        "confidence": 0.95 if has_list_header else (0.8 if is_list_email else 0.7),
+        "confidence": 0.95
+        if has_list_header
+        else (0.75 if triaged_newsletter else (0.8 if is_list_email else 0.7)),
+    }
+
+
+def find_unsubscribe_url(list_headers: ListHeaders, body: str) -> str:
+    """Unsubscribe target: https List-Unsubscribe, then a body link, then mailto."""
+    # Header first (most reliable)
+    if list_headers.https_urls:
+        return list_headers.https_urls[0]
+
+    body_match = _UNSUBSCRIBE_URL_PATTERN.search(body)
+    if body_match:
+        return body_match.group(0)
+    return list_headers.mailto_urls[0] if list_headers.mailto_urls else ""
+
+
+def unsubscribe_targets(list_headers: ListHeaders, url: str) -> dict[str, str]:
+    """Execute-action payload fields for unsubscribing via ``url``."""
+    return {
+        "unsubscribeUrl": url,
+        # RFC 8058: POST "List-Unsubscribe=One-Click" to the URL, no page visit.
+        "oneClick": "true"
+        if list_headers.one_click and url == list_headers.https_urls[0]
+        else "false",
+        **(
+            {"unsubscribeMailto": list_headers.mailto_urls[0]}
+            if list_headers.mailto_urls
+            else {}
+        ),
     }
 
 
 def extract_unsubscribe_link_node(state: UnsubscribeGraphState) -> dict[str, object]:
-    """Extract unsubscribe URL from email body or headers."""
+    """Extract unsubscribe URL from the parsed List-Unsubscribe header or the body."""
     if not state["is_list_email"]:
         return {"unsubscribe_url": ""}
 
-    request = state["request"]
-    md = request.context.metadata
-    body = md.get("emailBody") or md.get("body", "")
-    headers = md.get("emailHeaders") or md.get("headers", "")
-
-    # Try header first (most reliable)
-    header_match = re.search(
-        r"list-unsubscribe:\s*<?(https?://[^\s>,<]+)>?",
-        headers,
-        re.IGNORECASE,
-    )
-    if header_match:
-        return {"unsubscribe_url": header_match.group(1)}
+    body = email_facts(state["request"]).body
+    list_headers = state["list_headers"] or EMPTY_LIST_HEADERS
+    return {"unsubscribe_url": find_unsubscribe_url(list_headers, body)}
 
-    # Try body
-    body_match = _UNSUBSCRIBE_URL_PATTERN.search(body)
-    if body_match:
-        return {"unsubscribe_url": body_match.group(0)}
 
-    return {"unsubscribe_url": ""}
+# "keep: <reason>" / "unsubscribe - <reason>"; anything else is not a verdict.
+_VERDICT = re.compile(r"^[\s'\"*]*(keep|unsubscribe)[\s'\"*]*(?:[:\-\u2014.]\s*(.*)|$)", re.DOTALL)
+
+
+def _heuristic_verdict(list_type: str) -> tuple[bool, str]:
+    """Keep-or-unsubscribe by list type when the LLM gives no usable verdict."""
+    note_fallback("unsubscribe_llm")
+    keep = list_type in ("transactional",)
+    reason = (
+        "Transactional emails are usually important to keep."
+        if keep
+        else "Promotional emails can usually be safely unsubscribed."
+    )
+    return keep, reason
+
+
+def _judge_subscription_value(
+    model_provider: BaseModelProvider,
+    list_type: str,
+    from_address: str,
+    subject: str,
+    cache_key: tuple[str, ...],
+    decision_key: DecisionKey | None,
+    list_id: str | None,
+) -> tuple[bool, str]:
+    """Ask the LLM keep-or-unsubscribe and cache the verdict for the template and list.
+
+    Only a recognised ``keep``/``unsubscribe`` answer is cached; an empty,
+    refused or ambiguous reply gets the uncached heuristic verdict.
+    """
+    system = (
+        "You are an email assistant helping users decide which subscriptions to keep. "
+        "Be practical and direct. Return ONLY: keep or unsubscribe, then a brief reason."
+    )
+    budgeted = fit_prompt(
+        "unsubscribe",
+        system,
+        [
+            PromptSection(
+                name="email",
+                text=subject,
+                priority=1,
+                min_tokens=16,
+                prefix=(
+                    f"Should the user keep this {list_type} subscription?\n"
+                    f"From: {from_address}\n"
+                    f"Subject: "
+                ),
+                suffix="\n\n",
+            ),
+            PromptSection(
+                name="instructions",
+                text=(
+                    "Reply with exactly: 'keep: <one sentence reason>' "
+                    "or 'unsubscribe: <one sentence reason>'"
+                ),
+                priority=9,
+            ),
+        ],
+    )
+
+    try:
+        raw = generate_budgeted(model_provider, budgeted, max_tokens=80).strip().lower()
+    except RuntimeError:
+        return _heuristic_verdict(list_type)
+
+    match = _VERDICT.match(raw)
+    if match is None:
+        return _heuristic_verdict(list_type)
+    keep = match.group(1) == "keep"
+    reason = (match.group(2) or "").strip() or (
+        "It looks worth keeping." if keep else "It does not look worth keeping."
+    )
+    template_outcome_cache.set(cache_key, {"keep": keep, "reason": reason})
+    list_decision_cache.set(decision_key, keep, reason)
+    sender_reputation.record(
+        "unsubscribe", from_address, "keep" if keep else "unsubscribe", list_id=list_id
+    )
+    return keep, reason
+
+
+def invalidate_sender_verdicts(sender: str) -> int:
+    """Forget every cached keep/unsubscribe verdict that could answer for ``sender``.
+
+    Covers each tier ``classify_value_node`` consults before the LLM: list
+    decisions, template outcomes and sender reputation. Returns the number
+    of entries dropped.
+    """
+    matches = owner_matcher(sender)
+    if matches is None:
+        return 0
+    dropped = list_decision_cache.invalidate_sender(sender)
+    dropped += template_outcome_cache.invalidate_where(
+        lambda key: key[0] == "unsubscribe" and matches(key[-1])
+    )
+    return dropped + sender_reputation.forget("unsubscribe", sender)
 
 
 def classify_value_node(
@@ -136,33 +291,52 @@ def classify_value_node(
             "assistant_text": "This email doesn't appear to be a newsletter or promotional email.",
         }
 
-    request = state["request"]
-    md = request.context.metadata
-    subject = md.get("emailSubject") or md.get("subject", "")
-    from_address = md.get("emailFrom") or md.get("from", "")
+    facts = email_facts(state["request"])
+    subject = facts.subject
+    from_address = facts.from_address
+    body = facts.body
     list_type = state["list_type"]
 
-    system = (
-        "You are an email assistant helping users decide which subscriptions to keep. "
-        "Be practical and direct. Return ONLY: keep or unsubscribe, then a brief reason."
+    # Same list judged before — its verdict covers every issue of the list
+    list_headers = state.get("list_headers") or EMPTY_LIST_HEADERS
+    decision_key = list_decision_cache.key(list_headers, from_address, list_type)
+    decision = list_decision_cache.get(decision_key)
+    # Same sender template judged before — reuse the verdict without an LLM call
+    cache_key = (
+        "unsubscribe",
+        template_fingerprint(from_address, subject, body),
+        list_type,
+        sender_owner(from_address),
     )
-    prompt = (
-        f"Should the user keep this {list_type} subscription?\n"
-        f"From: {from_address}\n"
-        f"Subject: {subject}\n\n"
-        f"Reply with exactly: 'keep: <one sentence reason>' or 'unsubscribe: <one sentence reason>'"
+    cached = None if decision else template_outcome_cache.get(cache_key)
+    # Reputation is per List-Id, or per exact address without one — never per domain
+    reputation = (
+        None
+        if decision or cached
+        else sender_reputation.verdict(
+            "unsubscribe", from_address, list_id=list_headers.list_id
+        )
     )
-
-    try:
-        raw = model_provider.generate(prompt, system=system, max_tokens=80).strip().lower()
-        keep = raw.startswith("keep")
-        reason = raw.split(":", 1)[-1].strip() if ":" in raw else raw
-    except RuntimeError:
-        keep = list_type in ("transactional",)
+    if decision is not None:
+        keep, reason = decision
+    elif cached is not None:
+        keep, reason = bool(cached["keep"]), str(cached["reason"])
+    elif reputation is not None:
+        keep = reputation[0] == "keep"
         reason = (
-            "Transactional emails are usually important to keep."
+            "Mail from this list has consistently been worth keeping."
             if keep
-            else "Promotional emails can usually be safely unsubscribed."
+            else "Mail from this list has consistently been judged not worth keeping."
+        )
+    else:
+        keep, reason = _judge_subscription_value(
+            model_provider,
+            list_type,
+            from_address,
+            subject,
+            cache_key,
+            decision_key,
+            list_headers.list_id,
         )
 
     url = state.get("unsubscribe_url", "")
@@ -195,6 +369,7 @@ def suggest_unsubscribe_actions_node(state: UnsubscribeGraphState) -> dict[str,
 
     if state["is_list_email"]:
         url = state.get("unsubscribe_url", "")
+        list_headers = state["list_headers"] or EMPTY_LIST_HEADERS
         if url and not state["keep_recommendation"]:
             actions.append(
                 SuggestedAction(
@@ -202,9 +377,9 @@ def suggest_unsubscribe_actions_node(state: UnsubscribeGraphState) -> dict[str,
                     label="Unsubscribe now",
                     payload={
                         "threadId": thread_id,
-                        "unsubscribeUrl": url,
                         "emailFrom": from_address,
                         "listType": state["list_type"],
+                        **unsubscribe_targets(list_headers, url),
                     },
                 )
             )
@@ -2,7 +2,9 @@
 
 from app.contracts.agent_request import AgentRequest
 from app.contracts.agent_response import AgentResponse
+from app.contracts.subscription_census import SubscriptionCensusResponse
 from app.core.model_provider import BaseModelProvider, RuleBasedModelProvider
+from app.skills.unsubscribe.census import SubscriptionCensus, classify_census
 from app.skills.unsubscribe.graph import build_unsubscribe_skill_graph
 
 
@@ -10,13 +12,15 @@ class UnsubscribeSkill:
     """Detects promotional/newsletter emails and helps users unsubscribe intelligently."""
 
     def __init__(self, model_provider: BaseModelProvider | None = None) -> None:
-        self._graph = build_unsubscribe_skill_graph(model_provider or RuleBasedModelProvider())
+        self._model_provider = model_provider or RuleBasedModelProvider()
+        self._graph = build_unsubscribe_skill_graph(self._model_provider)
 
     def run(self, request: AgentRequest) -> AgentResponse:
         """Execute unsubscribe graph and return subscription management response."""
         state = self._graph.invoke(
             {
                 "request": request,
+                "list_headers": None,
                 "is_list_email": False,
                 "list_type": "unknown",
                 "unsubscribe_url": "",
@@ -43,3 +47,9 @@ class UnsubscribeSkill:
             },
             safetyFlags=state["safety_flags"],
         )
+
+    def run_census(
+        self, request_id: str, census: SubscriptionCensus
+    ) -> SubscriptionCensusResponse:
+        """Classify each distinct list of a consumed census stream once."""
+        return classify_census(request_id, census, self._model_provider)
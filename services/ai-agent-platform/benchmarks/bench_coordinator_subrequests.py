@@ -0,0 +1,84 @@
+"""Per-request cost of building coordinator sub-requests, validated vs trusted copy.
+
+Run from ``services/ai-agent-platform``::
+
+    python -m benchmarks.bench_coordinator_subrequests
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+from app.contracts.agent_request import AgentContext, AgentRequest
+
+_SKILLS = ("triage", "summarize", "followup", "unsubscribe")
+
+
+def _request() -> AgentRequest:
+    thread = [
+        {"from": f"person{i}@corp.example", "date": "2026-10-0{i % 9 + 1}", "body": "Status update. " * 60}
+        for i in range(12)
+    ]
+    return AgentRequest(
+        skill="coordinator",
+        requestId="bench-coordinator-0001",
+        messages=[
+            {"role": "user" if i % 2 == 0 else "assistant", "content": f"Turn {i}: " + "context " * 80}
+            for i in range(20)
+        ],
+        context={
+            "surface": "web",
+            "metadata": {
+                "threadId": "t-bench",
+                "emailSubject": "Quarterly plan review",
+                "emailFrom": "lead@corp.example",
+                "emailBody": "Please review the attached plan before Friday. " * 100,
+                "emailHeaders": "List-Id: <updates.corp.example>\nList-Unsubscribe: <https://corp.example/u>",
+                "threadMessages": json.dumps(thread),
+            },
+        },
+        allowedActions=["triage.apply_label", "followup.draft", "unsubscribe.execute"],
+    )
+
+
+def _validated(request: AgentRequest, skill: str) -> AgentRequest:
+    """The coordinator's previous construction: a fully re-validated request."""
+    return AgentRequest(
+        version="v1",
+        skill=skill,
+        requestId=f"{request.requestId}:{skill}",
+        messages=request.messages,
+        context=AgentContext(
+            surface=request.context.surface,
+            locale=request.context.locale,
+            email=request.context.email,
+            metadata=request.context.metadata,
+        ),
+        allowedActions=request.allowedActions,
+    )
+
+
+def _trusted(request: AgentRequest, skill: str) -> AgentRequest:
+    return request.for_skill(skill, f"{request.requestId}:{skill}")
+
+
+def _per_request_us(build, request: AgentRequest, rounds: int) -> float:  # type: ignore[no-untyped-def]
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for skill in _SKILLS:
+            build(request, skill)
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def main() -> None:
+    request = _request()
+    rounds = 5000
+    before = _per_request_us(_validated, request, rounds)
+    after = _per_request_us(_trusted, request, rounds)
+    print(f"validated sub-requests: {before:,.1f} us per coordinator request ({len(_SKILLS)} skills)")
+    print(f"trusted copies:         {after:,.1f} us per coordinator request ({before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
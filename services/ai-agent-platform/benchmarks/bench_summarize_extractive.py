@@ -0,0 +1,64 @@
+"""Latency and prompt-token reduction of the extractive pre-summarizer.
+
+Run from ``services/ai-agent-platform``::
+
+    python -m benchmarks.bench_summarize_extractive
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from app.core.prompt_budget import estimate_tokens
+from app.skills.summarize.extractive import extractive_summary, shrink_text
+
+_SUBJECTS = "renewal budget launch migration hiring audit roadmap incident".split()
+_VERBS = "reviewed blocked approved delayed scoped estimated flagged shipped".split()
+_OBJECTS = (
+    "the vendor contract|the staging rollout|the quarterly budget|the security review|"
+    "the pricing clause|the onboarding plan|the database migration|the launch checklist"
+).split("|")
+
+
+def _message(rng: random.Random, sentences: int) -> str:
+    lines = []
+    for _ in range(sentences):
+        lines.append(
+            f"{rng.choice(['Legal', 'Finance', 'Ops', 'The team', 'Priya', 'Alex'])} "
+            f"{rng.choice(_VERBS)} {rng.choice(_OBJECTS)} for the {rng.choice(_SUBJECTS)}."
+        )
+    if rng.random() < 0.3:
+        lines.append(f"Please send {rng.choice(_OBJECTS)} by Friday.")
+    return " ".join(lines)
+
+
+def main() -> None:
+    rng = random.Random(11)
+    threads = [[_message(rng, rng.randint(8, 30)) for _ in range(40)] for _ in range(50)]
+    budget = 250
+
+    raw_tokens = shrunk_tokens = 0
+    started = time.perf_counter()
+    for thread in threads:
+        for body in thread:
+            raw_tokens += estimate_tokens(body)
+            shrunk_tokens += estimate_tokens(shrink_text(body, budget))
+    shrink_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for thread in threads:
+        extractive_summary("\n".join(thread))
+    summary_sec = time.perf_counter() - started
+
+    messages = sum(len(thread) for thread in threads)
+    print(f"shrink:  {shrink_sec / messages * 1000:.2f} ms/message (budget {budget} tokens)")
+    print(
+        f"prompt tokens: {raw_tokens:,} -> {shrunk_tokens:,} "
+        f"({1 - shrunk_tokens / raw_tokens:.0%} reduction over {messages} messages)"
+    )
+    print(f"extractive summary: {summary_sec / len(threads) * 1000:.1f} ms/thread (40 messages)")
+
+
+if __name__ == "__main__":
+    main()
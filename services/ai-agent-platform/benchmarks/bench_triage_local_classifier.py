@@ -0,0 +1,61 @@
+"""Throughput benchmark for the local triage classifier batch inference path.
+
+Run from ``services/ai-agent-platform``::
+
+    python -m benchmarks.bench_triage_local_classifier
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from app.skills.triage.local_classifier import train_local_classifier
+
+_VOCAB = (
+    "meeting review invoice payment shipped order project deadline update team "
+    "report budget contract photos weekend family dinner offer sale newsletter "
+    "account security alert password login friend party schedule travel"
+).split()
+
+
+def _email(rng: random.Random) -> tuple[str, str, str]:
+    subject = " ".join(rng.choices(_VOCAB, k=6))
+    body = " ".join(rng.choices(_VOCAB, k=220))
+    sender = f"user{rng.randint(0, 500)}@{rng.choice(['acme.io', 'shop.com', 'mail.net'])}"
+    return subject, sender, body
+
+
+def main() -> None:
+    rng = random.Random(7)
+    records = []
+    for _ in range(2000):
+        subject, sender, body = _email(rng)
+        records.append(
+            {
+                "subject": subject,
+                "from": sender,
+                "body": body,
+                "category": rng.choice(["work", "personal", "newsletter"]),
+                "priority": rng.choice(["high", "normal", "low"]),
+                "requires_reply": rng.random() < 0.3,
+            }
+        )
+    classifier = train_local_classifier(records, epochs=5)
+
+    emails = [_email(rng) for _ in range(10_000)]
+    started = time.perf_counter()
+    classifier.predict_batch(emails)
+    batch_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for email in emails[:1000]:
+        classifier.predict(*email)
+    single_sec = time.perf_counter() - started
+
+    print(f"batch:  {len(emails) / batch_sec:,.0f} emails/sec ({len(emails)} emails, ~230 words each)")
+    print(f"single: {1000 / single_sec:,.0f} emails/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Per-request blackboard tests."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.contracts.agent_request import AgentRequest
+from app.core.blackboard import Blackboard
+from app.core.model_provider import BaseModelProvider
+from app.core.skill_registry import SkillRegistry
+from app.skills.coordinator.graph import dispatch_skills_node
+from app.skills.followup.skill import FollowupSkill
+from app.skills.triage.skill import TriageSkill
+from app.skills.unsubscribe.skill import UnsubscribeSkill
+
+
+class _Provider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        self.prompts.append(system)
+        if "classification" in system:
+            time.sleep(0.1)  # dependents must not start before triage settles
+            return '{"category": "newsletter", "priority": "urgent", "requires_reply": false}'
+        return "unsubscribe: rarely read."
+
+
+def test_shared_fact_is_computed_once_across_threads() -> None:
+    blackboard = Blackboard()
+    calls: list[int] = []
+    lock = threading.Lock()
+
+    def compute() -> str:
+        with lock:
+            calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        values = list(pool.map(lambda _: blackboard.get_or_compute("k", compute), range(4)))
+
+    assert values == ["value"] * 4 and len(calls) == 1
+    assert blackboard.stats() == {"facts": 1, "hits": 3, "computes": 1}
+    # Undeclared outcomes are not waited for; abandoned ones release readers.
+    assert blackboard.wait_for("missing", timeout=5) is None
+    declared = Blackboard(expected=("triage.classification",))
+    declared.abandon("triage.classification")
+    assert declared.wait_for("triage.classification", timeout=5) is None
+
+
+def test_sub_skills_reuse_triage_verdict() -> None:
+    provider = _Provider()
+    registry = SkillRegistry()
+    registry._cache["triage"] = TriageSkill(provider)
+    registry._cache["followup"] = FollowupSkill(provider)
+    registry._cache["unsubscribe"] = UnsubscribeSkill(provider)
+    request = AgentRequest(
+        skill="coordinator",
+        requestId="bb-1",
+        messages=[{"role": "user", "content": "handle all"}],
+        context={
+            "metadata": {
+                "threadId": "t-bb",
+                "emailSubject": "Thoughts from the field",
+                "emailFrom": "editor@blackboard-test.example",
+                "emailBody": "A few notes on what we saw this quarter.",
+                "daysUnanswered": "1",
+            }
+        },
+    )
+
+    state = dispatch_skills_node(
+        {"request": request, "routed_skills": ["triage", "followup", "unsubscribe"]},  # type: ignore[typeddict-item]
+        registry,
+    )
+
+    triage, followup, unsubscribe = state["sub_responses"]
+    assert triage.skill == "triage"
+    # Triage's "urgent" makes one unanswered day stale (the default threshold is 3 days).
+    assert followup.assistantText.startswith("No reply received in 1 day")
+    # Triage's "newsletter" answers unsubscribe's list-email question.
+    assert "doesn't appear to be a newsletter" not in unsubscribe.assistantText
+    assert sum("classification" in p for p in provider.prompts) == 1
+    assert state["shared_facts"]["hits"] >= 2
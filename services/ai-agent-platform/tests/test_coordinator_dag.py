@@ -0,0 +1,90 @@
+"""Coordinator dependency DAG tests."""
+
+import time
+
+from app.contracts.agent_request import AgentRequest
+from app.core.agent_trace import AgentTrace, current_trace
+from app.core.model_provider import BaseModelProvider
+from app.core.skill_registry import SkillRegistry
+from app.skills.coordinator.graph import critical_path, dispatch_skills_node, execution_plan
+from app.skills.followup.skill import FollowupSkill
+from app.skills.summarize.skill import SummarizeSkill
+from app.skills.triage.skill import TriageSkill
+
+
+class _Provider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.started: dict[str, float] = {}
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        if "classification" in system:
+            time.sleep(0.15)
+            return '{"category": "work", "priority": "high", "requires_reply": true}'
+        self.started.setdefault("other", time.monotonic())
+        return '{"summary": "Plan review.", "key_points": []}'
+
+
+def test_execution_plan_keeps_only_routed_dependencies() -> None:
+    assert execution_plan(["followup", "summarize"]) == {"followup": (), "summarize": ()}
+    plan = execution_plan(["triage", "followup", "unsubscribe"])
+    assert plan == {"triage": (), "followup": ("triage",), "unsubscribe": ()}
+    settled = {"triage": 150.0, "followup": 170.0, "unsubscribe": 160.0}
+    assert critical_path(plan, settled) == ["triage", "followup"]
+    assert critical_path(plan, {**settled, "unsubscribe": 180.0}) == ["unsubscribe"]
+    assert critical_path(plan, {}) == []
+
+
+def test_dependent_skill_starts_after_upstream_and_path_is_traced() -> None:
+    provider = _Provider()
+    registry = SkillRegistry()
+    registry._cache["triage"] = TriageSkill(provider)
+    registry._cache["summarize"] = SummarizeSkill(provider)
+    registry._cache["followup"] = FollowupSkill(provider)
+    request = AgentRequest(
+        skill="coordinator",
+        requestId="dag-1",
+        messages=[{"role": "user", "content": "handle all"}],
+        context={
+            "metadata": {
+                "threadId": "t-dag",
+                "emailSubject": "Plan review",
+                "emailFrom": "pm@dag-test.example",
+                "emailBody": "Can you look over the plan before Thursday?",
+                "daysUnanswered": "2",
+            }
+        },
+    )
+    trace = AgentTrace(trace_id="dag-1", skill="coordinator")
+    token = current_trace.set(trace)
+    started = time.monotonic()
+    try:
+        state = dispatch_skills_node(
+            {"request": request, "routed_skills": ["triage", "summarize", "followup"]},  # type: ignore[typeddict-item]
+            registry,
+        )
+    finally:
+        current_trace.reset(token)
+
+    # Summarize is independent and does not wait for triage.
+    assert provider.started["other"] - started < 0.1
+    followup = state["sub_responses"][2]
+    # Triage's "high" (2-day threshold) reached followup; "normal" would need 3 days.
+    assert followup.assistantText.startswith("No reply received in 2 days")
+    assert state["critical_path"] == ["triage", "followup"]
+    assert trace.to_dict()["criticalPath"] == state["critical_path"]
+
+
+def test_sub_request_shares_validated_fields() -> None:
+    request = AgentRequest(
+        skill="coordinator",
+        requestId="sub-1",
+        sessionId="s-1",
+        messages=[{"role": "user", "content": "handle all"}],
+        context={"metadata": {"threadId": "t-1"}},
+        allowedActions=["followup.draft"],
+    )
+    sub = request.for_skill("followup", "sub-1:followup")
+
+    assert (sub.skill, sub.requestId, sub.sessionId) == ("followup", "sub-1:followup", None)
+    assert sub.messages is request.messages and sub.context is request.context
+    assert request.skill == "coordinator"
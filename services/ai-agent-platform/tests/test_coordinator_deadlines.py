@@ -0,0 +1,78 @@
+"""Coordinator per-sub-skill deadline tests."""
+
+import threading
+import time
+
+import pytest
+
+from app.config.settings import settings
+from app.contracts.agent_request import AgentRequest
+from app.core.deadline import Deadline, DeadlineExceeded, check_deadline, current_deadline
+from app.core.model_provider import BaseModelProvider
+from app.core.skill_registry import SkillRegistry
+from app.skills.coordinator.graph import coordinator_skill_stats
+from app.skills.coordinator.skill import CoordinatorSkill
+from app.skills.summarize.skill import SummarizeSkill
+
+
+class _SlowProvider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+        self.finished = threading.Event()
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        self.calls += 1
+        time.sleep(0.4)
+        self.finished.set()
+        return '{"summary": "late"}'
+
+
+def test_slow_sub_skill_times_out_and_partial_results_are_kept(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "coordinator_skill_deadlines_ms", {"summarize": 100})
+    coordinator_skill_stats.clear()
+    provider = _SlowProvider()
+    registry = SkillRegistry()
+    registry._cache["summarize"] = SummarizeSkill(provider)
+    request = AgentRequest(
+        skill="coordinator",
+        requestId="coord-1",
+        messages=[{"role": "user", "content": "triage and summarize this thread"}],
+        context={
+            "metadata": {
+                "threadId": "t-1",
+                "emailSubject": "Quarterly planning",
+                "emailFrom": "lead@corp.example",
+                "emailBody": "We need the revised plan by Friday. Please review the budget.",
+            }
+        },
+    )
+
+    started = time.monotonic()
+    response = CoordinatorSkill(registry=registry).run(request)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.35
+    assert response.uiHints["partial"] == "true"
+    assert response.uiHints["timedOutSkills"] == "summarize"
+    assert response.uiHints["completedSkills"] == "triage"
+    assert response.safetyFlags[0].code == "partial_results"
+    stats = coordinator_skill_stats.snapshot()
+    assert stats["summarize"]["timedOut"] == 1 and stats["triage"]["completed"] == 1
+    # The straggler is not waited for, and stops at its next model call.
+    assert provider.finished.wait(1.0)
+    time.sleep(0.05)
+    assert provider.calls == 1
+
+
+def test_check_deadline_raises_once_cancelled() -> None:
+    deadline = Deadline(60)
+    token = current_deadline.set(deadline)
+    try:
+        check_deadline()
+        deadline.cancel()
+        with pytest.raises(DeadlineExceeded):
+            check_deadline()
+    finally:
+        current_deadline.reset(token)
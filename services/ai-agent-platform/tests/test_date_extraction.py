@@ -0,0 +1,108 @@
+"""Rule-based date and deadline extraction tests."""
+
+import json
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from app.contracts.agent_request import AgentRequest
+from app.core.date_extraction import extract_dates, extract_deadlines, parse_email_date
+from app.skills.followup.graph import _get_days_unanswered
+from app.skills.summarize.skill import SummarizeSkill
+
+# A Monday
+_REFERENCE = date(2026, 10, 19)
+
+
+def test_relative_and_absolute_dates_resolve_against_reference() -> None:
+    text = (
+        "Send the deck by Friday. Kickoff is on 5th Nov, launch 2026-12-01, "
+        "review in 2 weeks and the retro at the end of the month. Call at 10.30 tomorrow."
+    )
+
+    found = {d.text: d.date for d in extract_dates(text, _REFERENCE)}
+
+    assert found == {
+        "by Friday": date(2026, 10, 23),
+        "5th Nov": date(2026, 11, 5),
+        "2026-12-01": date(2026, 12, 1),
+        "in 2 weeks": date(2026, 11, 2),
+        "end of the month": date(2026, 10, 31),
+        "tomorrow": date(2026, 10, 20),
+    }
+    assert [d.text for d in extract_deadlines(text, _REFERENCE)] == ["by Friday"]
+
+
+def test_numeric_dates_follow_locale_and_yearless_dates_roll_forward() -> None:
+    assert extract_dates("due 02/11/2026", _REFERENCE)[0].date == date(2026, 11, 2)
+    assert extract_dates("due 02/11/2026", _REFERENCE, "en-US")[0].date == date(2026, 2, 11)
+    assert extract_dates("before Jan 5", date(2026, 12, 20))[0].date == date(2027, 1, 5)
+
+
+def test_dates_past_the_calendar_range_are_dropped() -> None:
+    last_day = date.max
+    for text in ("send it by tomorrow", "in 3 months", "end of month", "next week"):
+        assert extract_dates(text, last_day) == []
+    assert extract_dates("Friday", last_day)[0].date == last_day
+
+
+def test_modal_may_is_not_a_month() -> None:
+    for text in ("Those 2 may want to join", "You may 5x the budget", "you may want to review it"):
+        assert extract_dates(text, _REFERENCE) == [], text
+    found = {
+        d.text: d.date
+        for d in extract_dates(
+            "Sign by May 5, draft on 3 may, vote on the 7th of may, close 9 may 2027.", _REFERENCE
+        )
+    }
+    assert found == {
+        "by May 5": date(2026, 5, 5),
+        "3 may": date(2026, 5, 3),
+        "7th of may": date(2026, 5, 7),
+        "9 may 2027": date(2027, 5, 9),
+    }
+
+
+def test_parse_email_date_formats_and_followup_uses_them() -> None:
+    sent = datetime.now(tz=timezone.utc) - timedelta(days=4, hours=1)
+    assert parse_email_date("2026-10-19T10:00:00Z") == datetime(2026, 10, 19, 10, tzinfo=timezone.utc)
+    assert parse_email_date(str(int(sent.timestamp() * 1000))).date() == sent.date()
+    assert parse_email_date("not a date") is None
+    assert parse_email_date("99999999999999999999") is None
+    assert parse_email_date("9" * 400) is None
+
+    request = AgentRequest(
+        skill="followup",
+        requestId="fu-1",
+        messages=[{"role": "user", "content": "follow up"}],
+        context={"metadata": {"sentAt": format_datetime(sent)}},
+    )
+    assert _get_days_unanswered(request) == 4
+
+
+def test_summarize_reports_deadline_and_reminder_date_without_llm() -> None:
+    request = AgentRequest(
+        skill="summarize",
+        requestId="sum-deadline",
+        messages=[{"role": "user", "content": "summarize"}],
+        context={
+            "metadata": {
+                "subject": "Contract renewal",
+                "threadMessages": json.dumps(
+                    [
+                        {
+                            "id": "d1",
+                            "from": "legal@corp.example",
+                            "date": "2026-10-19T09:00:00Z",
+                            "body": "Legal needs the signed renewal contract by Thursday at the latest.",
+                        }
+                    ]
+                ),
+            }
+        },
+    )
+
+    response = SummarizeSkill().run(request)
+
+    reminder = next(a for a in response.suggestedActions if a.name == "summarize.set_reminder")
+    assert reminder.payload["dueDate"] == "2026-10-22"
+    assert reminder.payload["deadline"] == "by Thursday (2026-10-22)"
@@ -0,0 +1,67 @@
+"""Digest skill tests."""
+
+import json
+
+from app.contracts.agent_request import AgentRequest
+from app.core.agent_runtime import AgentRuntime
+
+
+def _digest_request(threads: list[dict[str, object]]) -> AgentRequest:
+    return AgentRequest(
+        skill="digest",
+        requestId="digest-1",
+        messages=[{"role": "user", "content": "morning digest"}],
+        context={"metadata": {"digestThreads": json.dumps(threads)}},
+    )
+
+
+def test_digest_ranks_threads_by_priority_in_one_response() -> None:
+    threads = [
+        {
+            "threadId": "t-news",
+            "subject": "Weekly newsletter",
+            "from": "news@letters.example",
+            "date": "2026-10-19T07:00:00Z",
+            "body": "This week in tech. Unsubscribe at any time.",
+        },
+        {
+            "threadId": "t-outage",
+            "subject": "URGENT: production outage",
+            "priority": "urgent",
+            "date": "2026-10-18T23:00:00Z",
+            "messages": [
+                {"id": "o1", "from": "oncall@corp.example", "body": "The API is down."},
+                {"id": "o2", "from": "cto@corp.example", "body": "Status update by tomorrow."},
+            ],
+        },
+        {"threadId": "t-known", "subject": "Budget", "priority": "high", "body": "Budget review."},
+    ]
+
+    response = AgentRuntime().respond(_digest_request(threads))
+
+    assert response.skill == "digest"
+    assert response.uiHints["threadCount"] == "3"
+    assert response.uiHints["rankedThreadIds"].split(",")[0] == "t-outage"
+    assert response.uiHints["rankedThreadIds"].split(",")[-1] == "t-news"
+    assert response.assistantText.startswith("Your digest: 3 threads")
+    assert [a.payload["threadId"] for a in response.suggestedActions][0] == "t-outage"
+
+
+def test_digest_without_threads_is_empty() -> None:
+    response = AgentRuntime().respond(_digest_request([]))
+
+    assert response.intent == "digest_empty"
+    assert response.uiHints["threadCount"] == "0"
+
+
+def test_digest_handles_thread_ids_past_the_request_id_limit() -> None:
+    long_id = "t-" + "x" * 140
+    threads = [
+        {"threadId": long_id, "subject": "Roadmap", "body": "Please review the roadmap."},
+        {"threadId": "t-short", "subject": "Lunch", "priority": "low", "body": "Lunch Friday?"},
+    ]
+
+    response = AgentRuntime().respond(_digest_request(threads))
+
+    assert response.uiHints["threadCount"] == "2"
+    assert set(response.uiHints["rankedThreadIds"].split(",")) == {long_id, "t-short"}
@@ -0,0 +1,96 @@
+"""Bulk followup scan tests."""
+
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from app.contracts.followup_scan import FollowupScanRequest
+from app.core.model_provider import BaseModelProvider
+from app.skills.followup import scan as scan_module
+from app.skills.followup.scan import parse_sent_at
+from app.skills.followup.skill import FollowupSkill
+
+
+class _DraftProvider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        with self._lock:
+            self.calls += 1
+        return "Hi, just following up."
+
+
+def test_parse_sent_at_mixed_formats() -> None:
+    parsed = parse_sent_at(
+        ["2026-10-10T09:00:00Z", "Sat, 10 Oct 2026 09:00:00 +0000", "1791622800", "not a date"]
+    )
+    expected = datetime(2026, 10, 10, 9, tzinfo=timezone.utc).timestamp()
+    assert [int(v.astype("int64")) for v in parsed[:3]] == [int(expected)] * 3
+    assert str(parsed[3]) == "NaT"
+
+    # An ISO-shaped but invalid value only marks its own row.
+    parsed = parse_sent_at(["2026-13-45T00:00:00Z", "2026-10-10T09:00:00"])
+    assert str(parsed[0]) == "NaT" and int(parsed[1].astype("int64")) == int(expected)
+
+
+def test_scan_ranks_stale_threads_and_drafts_only_top_n() -> None:
+    threads = [
+        {"threadId": "fresh", "sentAt": "2026-10-18T09:00:00Z", "priority": "normal"},
+        {"threadId": "low-old", "sentAt": "2026-10-09T09:00:00Z", "priority": "low"},
+        {"threadId": "urgent", "sentAt": "2026-10-10T09:00:00Z", "priority": "urgent"},
+        {"threadId": "normal", "sentAt": "Mon, 12 Oct 2026 09:00:00 +0000"},
+        {"threadId": "broken", "sentAt": "yesterday-ish", "priority": "urgent"},
+    ] + [
+        {"threadId": f"bulk-{i}", "sentAt": "2026-10-15T09:00:00", "priority": "high"}
+        for i in range(200)
+    ]
+    provider = _DraftProvider()
+    response = FollowupSkill(model_provider=provider).run_scan(
+        FollowupScanRequest(
+            requestId="scan-1", threads=threads, topN=3, now="2026-10-19T10:00:00Z"
+        )
+    )
+
+    assert [r.threadId for r in response.results] == ["urgent", "normal", "bulk-0"]
+    assert response.results[0].daysUnanswered == 9
+    assert response.results[0].urgencyScore == 1.0
+    assert all(r.draft for r in response.results)
+    # Routine nudges are filled from the template bank without a model call.
+    assert provider.calls == 0
+    assert response.stats == {
+        "scanned": 205,
+        "unparseableSentAt": 1,
+        "stale": 203,
+        "returned": 3,
+        "drafted": 3,
+        "draftFailed": 0,
+    }
+
+
+def test_scan_bounds_sub_request_ids_and_isolates_failed_drafts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    draft_node = scan_module.draft_followup_node
+
+    def flaky(state, model_provider):  # type: ignore[no-untyped-def]
+        if state["request"].context.metadata["threadId"] == "t-broken":
+            raise ValueError("bad thread")
+        return draft_node(state, model_provider)
+
+    monkeypatch.setattr(scan_module, "draft_followup_node", flaky)
+    threads = [
+        {"threadId": "t" * 40, "sentAt": "2026-10-01T09:00:00Z", "priority": "urgent"},
+        {"threadId": "t-broken", "sentAt": "2026-10-02T09:00:00Z", "priority": "urgent"},
+    ]
+    response = FollowupSkill(model_provider=_DraftProvider()).run_scan(
+        FollowupScanRequest(
+            requestId="r" * 100, threads=threads, topN=2, now="2026-10-19T10:00:00Z"
+        )
+    )
+
+    assert [r.threadId for r in response.results] == ["t" * 40, "t-broken"]
+    assert response.results[0].draft and response.results[1].draft is None
+    assert response.stats["drafted"] == 1 and response.stats["draftFailed"] == 1
@@ -0,0 +1,111 @@
+"""Followup draft template bank tests."""
+
+import threading
+
+from app.contracts.agent_request import AgentRequest
+from app.core.model_provider import BaseModelProvider
+from app.skills.followup.skill import FollowupSkill
+from app.skills.followup.templates import (
+    FollowupTemplateStats,
+    bespoke_reason,
+    recipient_name,
+    render_template,
+)
+
+
+class _CountingProvider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        with self._lock:
+            self.prompts.append(prompt)
+        return "Hi Priya, could you confirm the revised invoice total?"
+
+
+def _request(message: str, locale: str = "en-IN", **metadata: str) -> AgentRequest:
+    return AgentRequest(
+        skill="followup",
+        requestId="fu-1",
+        messages=[{"role": "user", "content": message}],
+        context={
+            "locale": locale,
+            "metadata": {
+                "threadId": "t-1",
+                "emailSubject": "Q3 invoice",
+                "emailTo": "Priya Shah <priya@acme.example>",
+                "daysUnanswered": "5",
+                **metadata,
+            },
+        },
+    )
+
+
+def _draft(response) -> str:  # noqa: ANN001
+    action = next(a for a in response.suggestedActions if a.name == "followup.schedule_send")
+    return action.payload["draft"]
+
+
+def test_render_template_fills_slots_by_locale_tone_and_bucket() -> None:
+    english = render_template("en-US", "normal", 5, "Q3 invoice", "priya.shah@acme.example")
+    assert english.startswith("Hi Priya,")
+    assert "Q3 invoice" in english and "5 days ago" in english
+    firm = render_template("en-IN", "urgent", 1, "Outage report", "")
+    assert firm.startswith("Hi,") and "time-sensitive" in firm
+    assert render_template("es-MX", "low", 20, "Contrato", "").startswith("Hola,")
+    assert recipient_name('"Shah, Priya" <p@x.example>') == "Priya"
+    assert recipient_name('"Shah," <p@x.example>') == ""
+    assert recipient_name("ops-team+1@x.example") == ""
+
+
+def test_routine_followups_skip_the_llm_and_bespoke_ones_use_it() -> None:
+    provider = _CountingProvider()
+    skill = FollowupSkill(model_provider=provider)
+
+    routine = skill.run(_request("Draft a polite follow-up"))
+    assert routine.uiHints["draftSource"] == "template"
+    assert _draft(routine).startswith("Hi Priya,")
+    assert provider.prompts == []
+
+    bespoke = skill.run(_request("Follow up and ask whether the revised total is approved"))
+    assert bespoke.uiHints["draftSource"] == "llm"
+    assert "revised total is approved" in provider.prompts[-1]
+
+    skill.run(_request("Draft a follow-up", locale="ja-JP"))
+    assert len(provider.prompts) == 2
+
+
+def test_realistic_generic_asks_use_templates() -> None:
+    for ask in (
+        "Can you send them a quick follow-up on this thread, please?",
+        "Follow up on this",
+        "Please remind them about this email",
+        "Ping them again",
+        "Write a gentle reminder email",
+        "follow up if they haven’t replied yet",
+        "Chase this up",
+    ):
+        assert bespoke_reason("en-US", ask) is None, ask
+    for ask in (
+        "Follow up and mention we need it by Friday",
+        "Remind them the contract expires next week",
+        "Please thank them for the call",
+    ):
+        assert bespoke_reason("en-US", ask) == "instructions", ask
+
+
+def test_bespoke_reason_and_hit_rate() -> None:
+    assert bespoke_reason("en-GB", "nudge") is None
+    assert bespoke_reason("pt-BR", "") == "locale"
+    assert bespoke_reason("fr-FR", "Mention the signed contract") == "instructions"
+
+    stats = FollowupTemplateStats()
+    for reason in (None, None, None, "instructions"):
+        stats.record(reason)
+    assert stats.snapshot() == {
+        "templateDrafts": 3,
+        "llmDrafts": 1,
+        "llmReasons": {"instructions": 1},
+        "hitRate": 0.75,
+    }
@@ -0,0 +1,56 @@
+"""Inbox conversation compaction tests."""
+
+from app.core.model_provider import BaseModelProvider
+from app.core.prompt_budget import estimate_tokens
+from app.skills.inbox.compaction import compact_conversation, conversation_summary_cache
+
+
+class _SummaryProvider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.folded: list[int] = []
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        new_messages = prompt.split("New messages:\n", 1)[1].split("\n\n", 1)[0]
+        self.folded.append(len(new_messages.splitlines()))
+        return f"summary after {sum(self.folded)} messages"
+
+
+def _lines(count: int) -> list[str]:
+    roles = ("USER", "ASSISTANT")
+    return [f"{roles[i % 2]}: message {i} about the offsite venue and budget" for i in range(count)]
+
+
+def test_compaction_refreshes_once_per_block_and_stays_flat() -> None:
+    conversation_summary_cache.clear()
+    provider = _SummaryProvider()
+
+    sizes = []
+    for count in range(1, 61):
+        context = compact_conversation(_lines(count), provider)
+        sizes.append(estimate_tokens(context))
+
+    # 60 messages, 6 kept verbatim: 6 blocks of 8 summarized, each folded in once.
+    assert provider.folded == [8] * 6
+    assert context.startswith("[Summary of 48 earlier messages] summary after 48 messages")
+    assert context.endswith("ASSISTANT: message 59 about the offsite venue and budget")
+    assert max(sizes[20:]) <= max(sizes[:20]) + 20
+
+    # An edited early message changes the prefix digest and forces a refresh.
+    edited = _lines(60)
+    edited[0] = "USER: a different opening"
+    compact_conversation(edited, provider)
+    assert provider.folded[-1] == 48
+
+
+def test_session_history_keys_survive_dropped_lines() -> None:
+    conversation_summary_cache.clear()
+    provider = _SummaryProvider()
+    compact_conversation(_lines(40), provider, start=0, history_key="s1:abc")
+    calls = len(provider.folded)
+
+    # 8 more messages arrived and the session dropped its first 8 lines: only the
+    # next block is folded into the stored summary.
+    context = compact_conversation(_lines(48)[8:], provider, start=8, history_key="s1:abc")
+    assert len(provider.folded) == calls + 1
+    assert provider.folded[-1] == 8
+    assert context.startswith("[Summary of 40 earlier messages]")
@@ -0,0 +1,137 @@
+"""Per-list unsubscribe decision cache tests."""
+
+from fastapi.testclient import TestClient
+
+from app.contracts.agent_request import AgentRequest
+from app.core.list_headers import EMPTY_LIST_HEADERS
+from app.core.model_provider import BaseModelProvider
+from app.core.sender_reputation import sender_reputation
+from app.core.template_fingerprint import template_outcome_cache
+from app.main import app
+from app.skills.unsubscribe.decision_cache import list_decision_cache
+from app.skills.unsubscribe.skill import UnsubscribeSkill
+
+
+class _VerdictProvider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        self.calls += 1
+        return "unsubscribe: you never open these."
+
+
+def _issue(number: int) -> AgentRequest:
+    # Every issue has a different subject and body, so template fingerprints differ.
+    return AgentRequest(
+        skill="unsubscribe",
+        requestId=f"issue-{number}",
+        messages=[{"role": "user", "content": "keep this?"}],
+        context={
+            "metadata": {
+                "emailFrom": "editor@dispatch.example",
+                "emailSubject": f"Weekly newsletter: {['AI', 'chips', 'space'][number]} edition",
+                "emailBody": f"Stories about {['models', 'fabs', 'rockets'][number]} this week.",
+                "emailHeaders": (
+                    "List-Id: <weekly.dispatch.example>\n"
+                    "List-Unsubscribe: <https://dispatch.example/u/1>"
+                ),
+            }
+        },
+    )
+
+
+def test_repeated_list_mail_costs_one_llm_call_until_invalidated() -> None:
+    template_outcome_cache.clear()
+    sender_reputation.clear()
+    list_decision_cache.clear()
+    provider = _VerdictProvider()
+    skill = UnsubscribeSkill(model_provider=provider)
+
+    responses = [skill.run(_issue(n)) for n in range(3)]
+
+    assert provider.calls == 1
+    assert all("never open these" in r.assistantText.lower() for r in responses)
+    stats = list_decision_cache.stats()
+    assert stats["hits"] == 2 and stats["size"] == 1
+
+    invalidated = TestClient(app).post(
+        "/v1/agent/unsubscribe/decisions/invalidate", json={"sender": "dispatch.example"}
+    )
+    # The list decision, the first issue's template outcome and the list's
+    # reputation history all go, so the next issue asks the LLM again.
+    assert invalidated.json()["invalidated"] == 3
+    skill.run(_issue(0))
+    assert provider.calls == 2
+    list_decision_cache.clear()
+
+
+def test_shared_mailbox_domains_are_keyed_by_address() -> None:
+    list_decision_cache.clear()
+    no_list_id = EMPTY_LIST_HEADERS
+    alice = list_decision_cache.key(no_list_id, "Alice <alice@gmail.com>", "newsletter")
+    bob = list_decision_cache.key(no_list_id, "bob@gmail.com", "newsletter")
+    assert alice != bob
+    list_decision_cache.set(alice, False, "unsubscribe: never opened")
+    assert list_decision_cache.get(bob) is None
+
+    vendor = list_decision_cache.key(no_list_id, "news@vendor.example", "newsletter")
+    assert vendor == list_decision_cache.key(no_list_id, "deals@vendor.example", "newsletter")
+
+    list_decision_cache.set(bob, True, "keep")
+    assert list_decision_cache.invalidate_sender("alice@gmail.com") == 1
+    assert list_decision_cache.get(bob) == (True, "keep")
+    list_decision_cache.clear()
+
+
+class _AmbiguousProvider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        self.calls += 1
+        return "Keep? I can't tell from the subject alone."
+
+
+def test_unrecognised_verdicts_are_not_cached() -> None:
+    template_outcome_cache.clear()
+    sender_reputation.clear()
+    list_decision_cache.clear()
+    provider = _AmbiguousProvider()
+    skill = UnsubscribeSkill(model_provider=provider)
+
+    first = skill.run(_issue(0))
+    skill.run(_issue(0))
+
+    assert provider.calls == 2
+    assert "safely unsubscribed" in first.assistantText.lower()
+    assert list_decision_cache.stats()["size"] == 0
+    assert (
+        sender_reputation.verdict(
+            "unsubscribe", "editor@dispatch.example", min_count=1, list_id="weekly.dispatch.example"
+        )
+        is None
+    )
+
+
+def test_invalidation_also_resets_template_and_reputation_tiers() -> None:
+    template_outcome_cache.clear()
+    sender_reputation.clear()
+    list_decision_cache.clear()
+    for _ in range(6):
+        sender_reputation.record(
+            "unsubscribe", "editor@dispatch.example", "keep", list_id="weekly.dispatch.example"
+        )
+    provider = _VerdictProvider()
+    skill = UnsubscribeSkill(model_provider=provider)
+
+    assert "worth keeping" in skill.run(_issue(1)).assistantText
+    assert provider.calls == 0
+
+    TestClient(app).post(
+        "/v1/agent/unsubscribe/decisions/invalidate", json={"sender": "editor@dispatch.example"}
+    )
+    assert "never open these" in skill.run(_issue(1)).assistantText.lower()
+    assert provider.calls == 1
+    list_decision_cache.clear()
+    sender_reputation.clear()
@@ -0,0 +1,69 @@
+"""List header parsing tests."""
+
+from app.contracts.agent_request import AgentRequest
+from app.core.list_headers import EMPTY_LIST_HEADERS, parse_list_headers
+from app.core.sender_reputation import sender_reputation
+from app.core.template_fingerprint import template_outcome_cache
+from app.skills.unsubscribe.skill import UnsubscribeSkill
+
+_HEADERS = (
+    "Received: from mx.example by relay.example\r\n"
+    "List-Id: Deals Weekly <Deals.Shop.Example>\r\n"
+    "List-Unsubscribe: <mailto:leave@shop.example?subject=unsubscribe>,\r\n"
+    " <https://shop.example/u/abc123>\r\n"
+    "List-Unsubscribe-Post: List-Unsubscribe=One-Click\r\n"
+    "Subject: ignored\r\n"
+)
+
+
+def test_parse_list_headers_handles_folding_and_one_click() -> None:
+    parsed = parse_list_headers(_HEADERS)
+    assert parsed.list_id == "deals.shop.example"
+    assert parsed.https_urls == ("https://shop.example/u/abc123",)
+    assert parsed.mailto_urls == ("mailto:leave@shop.example?subject=unsubscribe",)
+    assert parsed.one_click is True
+
+    bare = parse_list_headers("List-Unsubscribe: http://old.example/optout")
+    assert bare.https_urls == ("http://old.example/optout",) and bare.one_click is False
+    assert parse_list_headers("From: a@b.example\r\nTo: c@d.example") is EMPTY_LIST_HEADERS
+
+
+def test_parse_list_headers_accepts_a_flattened_header_string() -> None:
+    parsed = parse_list_headers(
+        "From: a@b.com; List-Unsubscribe: <https://x.example/u>; List-Id: <news.x.example>"
+    )
+    assert parsed.list_id == "news.x.example"
+    assert parsed.https_urls == ("https://x.example/u",)
+
+    one_line = parse_list_headers(
+        "List-Unsubscribe: <mailto:out@x.example>, <https://x.example/u?a=1;b=2> "
+        "List-Unsubscribe-Post: List-Unsubscribe=One-Click"
+    )
+    assert one_line.https_urls == ("https://x.example/u?a=1;b=2",)
+    assert one_line.mailto_urls == ("mailto:out@x.example",) and one_line.one_click is True
+
+
+def test_unsubscribe_action_carries_one_click_and_mailto() -> None:
+    template_outcome_cache.clear()
+    sender_reputation.clear()
+    request = AgentRequest(
+        skill="unsubscribe",
+        requestId="unsub-1",
+        messages=[{"role": "user", "content": "unsubscribe me"}],
+        context={
+            "metadata": {
+                "threadId": "t-1",
+                "emailFrom": "deals@shop.example",
+                "emailSubject": "Flash sale: 40% off",
+                "emailHeaders": _HEADERS,
+            }
+        },
+    )
+
+    response = UnsubscribeSkill().run(request)
+
+    execute = next(a for a in response.suggestedActions if a.name == "unsubscribe.execute")
+    assert execute.payload["unsubscribeUrl"] == "https://shop.example/u/abc123"
+    assert execute.payload["oneClick"] == "true"
+    assert execute.payload["unsubscribeMailto"].startswith("mailto:leave@shop.example")
+    assert response.confidence == 0.95
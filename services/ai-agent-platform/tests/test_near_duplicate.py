@@ -0,0 +1,127 @@
+"""Near-duplicate clustering and batch fan-out tests."""
+
+from fastapi.testclient import TestClient
+
+from app.contracts.agent_batch import AgentBatchRequest
+from app.contracts.agent_request import AgentRequest
+from app.contracts.agent_response import AgentResponse
+from app.core.agent_runtime import AgentRuntime
+from app.core.near_duplicate import cluster_near_duplicates
+from app.core.sender_reputation import sender_reputation
+from app.core.skill_registry import SkillRegistry
+from app.core.template_fingerprint import template_outcome_cache
+from app.main import app
+
+_ALERT = (
+    "Your alert {id} fired for host db-{n} at 10:{n}2, cpu stayed above the configured "
+    "threshold for five minutes straight and the on-call engineer has been paged"
+)
+
+
+def test_cluster_groups_copies_that_differ_only_in_ids() -> None:
+    texts = [
+        _ALERT.format(id="ABC12345", n=1),
+        "Quarterly planning offsite agenda attached, please review the travel section",
+        _ALERT.format(id="XYZ99881", n=2),
+        "",
+    ]
+
+    result = cluster_near_duplicates(texts)
+
+    assert result.clusters == [[0, 2], [1], [3]]
+    assert result.representatives == [0, 1, 3]
+    assert result.stats.to_dict()["duplicates"] == 1
+
+
+def test_respond_batch_runs_representative_once_and_fans_out() -> None:
+    template_outcome_cache.clear()
+    sender_reputation.clear()
+    client = TestClient(app)
+
+    def triage_request(request_id: str, alert_id: str, thread_id: str) -> dict[str, object]:
+        return {
+            "skill": "triage",
+            "requestId": request_id,
+            "messages": [{"role": "user", "content": "triage this"}],
+            "context": {
+                "metadata": {
+                    "threadId": thread_id,
+                    "emailSubject": f"Alert {alert_id}",
+                    "emailFrom": "alerts@monitor.example",
+                    "emailBody": _ALERT.format(id=alert_id, n=3),
+                }
+            },
+        }
+
+    response = client.post(
+        "/v1/agent/respond/batch",
+        json={
+            "requestId": "bulk-1",
+            "requests": [
+                triage_request("r-1", "ABC12345", "t-1"),
+                triage_request("r-2", "QWE55555", "t-2"),
+                triage_request("r-3", "ZXC77777", "t-3"),
+            ],
+        },
+    )
+    assert response.status_code == 200
+    body = response.json()
+
+    assert body["clusterStats"]["clusters"] == 1
+    assert body["clusterStats"]["duplicates"] == 2
+    responses = body["responses"]
+    assert "nearDuplicateOf" not in responses[0]["uiHints"]
+    assert responses[2]["uiHints"]["nearDuplicateOf"] == "r-1"
+    assert {a["payload"]["threadId"] for a in responses[2]["suggestedActions"]} == {"t-3"}
+    sender_reputation.clear()
+
+
+def test_batch_isolates_failures_and_retargets_unsubscribe_links() -> None:
+    class _Failing:
+        def run(self, request: AgentRequest) -> AgentResponse:
+            raise RuntimeError("skill exploded")
+
+    registry = SkillRegistry()
+    registry._cache["summarize"] = _Failing()
+    runtime = AgentRuntime(registry)
+
+    def unsubscribe_request(request_id: str, thread_id: str, token: str) -> AgentRequest:
+        return AgentRequest(
+            skill="unsubscribe",
+            requestId=request_id,
+            messages=[{"role": "user", "content": "unsubscribe me"}],
+            context={
+                "metadata": {
+                    "threadId": thread_id,
+                    "emailSubject": "Weekly deals digest",
+                    "emailFrom": "deals@shop-batch.example",
+                    "emailHeaders": f"List-Unsubscribe: <https://shop-batch.example/u/{token}>",
+                    "emailBody": _ALERT.format(id=token, n=2),
+                }
+            },
+        )
+
+    failing = AgentRequest(
+        skill="summarize",
+        requestId="s-1",
+        messages=[{"role": "user", "content": "summarize"}],
+        context={"metadata": {"threadId": "t-s"}},
+    )
+    result = runtime.respond_batch(
+        AgentBatchRequest(
+            requestId="bulk-2",
+            requests=[
+                unsubscribe_request("u-1", "t-1", "AAA11111"),
+                failing,
+                unsubscribe_request("u-2", "t-2", "BBB22222"),
+            ],
+        )
+    )
+
+    assert result.responses[1] is None
+    assert [(e.index, e.requestId) for e in result.errors] == [(1, "s-1")]
+    member = result.responses[2]
+    assert member is not None and member.uiHints["nearDuplicateOf"] == "u-1"
+    execute = next(a for a in member.suggestedActions if a.name == "unsubscribe.execute")
+    assert execute.payload["unsubscribeUrl"] == "https://shop-batch.example/u/BBB22222"
+    assert execute.payload["threadId"] == "t-2"
@@ -0,0 +1,164 @@
+"""Progressive two-phase response tests."""
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.contracts.progressive import ProgressiveRequest, ProgressiveResult
+from app.core.agent_runtime import AgentRuntime
+from app.core.model_provider import BaseModelProvider
+from app.core.progressive import check_callback_url, deliver_callback, progressive_results
+from app.core.skill_registry import SkillRegistry
+from app.main import app
+from app.skills.triage.skill import TriageSkill
+
+
+class _SlowProvider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        time.sleep(0.2)
+        self.calls += 1
+        return '{"category": "personal", "priority": "high", "requires_reply": true}'
+
+
+class _Receiver(BaseHTTPRequestHandler):
+    received: list[dict[str, object]] = []
+    arrived = threading.Event()
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        _Receiver.received.append(json.loads(body))
+        self.send_response(204)
+        self.end_headers()
+        _Receiver.arrived.set()
+
+    def do_GET(self) -> None:  # noqa: N802
+        # A followed 302 arrives here as a GET.
+        self.send_response(204)
+        self.end_headers()
+        _Receiver.arrived.set()
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+class _Redirector(_Receiver):
+    location = ""
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.send_response(302)
+        self.send_header("Location", _Redirector.location)
+        self.end_headers()
+
+
+def _request(request_id: str, sender: str, body: str) -> ProgressiveRequest:
+    return ProgressiveRequest.model_validate(
+        {
+            "request": {
+                "skill": "triage",
+                "requestId": request_id,
+                "messages": [{"role": "user", "content": "triage this"}],
+                "context": {
+                    "metadata": {
+                        "emailSubject": "Dinner on Saturday?",
+                        "emailFrom": sender,
+                        "emailBody": body,
+                    }
+                },
+            }
+        }
+    )
+
+
+@pytest.fixture()
+def receiver() -> Iterator[str]:
+    server = HTTPServer(("127.0.0.1", 0), _Receiver)
+    _Receiver.received.clear()
+    _Receiver.arrived.clear()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/hook"
+    server.shutdown()
+
+
+def test_rule_tier_answer_now_and_llm_result_by_callback(
+    receiver: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "progressive_callback_hosts", ["127.0.0.1"])
+    provider = _SlowProvider()
+    registry = SkillRegistry()
+    registry._cache["triage"] = TriageSkill(provider)
+    runtime = AgentRuntime(registry)
+    request = _request("prog-1", "maria@progressive-test.example", "Are you free for dinner?")
+    request.callbackUrl = receiver
+
+    started = time.monotonic()
+    first = runtime.respond_progressive(request)
+
+    assert time.monotonic() - started < 0.15 and provider.calls == 0
+    assert first.status == "pending" and first.response is not None
+    assert first.response.uiHints["progressive"] == "pending"
+    assert _Receiver.arrived.wait(2.0)
+    delivered = _Receiver.received[0]
+    assert delivered["resultId"] == first.resultId and delivered["status"] == "complete"
+    assert delivered["response"]["uiHints"]["progressive"] == "final"  # type: ignore[index]
+    polled = progressive_results.get(first.resultId)
+    assert polled is not None and polled.status == "complete" and provider.calls == 1
+
+
+def test_decisive_rule_tier_is_final_and_pollable() -> None:
+    provider = _SlowProvider()
+    registry = SkillRegistry()
+    registry._cache["triage"] = TriageSkill(provider)
+    runtime = AgentRuntime(registry)
+    request = _request(
+        "prog-2", "news@progressive-test.example", "Our weekly picks. Unsubscribe any time."
+    )
+
+    result = runtime.respond_progressive(request)
+
+    assert result.status == "complete" and provider.calls == 0
+    assert progressive_results.get(result.resultId) == result
+    client = TestClient(app)
+    assert client.get("/v1/agent/results/missing-id").status_code == 404
+    response = client.post(
+        "/v1/agent/respond/progressive",
+        json={"request": {**request.request.model_dump(), "skill": "summarize"}},
+    )
+    assert response.status_code == 400
+
+
+def test_callbacks_need_an_allowlisted_host_and_never_follow_redirects(
+    receiver: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # The default empty allowlist rejects every callback.
+    with pytest.raises(ValueError):
+        check_callback_url(receiver)
+    monkeypatch.setattr(settings, "progressive_callback_hosts", ["127.0.0.1"])
+    check_callback_url(receiver)
+    with pytest.raises(ValueError):
+        check_callback_url("http://169.254.169.254/latest/meta-data/")
+    for malformed in ("http://127.0.0.1:abc/", "http://127.0.0.1:99999/", "file://127.0.0.1/etc/hosts"):
+        with pytest.raises(ValueError):
+            check_callback_url(malformed)
+
+    _Redirector.location = receiver
+    redirector = HTTPServer(("127.0.0.1", 0), _Redirector)
+    threading.Thread(target=redirector.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{redirector.server_port}/redirect"
+        result = ProgressiveResult(resultId="r-1", status="failed", error="x")
+        assert deliver_callback(url, result) is False
+    finally:
+        redirector.shutdown()
+    assert not _Receiver.arrived.wait(0.2)
+    # A malformed URL is a failed delivery, not an exception out of the worker.
+    assert deliver_callback("http://127.0.0.1:abc/", result) is False
@@ -0,0 +1,87 @@
+"""Prompt budget estimator, trimming, and usage reporting tests."""
+
+from app.core.model_provider import BaseModelProvider, _record_prompt_tokens
+from app.core.prompt_budget import (
+    PromptSection,
+    estimate_tokens,
+    fit_prompt,
+    generate_budgeted,
+    prompt_budget_stats,
+)
+
+
+class _CapturingProvider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        self.prompts.append(prompt)
+        return "ok"
+
+
+def test_estimate_tokens_scales_with_text() -> None:
+    assert estimate_tokens("") == 0
+    short = estimate_tokens("Please review the attached invoice.")
+    assert 5 <= short <= 12
+    assert estimate_tokens("word " * 400) >= 400
+
+
+def test_fit_prompt_trims_lowest_priority_section_first() -> None:
+    history = "\n".join(f"USER: message number {i} " + "filler " * 20 for i in range(40))
+    instructions = "Your task: reply briefly."
+    budgeted = fit_prompt(
+        "inbox",
+        "system prompt",
+        [
+            PromptSection(name="history", text=history, priority=1, keep="tail"),
+            PromptSection(name="instructions", text=instructions, priority=9),
+        ],
+        ceiling=200,
+    )
+
+    assert budgeted.estimated_tokens <= 200
+    assert estimate_tokens(budgeted.prompt) <= 200
+    assert "history" in budgeted.trimmed_tokens
+    assert budgeted.prompt.endswith(instructions)
+    # Tail trimming keeps the most recent turns.
+    assert "message number 39" in budgeted.prompt
+    assert "message number 0 " not in budgeted.prompt
+
+
+def test_generate_budgeted_records_estimated_usage() -> None:
+    provider = _CapturingProvider()
+    budgeted = fit_prompt(
+        "budget-test",
+        "",
+        [PromptSection(name="email", text="Body " * 2000, priority=1)],
+        ceiling=300,
+    )
+
+    assert generate_budgeted(provider, budgeted) == "ok"
+    assert provider.prompts == [budgeted.prompt]
+
+    stats = prompt_budget_stats.snapshot()["budget-test"]
+    assert stats["calls"] == 1
+    assert stats["trimmedCalls"] == 1
+    assert stats["estimatedTokens"] == budgeted.estimated_tokens
+    assert stats["measuredCalls"] == 0
+
+
+class _MeteredProvider(BaseModelProvider):
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        _record_prompt_tokens(1234)
+        return "ok"
+
+
+def test_unmetered_call_does_not_reuse_previous_usage() -> None:
+    budgeted = fit_prompt(
+        "budget-stale", "", [PromptSection(name="email", text="Short body.", priority=1)]
+    )
+
+    generate_budgeted(_MeteredProvider(), budgeted)
+    generate_budgeted(_CapturingProvider(), budgeted)
+
+    stats = prompt_budget_stats.snapshot()["budget-stale"]
+    assert stats["calls"] == 2
+    assert stats["measuredCalls"] == 1
+    assert stats["actualTokens"] == 1234
@@ -0,0 +1,86 @@
+"""Memory-mapped sender knowledge base tests."""
+
+from pathlib import Path
+
+from app.core import sender_kb as sender_kb_module
+from app.core.sender_kb import SenderKnowledgeBase, build_sender_kb
+from app.skills.triage.graph import _rule_based_triage
+
+
+def _build(tmp_path) -> str:
+    path = str(tmp_path / "sender_kb.bin")
+    build_sender_kb(
+        [
+            ("domain", "facebookmail.com", "social"),
+            ("domain", "sendgrid.net", "esp"),
+            ("local", "billing", "transactional"),
+            ("list", "Weekly <weekly.substack.com>", "newsletter"),
+            ("address", "Notifications <Notifications@GitHub.com>", "notification"),
+        ],
+        path,
+    )
+    return path
+
+
+def test_lookup_apis(tmp_path) -> None:
+    kb = SenderKnowledgeBase(_build(tmp_path))
+
+    assert len(kb) == 5
+    assert kb.lookup_domain("facebookmail.com") == "social"
+    assert kb.lookup_domain("em123.sendgrid.net") == "esp"
+    assert kb.lookup_domain("example.com") is None
+    assert kb.lookup_sender("Acme Billing <Billing@acme.io>") == "transactional"
+    assert kb.lookup_sender("friends@facebookmail.com") == "social"
+    assert kb.lookup_sender("notifications@github.com") == "notification"
+    assert kb.lookup_sender("octocat@github.com") is None
+    assert kb.lookup_list_id("Weekly <weekly.substack.com>") == "newsletter"
+    assert kb.lookup_list_id("other.list.example") is None
+
+
+def test_triage_rules_consult_knowledge_base(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(sender_kb_module.settings, "sender_kb_path", _build(tmp_path))
+    sender_kb_module._load.cache_clear()
+
+
+def test_shipped_kb_does_not_short_circuit_people_at_company_domains(
+    tmp_path, monkeypatch
+) -> None:
+    path = str(tmp_path / "shipped.bin")
+    shipped_csv = Path(__file__).resolve().parents[1] / "app" / "data" / "sender_kb.csv"
+    sender_kb_module.main(["--csv", str(shipped_csv), "--out", path])
+    monkeypatch.setattr(sender_kb_module.settings, "sender_kb_path", path)
+    sender_kb_module._load.cache_clear()
+
+    for sender in ("Priya Shah <priya@google.com>", "recruiter@amazon.com", "sam@github.com"):
+        result = _rule_based_triage("Quick question", sender, "Could we talk on Thursday?")
+        assert "category" not in result, sender
+    automated = _rule_based_triage(
+        "Invitation: Sync", "calendar-notification@google.com", "You have been invited."
+    )
+    assert automated["category"] == "notification"
+    sender_kb_module._load.cache_clear()
+
+    result = _rule_based_triage(
+        "Alex commented on your photo", "Facebook <notification@facebookmail.com>", "See what Alex said."
+    )
+    assert result == {"category": "social", "priority": "low", "requires_reply": False}
+    sender_kb_module._load.cache_clear()
+
+
+def test_shipped_kb_does_not_short_circuit_people_at_company_domains(
+    tmp_path, monkeypatch
+) -> None:
+    path = str(tmp_path / "shipped.bin")
+    shipped_csv = Path(__file__).resolve().parents[1] / "app" / "data" / "sender_kb.csv"
+    sender_kb_module.main(["--csv", str(shipped_csv), "--out", path])
+    monkeypatch.setattr(sender_kb_module.settings, "sender_kb_path", path)
+    sender_kb_module._load.cache_clear()
+
+    for sender in ("Priya Shah <priya@google.com>", "recruiter@amazon.com", "sam@github.com"):
+        result = _rule_based_triage("Quick question", sender, "Could we talk on Thursday?")
+        assert "category" not in result, sender
+    automated = _rule_based_triage(
+        "Invitation: Sync", "calendar-notification@google.com", "You have been invited."
+    )
+    assert automated["category"] == "notification"
+    sender_kb_module._load.cache_clear()
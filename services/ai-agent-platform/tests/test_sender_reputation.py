@@ -0,0 +1,124 @@
+"""Sender reputation store and short-circuit tests."""
+
+from app.contracts.agent_request import AgentContext, AgentMessage, AgentRequest
+from app.core.model_provider import BaseModelProvider
+from app.core.sender_reputation import SenderReputationStore, sender_reputation
+from app.skills.triage.graph import classify_email_node
+
+
+class _FailingProvider(BaseModelProvider):
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        raise AssertionError("LLM must not be called for one-sided sender history")
+
+
+def test_verdict_requires_volume_and_one_sided_history() -> None:
+    store = SenderReputationStore()
+    for _ in range(4):
+        store.record("triage", "Billing <billing@vendor.io>", "transaction|normal|no_reply")
+    assert store.verdict("triage", "billing@vendor.io", min_count=5, min_share=0.9) is None
+
+    store.record("triage", "billing@vendor.io", "transaction|normal|no_reply")
+    assert store.verdict("triage", "billing@vendor.io", min_count=5, min_share=0.9) == (
+        "transaction|normal|no_reply",
+        1.0,
+    )
+    # History is never aggregated per domain.
+    assert store.verdict("triage", "receipts@vendor.io", min_count=5, min_share=0.9) is None
+
+    store.record("triage", "billing@vendor.io", "work|high|reply")
+    assert store.verdict("triage", "billing@vendor.io", min_count=5, min_share=0.9) is None
+
+
+def test_shared_mailbox_domains_are_not_aggregated() -> None:
+    store = SenderReputationStore()
+    for _ in range(10):
+        store.record("triage", "friend@gmail.com", "personal|normal|reply")
+    assert store.verdict("triage", "stranger@gmail.com", min_count=5, min_share=0.9) is None
+
+
+def test_unsubscribe_verdicts_are_scoped_to_one_list() -> None:
+    store = SenderReputationStore()
+    for _ in range(6):
+        store.record(
+            "unsubscribe", "news@shop.example", "unsubscribe", list_id="promos.shop.example"
+        )
+    assert store.verdict(
+        "unsubscribe", "news@shop.example", min_count=5, list_id="promos.shop.example"
+    ) == ("unsubscribe", 1.0)
+    # A different list, or list-less mail, from the same sender is judged on its own.
+    assert (
+        store.verdict("unsubscribe", "news@shop.example", min_count=5, list_id="orders.shop.example")
+        is None
+    )
+    assert store.verdict("unsubscribe", "news@shop.example", min_count=5) is None
+    assert store.verdict("unsubscribe", "orders@shop.example", min_count=5) is None
+
+    assert store.forget("unsubscribe", "shop.example") == 1
+    assert (
+        store.verdict("unsubscribe", "news@shop.example", min_count=5, list_id="promos.shop.example")
+        is None
+    )
+
+
+def test_snapshot_round_trip(tmp_path) -> None:
+    path = str(tmp_path / "reputation.json")
+    store = SenderReputationStore(snapshot_path=path, snapshot_interval_sec=3600)
+    for _ in range(5):
+        store.record("unsubscribe", "news@letters.example", "unsubscribe")
+    store.snapshot()
+
+    restored = SenderReputationStore(snapshot_path=path)
+    assert restored.verdict("unsubscribe", "news@letters.example", min_count=5) == (
+        "unsubscribe",
+        1.0,
+    )
+
+
+def test_triage_answers_from_reputation_without_llm() -> None:
+    sender_reputation.clear()
+    for _ in range(6):
+        sender_reputation.record("triage", "ops@status.example.org", "notification|low|no_reply")
+
+    request = AgentRequest(
+        skill="triage",
+        requestId="reputation-1",
+        messages=[AgentMessage(content="triage this")],
+        context=AgentContext(
+            metadata={
+                "emailSubject": "Nightly job finished",
+                "emailFrom": "ops@status.example.org",
+                "emailBody": "The nightly export job finished in 42 minutes.",
+            }
+        ),
+    )
+    result = classify_email_node({"request": request}, _FailingProvider())  # type: ignore[arg-type]
+
+    assert result["category"] == "notification"
+    assert result["priority"] == "low"
+    assert result["requires_reply"] is False
+    sender_reputation.clear()
+
+
+def test_triage_ignores_domain_verdicts_and_never_records_rule_outcomes() -> None:
+    sender_reputation.clear()
+    for _ in range(6):
+        sender_reputation.record("triage", "ops@status.example.org", "notification|low|no_reply")
+    # Another address on the same domain must not skip the model tiers.
+    assert sender_reputation.verdict("triage", "ceo@status.example.org") is None
+
+    request = AgentRequest(
+        skill="triage",
+        requestId="reputation-2",
+        messages=[AgentMessage(content="triage this")],
+        context=AgentContext(
+            metadata={
+                "emailSubject": "Our weekly picks",
+                "emailFrom": "news@letters.example",
+                "emailBody": "This week's picks. Unsubscribe any time.",
+            }
+        ),
+    )
+    for _ in range(6):
+        classify_email_node({"request": request}, _FailingProvider())  # type: ignore[arg-type]
+    assert sender_reputation.verdict("triage", "news@letters.example") is None
+    sender_reputation.clear()
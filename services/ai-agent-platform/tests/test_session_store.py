@@ -0,0 +1,111 @@
+"""Conversation session store tests."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.contracts.agent_request import MAX_MESSAGE_CONTENT_CHARS, AgentMessage, AgentRequest
+from app.contracts.agent_response import AgentResponse
+from app.core.agent_runtime import AgentRuntime
+from app.core.session_store import SessionStore, session_store
+from app.core.skill_registry import SkillRegistry
+from app.main import app
+
+
+def _turn(content: str, session_id: str = "sess-1") -> dict[str, object]:
+    return {
+        "skill": "inbox",
+        "requestId": f"turn-{content[:8]}",
+        "sessionId": session_id,
+        "messages": [{"role": "user", "content": content}],
+        "context": {"metadata": {"threadId": "thread-9", "subject": "Offsite plan"}},
+    }
+
+
+def test_session_turns_send_only_deltas_and_keep_history() -> None:
+    session_store.clear()
+    client = TestClient(app)
+
+    client.post("/v1/agent/respond", json=_turn("first question about the venue"))
+    client.post("/v1/agent/respond", json=_turn("second question about dates"))
+    third = client.post("/v1/agent/respond", json=_turn("now draft a reply"))
+
+    assert third.status_code == 200
+    body = third.json()
+    assert body["uiHints"]["sessionId"] == "sess-1"
+    assert body["uiHints"]["sessionTurns"] == "3"
+    assert body["intent"] == "compose_reply_draft"
+    # The rule-based provider echoes the prompt: earlier turns came from the server.
+    assert "USER: first question about the venue" in body["assistantText"]
+    # 3 user messages + 3 assistant replies
+    assert len(session_store.get("sess-1")) == 6
+
+    ended = client.delete("/v1/agent/sessions/sess-1")
+    assert ended.json() == {"sessionId": "sess-1", "ended": True}
+    assert session_store.get("sess-1") is None
+
+
+def test_session_history_is_bounded() -> None:
+    store = SessionStore(max_entries=2, ttl_sec=60)
+    for i in range(60):
+        session = store.append("a", [AgentMessage(content=f"message {i}")])
+    start, lines = session.lines()
+    assert len(session) == 40 and start == 20
+    assert lines[0] == "USER: message 20" and lines[-1] == "USER: message 59"
+    assert [m.content for m in session.window(2)] == ["message 58", "message 59"]
+
+    store.append("b", [AgentMessage(content="hi")])
+    store.append("c", [AgentMessage(content="hi")])
+    assert store.get("a") is None and store.stats()["evictions"] == 1
+
+
+class _VerboseSkill:
+    def run(self, request: AgentRequest) -> AgentResponse:
+        return AgentResponse(
+            skill="inbox",
+            intent="inbox_answer",
+            confidence=0.9,
+            assistantText="word " * 2000,
+        )
+
+
+def test_long_replies_fit_the_message_cap_even_when_the_setting_is_larger(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session_store.clear()
+    monkeypatch.setattr(settings, "max_message_chars", 10000)
+    registry = SkillRegistry()
+    registry._cache["inbox"] = _VerboseSkill()
+    runtime = AgentRuntime(registry)
+
+    runtime.respond(AgentRequest.model_validate(_turn("summarise everything", "sess-4")))
+
+    session = session_store.get("sess-4")
+    assert session is not None and session.turns == 1
+    assert len(session.window(1)[0].content) <= MAX_MESSAGE_CONTENT_CHARS
+    session_store.clear()
+
+
+class _FailingSkill:
+    def run(self, request: AgentRequest) -> AgentResponse:
+        raise RuntimeError("skill blew up")
+
+
+def test_failed_turn_leaves_the_session_untouched() -> None:
+    session_store.clear()
+    client = TestClient(app)
+    client.post("/v1/agent/respond", json=_turn("first question about the venue", "sess-2"))
+    assert len(session_store.get("sess-2")) == 2
+
+    registry = SkillRegistry()
+    registry._cache["inbox"] = _FailingSkill()
+    runtime = AgentRuntime(registry)
+    with pytest.raises(RuntimeError):
+        runtime.respond(AgentRequest.model_validate(_turn("this turn fails", "sess-2")))
+    with pytest.raises(RuntimeError):
+        runtime.respond(AgentRequest.model_validate(_turn("a brand new session", "sess-3")))
+
+    session = session_store.get("sess-2")
+    assert session is not None and len(session) == 2 and session.turns == 1
+    assert session_store.get("sess-3") is None
+    session_store.clear()
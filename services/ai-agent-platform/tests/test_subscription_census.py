@@ -0,0 +1,108 @@
+"""Subscription census tests."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.contracts.subscription_census import CensusEmail
+from app.core.sender_reputation import sender_reputation
+from app.core.template_fingerprint import template_outcome_cache
+from app.main import app
+from app.core.model_provider import RuleBasedModelProvider
+from app.skills.unsubscribe import census as census_module
+from app.skills.unsubscribe.census import SubscriptionCensus, classify_census
+
+
+def _newsletter(day: int) -> dict[str, str]:
+    return {
+        "fromAddress": "Weekly Dispatch <news@dispatch.example>",
+        "subject": f"Weekly newsletter #{day}",
+        "headers": (
+            "List-Id: Weekly Dispatch <weekly.dispatch.example>\n"
+            "List-Unsubscribe: <https://dispatch.example/unsubscribe?u=42>"
+        ),
+        "date": f"2026-10-{day:02d}T08:00:00Z",
+    }
+
+
+def test_census_streams_ndjson_and_classifies_each_list_once() -> None:
+    template_outcome_cache.clear()
+    sender_reputation.clear()
+    lines = [_newsletter(day) for day in range(1, 11)]
+    lines += [
+        {
+            "fromAddress": "deals@shop.example",
+            "subject": f"Flash sale: {pct}% off",
+            "body": "Manage preferences: https://shop.example/optout?id=9",
+            "date": "2026-10-12T10:00:00Z",
+        }
+        for pct in (20, 30, 40)
+    ]
+    lines.append({"fromAddress": "sam@partner.example", "subject": "Lunch next week?"})
+    payload = "\n".join(json.dumps(line) for line in lines) + "\nnot json\n"
+
+    response = TestClient(app).post(
+        "/v1/agent/unsubscribe/census",
+        content=payload.encode(),
+        headers={"content-type": "application/x-ndjson", "x-request-id": "census-1"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["requestId"] == "census-1"
+    newsletter, promo = body["lists"]
+    assert newsletter["listId"] == "weekly.dispatch.example"
+    assert newsletter["volume"] == 10
+    assert newsletter["lastSeen"].startswith("2026-10-10")
+    assert newsletter["unsubscribeUrl"] == "https://dispatch.example/unsubscribe?u=42"
+    assert promo["listKey"] == "sender:deals@shop.example"
+    assert promo["volume"] == 3 and promo["unsubscribeUrl"].startswith("https://shop.example/optout")
+    assert body["stats"] == {
+        "emails": 14,
+        "invalidLines": 1,
+        "evictedLists": 0,
+        "senders": 3,
+        "lists": 2,
+        "nonListSenders": 1,
+        "failedLists": 0,
+    }
+
+
+def test_census_memory_is_bounded_and_split_lines_reassemble() -> None:
+    census = SubscriptionCensus(max_lists=10)
+    for i in range(5):
+        census.add(CensusEmail(**_newsletter(i + 1)))
+    for i in range(50):
+        census.add(CensusEmail(fromAddress=f"one-off-{i}@example.com", subject="hello"))
+    assert len(census.aggregates()) <= 10
+    assert census.aggregates()[0].volume == 5
+    assert census.stats["evictedLists"] > 0
+
+    line = json.dumps(_newsletter(3)).encode() + b"\n"
+    streamed = SubscriptionCensus()
+    streamed.feed(line[:17])
+    streamed.feed(line[17:] + line[:5])
+    streamed.feed(line[5:-1])
+    streamed.close()
+    assert streamed.stats["emails"] == 2
+    assert streamed.aggregates()[0].volume == 2
+
+
+def test_one_failing_list_does_not_fail_the_census(monkeypatch: pytest.MonkeyPatch) -> None:
+    classify = census_module._classify
+
+    def flaky(request_id, aggregate, model_provider):  # type: ignore[no-untyped-def]
+        if aggregate.key.startswith("sender:"):
+            raise ValueError("malformed sample")
+        return classify(request_id, aggregate, model_provider)
+
+    monkeypatch.setattr(census_module, "_classify", flaky)
+    census = SubscriptionCensus()
+    census.add(CensusEmail(**_newsletter(1)))
+    census.add(CensusEmail(fromAddress="deals@shop.example", subject="Flash sale"))
+
+    result = classify_census("census-2", census, RuleBasedModelProvider())
+
+    assert [entry.listId for entry in result.lists] == ["weekly.dispatch.example"]
+    assert result.stats["failedLists"] == 1
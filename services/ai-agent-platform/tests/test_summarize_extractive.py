@@ -0,0 +1,53 @@
+"""Extractive summarizer tests."""
+
+import json
+
+from app.contracts.agent_request import AgentRequest
+from app.skills.summarize.extractive import shrink_text, top_sentences
+from app.skills.summarize.skill import SummarizeSkill
+
+_THREAD_BODY = (
+    "Hi team. "
+    "The vendor contract renewal is blocked on the revised pricing from the vendor. "
+    "Legal reviewed the vendor contract and flagged the renewal pricing clause. "
+    "Unrelated, the coffee machine on floor three is fixed. "
+    "Please send the revised vendor pricing to legal by Friday so the contract renewal can close. "
+    "Thanks!"
+)
+
+
+def test_top_sentences_prefer_central_content_and_keep_order() -> None:
+    picked = top_sentences(_THREAD_BODY, max_sentences=2)
+
+    assert len(picked) == 2
+    assert all("vendor" in sentence for sentence in picked)
+    assert _THREAD_BODY.index(picked[0]) < _THREAD_BODY.index(picked[1])
+
+
+def test_shrink_text_respects_budget_and_leaves_short_text() -> None:
+    assert shrink_text("Short note.", 50) == "Short note."
+    shrunk = shrink_text(_THREAD_BODY * 5, 60)
+    assert 0 < len(shrunk) < len(_THREAD_BODY * 5)
+
+
+def test_rule_based_provider_gets_extractive_summary() -> None:
+    request = AgentRequest(
+        skill="summarize",
+        requestId="sum-extractive",
+        messages=[{"role": "user", "content": "summarize"}],
+        context={
+            "metadata": {
+                "subject": "Vendor renewal",
+                "threadMessages": json.dumps(
+                    [{"id": "x1", "from": "ops@corp.example", "body": _THREAD_BODY}]
+                ),
+            }
+        },
+    )
+
+    response = SummarizeSkill().run(request)
+
+    assert response.uiHints["summaryMode"] == "extractive"
+    assert "vendor" in response.assistantText
+    assert "Unable to generate summary" not in response.assistantText
+    assert response.confidence == 0.6
@@ -0,0 +1,103 @@
+"""Incremental thread summarization tests."""
+
+import json
+
+import pytest
+
+from app.config.settings import settings
+from app.contracts.agent_request import AgentRequest
+from app.core.model_provider import BaseModelProvider
+from app.skills.summarize.skill import SummarizeSkill
+from app.skills.summarize.summary_store import chunk_summary_cache, thread_summary_store
+
+
+class _DeltaProvider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        self.prompts.append(prompt)
+        n = len(self.prompts)
+        return json.dumps({"summary": f"summary v{n}", "action_items": [f"task {n}"]})
+
+
+class _FailingProvider(BaseModelProvider):
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        raise RuntimeError("provider down")
+
+
+def _request(messages: list[dict[str, str]]) -> AgentRequest:
+    return AgentRequest(
+        skill="summarize",
+        requestId=f"sum-{len(messages)}",
+        messages=[{"role": "user", "content": "summarize"}],
+        context={
+            "metadata": {
+                "threadId": "thread-sum",
+                "subject": "Launch plan",
+                "threadMessages": json.dumps(messages),
+            }
+        },
+    )
+
+
+def test_only_new_messages_are_summarized_and_merged() -> None:
+    thread_summary_store.clear()
+    provider = _DeltaProvider()
+    skill = SummarizeSkill(model_provider=provider)
+    messages = [{"id": f"m{i}", "from": "a@x.example", "body": f"note {i}"} for i in range(12)]
+
+    # Nothing is dropped past the tenth message.
+    first = skill.run(_request(messages))
+    assert len(provider.prompts) == 1
+    assert "note 11" in provider.prompts[0]
+    assert first.uiHints["summaryMode"] == "full"
+
+    messages.append({"id": "m12", "from": "b@x.example", "body": "new reply"})
+    second = skill.run(_request(messages))
+    assert len(provider.prompts) == 2
+    assert "summary v1" in provider.prompts[1]
+    assert "new reply" in provider.prompts[1] and "note 3" not in provider.prompts[1]
+    assert second.uiHints["summaryMode"] == "incremental"
+    assert second.assistantText.startswith("summary v2")
+    assert "task 1, task 2" in second.assistantText
+
+    skill.run(_request(messages))
+    assert len(provider.prompts) == 2
+
+    # A failed update returns the prior summary, marked stale.
+    messages.append({"id": "m13", "from": "b@x.example", "body": "another reply"})
+    stale = SummarizeSkill(model_provider=_FailingProvider()).run(_request(messages))
+    assert stale.uiHints["summaryMode"] == "stale"
+    assert stale.assistantText.startswith("summary v2") and stale.confidence < 0.6
+
+    # Rewritten history falls back to a full summary.
+    messages[0] = {"id": "edited", "from": "a@x.example", "body": "changed"}
+    assert skill.run(_request(messages)).uiHints["summaryMode"] == "full"
+    thread_summary_store.clear()
+
+
+def test_long_thread_is_map_reduced_and_chunks_are_reused(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    thread_summary_store.clear()
+    chunk_summary_cache.clear()
+    monkeypatch.setattr(settings, "summary_chunk_tokens", 120)
+    provider = _DeltaProvider()
+    skill = SummarizeSkill(model_provider=provider)
+    messages = [
+        {"id": f"m{i}", "from": "a@x.example", "body": f"update {i} " + "detail " * 60}
+        for i in range(4)
+    ]
+
+    skill.run(_request(messages))
+    # Four map calls (one per chunk) plus one reduce over the partial summaries.
+    assert len(provider.prompts) == 5
+    assert "Part 4:" in provider.prompts[-1]
+
+    # A fresh request over the same history reuses every chunk summary.
+    thread_summary_store.clear()
+    skill.run(_request(messages))
+    assert len(provider.prompts) == 6
+    thread_summary_store.clear()
+    chunk_summary_cache.clear()
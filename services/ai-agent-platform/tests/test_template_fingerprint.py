@@ -0,0 +1,83 @@
+"""Sender-template fingerprint and outcome cache tests."""
+
+from app.contracts.agent_request import AgentContext, AgentMessage, AgentRequest
+from app.core.model_provider import BaseModelProvider
+from app.core.template_fingerprint import template_fingerprint, template_outcome_cache
+from app.core.ttl_cache import TTLCache
+from app.skills.triage.graph import classify_email_node
+
+
+class _CountingProvider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        self.calls += 1
+        return (
+            '{"category": "work", "priority": "normal", "sentiment": "neutral", '
+            '"requires_reply": false, "estimated_read_time_sec": 45}'
+        )
+
+
+def _request(name: str, ref: str, amount: str) -> AgentRequest:
+    return AgentRequest(
+        skill="triage",
+        requestId=f"template-{ref}",
+        messages=[AgentMessage(content="triage this")],
+        context=AgentContext(
+            metadata={
+                "emailSubject": f"Your expense report {ref} was approved",
+                "emailFrom": "reports@expenses.example.com",
+                "emailBody": (
+                    f"Hi {name}, your expense report {ref} for {amount} was approved. "
+                    f"Details: https://expenses.example.com/r/{ref}"
+                ),
+            }
+        ),
+    )
+
+
+def test_fingerprint_ignores_variable_tokens() -> None:
+    first = template_fingerprint(
+        "Shop <orders@shop.com>",
+        "Order #A1B2C3 confirmed",
+        "Hi Alice, order A1B2C3 totals $42.50. Track at https://shop.com/t/123",
+    )
+    second = template_fingerprint(
+        "orders@shop.com",
+        "Order #Z9Y8X7 confirmed",
+        "Hi Bob, order Z9Y8X7 totals $1,310.00. Track at https://shop.com/t/999",
+    )
+    other_sender = template_fingerprint(
+        "orders@other.com",
+        "Order #Z9Y8X7 confirmed",
+        "Hi Bob, order Z9Y8X7 totals $1,310.00. Track at https://shop.com/t/999",
+    )
+    assert first == second
+    assert first != other_sender
+
+
+def test_repeat_template_skips_llm() -> None:
+    template_outcome_cache.clear()
+    provider = _CountingProvider()
+
+    first = classify_email_node({"request": _request("Alice", "EX1001", "$20")}, provider)  # type: ignore[arg-type]
+    second = classify_email_node({"request": _request("Bob", "EX2002", "$3,400")}, provider)  # type: ignore[arg-type]
+
+    assert provider.calls == 1
+    assert second["category"] == first["category"] == "work"
+    assert second["requires_reply"] is False
+
+
+def test_ttl_cache_bounds_size_and_expires() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_entries=2, ttl_sec=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+    expired: TTLCache[str, int] = TTLCache(max_entries=2, ttl_sec=0)
+    expired.set("a", 1)
+    assert expired.get("a") is None
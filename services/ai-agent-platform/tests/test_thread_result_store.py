@@ -0,0 +1,89 @@
+"""Thread content-hash result reuse tests."""
+
+from app.contracts.agent_request import AgentRequest
+from app.core.agent_runtime import AgentRuntime
+from app.core.model_provider import BaseModelProvider
+from app.core.skill_registry import SkillRegistry
+from app.core.template_fingerprint import template_outcome_cache
+from app.core.thread_result_store import relevant_content_hash, thread_result_store
+from app.skills.triage.skill import TriageSkill
+
+
+class _Provider(BaseModelProvider):
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.calls = 0
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("provider down")
+        return '{"category": "work", "priority": "high", "requires_reply": true}'
+
+
+def _runtime(provider: BaseModelProvider) -> AgentRuntime:
+    registry = SkillRegistry()
+    registry._cache["triage"] = TriageSkill(provider)
+    return AgentRuntime(registry)
+
+
+def _triage_request(request_id: str, **metadata: str) -> AgentRequest:
+    return AgentRequest(
+        skill="triage",
+        requestId=request_id,
+        messages=[{"role": "user", "content": "triage this"}],
+        context={"metadata": {"threadId": "thread-42", **metadata}},
+    )
+
+
+def test_relevant_hash_ignores_unlisted_fields_and_truncates() -> None:
+    fields = ["emailSubject|subject", "emailBody|body:10"]
+    base = _triage_request("a", emailSubject="Invoice", emailBody="0123456789-tail")
+    relabeled = _triage_request(
+        "b", subject="Invoice", emailBody="0123456789-other", labels="read"
+    )
+    changed = _triage_request("c", emailSubject="Invoice due", emailBody="0123456789")
+
+    assert relevant_content_hash(base, fields) == relevant_content_hash(relabeled, fields)
+    assert relevant_content_hash(base, fields) != relevant_content_hash(changed, fields)
+
+
+def test_runtime_reuses_result_until_relevant_content_changes() -> None:
+    thread_result_store.clear()
+    runtime = _runtime(_Provider())
+    first = runtime.respond(
+        _triage_request("r-1", emailSubject="Quarterly numbers", emailBody="See attached.")
+    )
+    again = runtime.respond(
+        _triage_request(
+            "r-2", emailSubject="Quarterly numbers", emailBody="See attached.", labels="starred"
+        )
+    )
+    runtime.respond(
+        _triage_request("r-3", emailSubject="Quarterly numbers", emailBody="Revised, see v2.")
+    )
+
+    assert again == first
+    stats = thread_result_store.stats()
+    assert stats["reused"] == 1
+    assert stats["contentChanged"] == 1
+    thread_result_store.clear()
+
+
+def test_fallback_results_are_not_reused() -> None:
+    thread_result_store.clear()
+    template_outcome_cache.clear()
+    provider = _Provider(fail=True)
+    runtime = _runtime(provider)
+    request = _triage_request("f-1", emailSubject="Budget review", emailBody="Thoughts on Q4?")
+
+    degraded = runtime.respond(request)
+    assert degraded.confidence == 0.6
+
+    # The provider recovers: the same thread is classified again, not served the fallback.
+    provider.fail = False
+    recovered = runtime.respond(request)
+    assert provider.calls == 2 and recovered.confidence == 0.88
+    assert thread_result_store.stats()["reused"] == 0
+    thread_result_store.clear()
+    template_outcome_cache.clear()
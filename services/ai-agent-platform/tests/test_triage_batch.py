@@ -0,0 +1,98 @@
+"""Bulk triage endpoint tests."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.contracts.triage_batch import TriageBatchRequest
+from app.core.deadline import Deadline, DeadlineExceeded, current_deadline
+from app.core.model_provider import BaseModelProvider
+from app.core.sender_reputation import sender_reputation
+from app.core.template_fingerprint import template_outcome_cache
+from app.main import app
+from app.skills.triage.batch import triage_batch
+
+
+def test_triage_batch_dedupes_templates_and_preserves_order() -> None:
+    template_outcome_cache.clear()
+    sender_reputation.clear()
+    client = TestClient(app)
+    emails = [
+        {
+            "id": "promo-1",
+            "subject": "Flash sale this weekend",
+            "fromAddress": "deals@shop.example",
+            "body": "Everything 40% off. Unsubscribe anytime.",
+        }
+    ]
+    emails += [
+        {
+            "id": f"report-{i}",
+            "subject": f"Build {1000 + i} finished",
+            "fromAddress": "ci@builds.example",
+            "body": f"Build {1000 + i} finished in {i + 3} minutes on runner r{i}.",
+        }
+        for i in range(5)
+    ]
+    emails.append(
+        {
+            "id": "question-1",
+            "subject": "Lunch next week?",
+            "fromAddress": "sam@partner.example",
+            "body": "Are you free for lunch on Thursday?",
+        }
+    )
+
+    response = client.post(
+        "/v1/agent/triage/batch", json={"requestId": "batch-1", "emails": emails}
+    )
+    assert response.status_code == 200
+    body = response.json()
+
+    assert [r["id"] for r in body["results"]] == [e["id"] for e in emails]
+    assert body["results"][0]["category"] == "newsletter"
+    assert body["results"][0]["source"] == "rules"
+    stats = body["stats"]
+    assert stats["total"] == 7
+    assert stats["rules"] == 1
+    # Five build reports share one template; the question is its own template.
+    assert stats["uniqueTemplates"] == 2
+    assert stats["deduplicated"] == 4
+    assert stats["llm"] == 6
+    assert stats["llmCalls"] == 2
+    sender_reputation.clear()
+
+
+class _CountingProvider(BaseModelProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        self.calls += 1
+        return '{"category": "personal", "priority": "normal", "requires_reply": true}'
+
+
+def test_llm_workers_run_in_the_callers_context() -> None:
+    template_outcome_cache.clear()
+    sender_reputation.clear()
+    request = TriageBatchRequest(
+        requestId="batch-deadline",
+        emails=[
+            {
+                "id": "question-1",
+                "subject": "Lunch next week?",
+                "fromAddress": "sam@partner.example",
+                "body": "Are you free for lunch on Thursday?",
+            }
+        ],
+    )
+    deadline = Deadline(30)
+    deadline.cancel()
+    provider = _CountingProvider()
+    token = current_deadline.set(deadline)
+    try:
+        # The cancelled deadline reaches the worker thread, so no model call is made.
+        with pytest.raises(DeadlineExceeded):
+            triage_batch(request, provider)
+    finally:
+        current_deadline.reset(token)
+    assert provider.calls == 0
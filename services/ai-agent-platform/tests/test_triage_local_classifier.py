@@ -0,0 +1,86 @@
+"""Local hashed n-gram triage classifier tests."""
+
+from app.contracts.agent_request import AgentContext, AgentMessage, AgentRequest
+from app.core.model_provider import BaseModelProvider
+from app.skills.triage import graph as triage_graph
+from app.skills.triage.local_classifier import (
+    LocalTriageClassifier,
+    load_local_classifier,
+    train_local_classifier,
+)
+
+
+def _records() -> list[dict[str, object]]:
+    records: list[dict[str, object]] = []
+    for i in range(30):
+        records.append(
+            {
+                "subject": f"Quarterly roadmap review {i}",
+                "from": "lead@acme.io",
+                "body": "Can you review the roadmap draft and share feedback before our meeting?",
+                "category": "work",
+                "priority": "high",
+                "requires_reply": True,
+            }
+        )
+        records.append(
+            {
+                "subject": f"Photos from the weekend {i}",
+                "from": "mom@family.net",
+                "body": "Loved seeing everyone at the picnic, here are the photos from the park.",
+                "category": "personal",
+                "priority": "normal",
+                "requires_reply": False,
+            }
+        )
+    return records
+
+
+class _FailingProvider(BaseModelProvider):
+    def generate(self, prompt: str, system: str = "", max_tokens: int = 512) -> str:
+        raise AssertionError("LLM must not be called for confident local predictions")
+
+
+def test_train_save_load_round_trip(tmp_path) -> None:
+    classifier = train_local_classifier(_records(), n_features=1 << 12)
+    path = tmp_path / "triage-local.npz"
+    classifier.save(path)
+    loaded = LocalTriageClassifier.load(path)
+
+    predictions = loaded.predict_batch(
+        [
+            ("Roadmap review", "lead@acme.io", "Please review the roadmap and share feedback."),
+            ("Weekend photos", "mom@family.net", "Here are the photos from the picnic."),
+        ]
+    )
+    assert [p.category for p in predictions] == ["work", "personal"]
+    assert predictions[0].requires_reply is True
+    assert predictions[1].requires_reply is False
+    assert all(0.0 < p.confidence <= 1.0 for p in predictions)
+
+
+def test_confident_local_prediction_skips_llm(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "triage-local.npz"
+    train_local_classifier(_records(), n_features=1 << 12).save(path)
+    monkeypatch.setattr(triage_graph.settings, "triage_local_model_path", str(path))
+    monkeypatch.setattr(triage_graph.settings, "triage_local_min_confidence", 0.6)
+    load_local_classifier.cache_clear()
+
+    request = AgentRequest(
+        skill="triage",
+        requestId="local-tier-1",
+        messages=[AgentMessage(content="triage this")],
+        context=AgentContext(
+            metadata={
+                "emailSubject": "Roadmap review",
+                "emailFrom": "lead@acme.io",
+                "emailBody": "Can you review the roadmap draft and share feedback?",
+            }
+        ),
+    )
+    result = triage_graph.classify_email_node({"request": request}, _FailingProvider())  # type: ignore[arg-type]
+
+    assert result["category"] == "work"
+    assert result["priority"] == "high"
+    assert result["requires_reply"] is True
+    load_local_classifier.cache_clear()